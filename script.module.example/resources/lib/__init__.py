@@ -1,7 +1,50 @@
 """Example Script Module for Testing
 
 A minimal Kodi script module addon that demonstrates basic addon structure.
+
+Kodi re-imports script modules on every plugin invocation, so importing this
+package loads nothing else: submodules and public functions are resolved on
+first attribute access (PEP 562 module __getattr__). A submodule keeps its own
+name, so hello_world.hello_world() is reached through the submodule.
 """
 
+import sys
+
 __version__ = '0.0.1'
 __author__ = 'Example Developer'
+
+# Submodules importable as attributes of the package
+_SUBMODULES = frozenset({'hello_world'})
+
+# Public function name -> submodule defining it
+_EXPORTS = {
+    'cached_greeter': 'hello_world',
+    'greet': 'hello_world',
+    'greet_many': 'hello_world',
+}
+
+__all__ = sorted(_SUBMODULES | set(_EXPORTS))
+
+
+def _load(submodule):
+    # __import__ rather than importlib.import_module: importing importlib
+    # (and the warnings module it pulls in) would cost more than this package
+    qualified = f'{__name__}.{submodule}'
+    __import__(qualified)
+    return sys.modules[qualified]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES or name in _EXPORTS:
+        if name in _SUBMODULES:
+            value = _load(name)
+        else:
+            value = getattr(_load(_EXPORTS[name]), name)
+        # Cache so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
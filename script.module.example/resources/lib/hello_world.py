@@ -22,5 +22,36 @@ def greet(name):
     return f"Hello {name}, welcome to the Kodi addon module!"
 
 
+def cached_greeter(maxsize=1024):
+    """Create a memoized greet() for lists with many repeated names.
+
+    Args:
+        maxsize (int): Most distinct names kept (least recently used are evicted)
+
+    Returns:
+        callable: greet() wrapper; its cache_info() reports hits, misses and size
+    """
+    # Imported here so that plain greet() users do not pay for functools
+    from functools import lru_cache
+
+    return lru_cache(maxsize=maxsize)(greet)
+
+
+def greet_many(names, greeter=None, as_list=False):
+    """Generate greetings for many names, e.g. when rendering list items.
+
+    Args:
+        names (iterable): Names to greet
+        greeter (callable, optional): Per-name function, such as one from
+            cached_greeter(); defaults to greet()
+        as_list (bool): Return a list instead of a lazy iterator
+
+    Returns:
+        iterator or list: Greetings in the order of names
+    """
+    results = map(greeter or greet, names)
+    return list(results) if as_list else results
+
+
 if __name__ == '__main__':
     print(hello_world())
@@ -4,6 +4,40 @@ Shared fixtures for PSR template test harness.
 
 import pytest
 from pathlib import Path
+import sys
+
+TOOLS_DIR = Path(__file__).parent.parent / "tools"
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import impact  # noqa: E402
+import result_cache  # noqa: E402
+
+
+def pytest_addoption(parser):
+    impact.add_options(parser)
+    result_cache.add_options(parser)
+    parser.addoption("--run-slow", action="store_true",
+                     help="Also run tests marked slow (wall-clock scaling checks, skipped by default)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: wall-clock timing test, only run with --run-slow")
+    config.addinivalue_line("markers", f"{result_cache.MARKER}(*paths): skip re-running while these input files, "
+                                       "the test module and its imports are unchanged since a pass")
+    if config.getoption("impact_record") or config.getoption("impact_base"):
+        config.pluginmanager.register(impact.ImpactPlugin(config), "test-impact")
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(result_cache.ContentCachePlugin(config), "content-cache")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("run_slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="timing test; run with --run-slow (make test-scaling)")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture
@@ -27,3 +61,13 @@ def mock_psr_response():
         "changelog": "## v0.1.0 - 2023-01-01\n### Added\n- Initial release\n",
         "artifacts": [],
     }
+
+
+@pytest.fixture
+def fake_gitea(tmp_path):
+    """In-process Gitea/GitHub API stand-in (tools/fake_gitea.py) backed by tmp_path."""
+    sys.path.insert(0, str(TOOLS_DIR))
+    from fake_gitea import FakeGitea
+
+    with FakeGitea(tmp_path / "fake-gitea") as server:
+        yield server
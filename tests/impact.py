@@ -0,0 +1,224 @@
+"""
+Test-impact selection: map repo files to the tests that use them.
+
+Recording (`--impact-record`) observes every test while it runs:
+  - repo modules its test module references (tools/*, test_helpers, ...)
+  - repo Python files whose functions it calls (call-only sys.settrace, all threads)
+  - repo files it opens and directories it lists (audit hooks)
+  - repo paths handed to subprocesses, and their working directory
+and merges {nodeid: [paths]} into .test-impact.json at the repo root.
+
+Selecting (`--impact-base REF`) diffs the working tree (including untracked
+files) against REF and deselects tests none of whose recorded paths changed.
+Tests missing from the map always run; without a map, or when a file in
+ALWAYS_RUN changed, nothing is deselected.
+
+Registered from conftest.py.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import pytest
+
+IMPACT_MAP = ".test-impact.json"
+MAP_VERSION = 1
+
+# Changes here can affect any test
+ALWAYS_RUN = ("pyproject.toml", "uv.lock", "tests/conftest.py", "tests/impact.py", "tests/result_cache.py")
+
+EXCLUDED_PARTS = {".git", "__pycache__", ".pytest_cache", ".venv", "venv"}
+
+# The recorder's own hooks run inside every test
+SELF_PATH = os.path.abspath(__file__)
+
+
+def add_options(parser) -> None:
+    group = parser.getgroup("impact", "test-impact selection")
+    group.addoption("--impact-record", action="store_true",
+                    help=f"Record which repo files each test uses into {IMPACT_MAP}")
+    group.addoption("--impact-base", metavar="REF",
+                    help="Only run tests affected by changes since git REF (working tree included)")
+
+
+def changed_files(root: Path, base: str) -> List[str]:
+    """
+    Files that differ between `base` and the working tree, plus untracked files.
+
+    Raises:
+        pytest.UsageError: If git cannot diff against base
+    """
+    commands = (["git", "diff", "--name-only", "--no-renames", base, "--"],
+                ["git", "ls-files", "--others", "--exclude-standard"])
+    changed: Set[str] = set()
+    for command in commands:
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise pytest.UsageError(f"--impact-base {base}: {result.stderr.strip()}")
+        changed.update(line for line in result.stdout.splitlines() if line)
+    return sorted(changed)
+
+
+def is_impacted(deps: Iterable[str], changed: Iterable[str]) -> bool:
+    """True if a changed file is a recorded path, or lies under a recorded directory (trailing '/')."""
+    changed = set(changed)
+    for dep in deps:
+        if dep.endswith("/"):
+            if any(path.startswith(dep) for path in changed):
+                return True
+        elif dep in changed:
+            return True
+    return False
+
+
+def module_files(module) -> Set[str]:
+    """Files of a module and of every module it references at module level (its imports)."""
+    files = {getattr(module, "__file__", None)}
+    for value in vars(module).values():
+        if hasattr(value, "__file__"):
+            files.add(value.__file__)
+        else:
+            owner = sys.modules.get(getattr(value, "__module__", None) or "")
+            files.add(getattr(owner, "__file__", None))
+    files.discard(None)
+    return files
+
+
+def load_map(path: Path) -> Optional[Dict[str, List[str]]]:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return data.get("tests") if data.get("version") == MAP_VERSION else None
+
+
+class ImpactPlugin:
+    """Records per-test file dependencies and/or deselects unaffected tests."""
+
+    def __init__(self, config):
+        self.root = Path(config.rootpath).resolve()
+        self.map_path = self.root / IMPACT_MAP
+        self.record = config.getoption("impact_record")
+        self.base = config.getoption("impact_base")
+        self.recorded: Dict[str, List[str]] = {}
+        self.summary: Optional[str] = None
+        self.deselected_all = False
+        self._prefix = str(self.root) + os.sep
+        self._current: Optional[Set[str]] = None
+        self._code_files: Set[str] = set()
+        if self.record:
+            sys.addaudithook(self._audit)
+
+    # -- recording -------------------------------------------------------
+
+    def _relative(self, path, is_dir: bool = False) -> Optional[str]:
+        """Repo-relative posix path for a path inside the repo, else None."""
+        if not isinstance(path, (str, bytes, os.PathLike)):
+            return None
+        if isinstance(path, str) and path.startswith("<"):
+            # <frozen ...>, <string>: no file behind the code
+            return None
+        absolute = os.path.abspath(os.fsdecode(path))
+        if not absolute.startswith(self._prefix) or absolute == SELF_PATH:
+            return None
+        rel = absolute[len(self._prefix):].replace(os.sep, "/")
+        if EXCLUDED_PARTS.intersection(rel.split("/")) or rel == IMPACT_MAP:
+            return None
+        return rel.rstrip("/") + "/" if is_dir else rel
+
+    def _add(self, path, is_dir: bool = False) -> None:
+        rel = self._relative(path, is_dir)
+        if rel is not None:
+            self._current.add(rel)
+
+    def _audit(self, event: str, args) -> None:
+        if self._current is None:
+            return
+        if event == "open":
+            self._add(args[0])
+        elif event in ("os.listdir", "os.scandir"):
+            self._add(args[0] if args[0] is not None else ".", is_dir=True)
+        elif event == "subprocess.Popen":
+            _, argv, cwd, _ = args
+            base = os.fsdecode(cwd) if cwd is not None else os.getcwd()
+            if os.path.abspath(base) != str(self.root):
+                self._add(base, is_dir=True)
+            for arg in ([argv] if isinstance(argv, (str, bytes)) else argv or []):
+                if isinstance(arg, (str, bytes, os.PathLike)):
+                    candidate = os.path.join(base, os.fsdecode(arg))
+                    if os.path.exists(candidate) and os.path.abspath(candidate) != str(self.root):
+                        self._add(candidate, is_dir=os.path.isdir(candidate))
+
+    def _trace(self, frame, event, arg):
+        # Returning None skips per-line tracing; only function entry is seen
+        self._code_files.add(frame.f_code.co_filename)
+
+    def _module_deps(self, module) -> Set[str]:
+        return {rel for rel in map(self._relative, module_files(module)) if rel}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.record:
+            yield
+            return
+        self._current, self._code_files = set(), set()
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+        try:
+            yield
+        finally:
+            sys.settrace(None)
+            threading.settrace(None)
+            deps, self._current = self._current, None
+            deps.update(rel for rel in map(self._relative, self._code_files) if rel)
+            module = getattr(item, "module", None)
+            if module is not None:
+                deps.update(self._module_deps(module))
+            self.recorded[item.nodeid] = sorted(deps)
+
+    def pytest_sessionfinish(self, session):
+        if self.deselected_all and session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            # Nothing affected is a successful run, not an empty selection
+            session.exitstatus = pytest.ExitCode.OK
+        if not self.record or not self.recorded:
+            return
+        tests = load_map(self.map_path) or {}
+        tests.update(self.recorded)
+        # Drop tests whose file has gone away
+        tests = {nodeid: deps for nodeid, deps in tests.items()
+                 if (self.root / nodeid.split("::", 1)[0]).exists()}
+        self.map_path.write_text(json.dumps({"version": MAP_VERSION, "tests": tests}, indent=1, sort_keys=True))
+
+    # -- selection -------------------------------------------------------
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        if not self.base:
+            return
+        tests = load_map(self.map_path)
+        if tests is None:
+            self.summary = f"test-impact: no {IMPACT_MAP} (run with --impact-record); running all tests"
+            return
+        changed = changed_files(self.root, self.base)
+        forcing = [path for path in changed if path in ALWAYS_RUN]
+        if forcing:
+            self.summary = f"test-impact: {', '.join(forcing)} changed; running all tests"
+            return
+
+        selected, deselected = [], []
+        for item in items:
+            deps = tests.get(item.nodeid)
+            (selected if deps is None or is_impacted(deps, changed) else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+            self.deselected_all = not selected
+        self.summary = (f"test-impact: {len(selected)} of {len(selected) + len(deselected)} tests affected "
+                        f"by {len(changed)} changed files since {self.base}")
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        return self.summary
@@ -29,6 +29,13 @@ from test_helpers import (
     ReleaseInfo
 )
 
+# Every test here is a pure function of the rendered files and test_helpers;
+# re-run only when one of them changed since the last pass
+pytestmark = pytest.mark.content_cached(
+    FIXTURE_REPO_ROOT / "CHANGELOG.md",
+    FIXTURE_REPO_ROOT / "script.module.example" / "addon.xml",
+)
+
 
 class TestMultiReleaseProgression:
     """
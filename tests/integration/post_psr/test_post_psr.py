@@ -31,6 +31,7 @@ def test_version_number_extraction():
         pytest.skip("CHANGELOG.md not found")
 
 
+@pytest.mark.content_cached(FIXTURE_REPO_ROOT / "script.module.example" / "addon.xml")
 def test_addon_xml_version_updated():
     """Test that addon.xml version is updated by PSR templates."""
     addon_path = FIXTURE_REPO_ROOT / "script.module.example" / "addon.xml"
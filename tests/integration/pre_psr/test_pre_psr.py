@@ -1,9 +1,17 @@
 """
 Pre-PSR integration tests for PSR template harness.
-Validates template arrangement on the real fixture.
+Validates template arrangement on the real fixture, and renders the arranged
+templates in-process against synthetic release histories.
 """
 
+import pytest
 from pathlib import Path
+import sys
+
+# Add tests directory to path to import helpers
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+# Add tools directory to path to import render_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "tools"))
 
 
 def test_template_arrangement(kodi_addon_fixture):
@@ -25,3 +33,35 @@ def test_template_arrangement(kodi_addon_fixture):
     # Verify both templates are placed correctly
     assert (kodi_addon_fixture / "templates" / "CHANGELOG.md.j2").exists()
     assert (kodi_addon_fixture / "templates" / "script.module.example" / "addon.xml.j2").exists()
+
+
+@pytest.mark.parametrize("phase", [1, 2, 3, 4, 5])
+def test_templates_render_in_process(kodi_addon_fixture, phase):
+    """Render the arranged templates against each phase's synthetic release history."""
+    pytest.importorskip("jinja2")
+    from render_helpers import ADDON_XML_TEMPLATE, CHANGELOG_TEMPLATE, get_engine, phase_context_spec
+    from test_helpers import AddonXmlParser, ChangelogParser, JinjaTemplateValidator
+
+    template_dir = kodi_addon_fixture / "templates"
+    if not (template_dir / CHANGELOG_TEMPLATE).exists() or not (template_dir / ADDON_XML_TEMPLATE).exists():
+        pytest.skip("Templates not arranged (run psr-prepare)")
+
+    engine = get_engine(template_dir)
+    spec = phase_context_spec(phase)
+    expected_versions = [release["version"] for release in spec["releases"]]
+
+    changelog = engine.render(CHANGELOG_TEMPLATE, spec)
+    is_valid, errors = JinjaTemplateValidator.validate_no_undefined_vars(changelog)
+    assert is_valid, f"CHANGELOG.md.j2 left Jinja2 syntax in output: {errors}"
+    releases = ChangelogParser.parse_text(changelog)
+    all_present, missing = ChangelogParser.validate_all_versions_present(releases, expected_versions)
+    assert all_present, f"Rendered CHANGELOG.md is missing versions: {missing}"
+    is_descending, violations = ChangelogParser.validate_descending(releases)
+    assert is_descending, f"Rendered CHANGELOG.md is not newest-first: {violations}"
+
+    addon_xml = engine.render(ADDON_XML_TEMPLATE, spec)
+    is_valid, errors = JinjaTemplateValidator.validate_xml_structure(addon_xml)
+    assert is_valid, f"Rendered addon.xml is malformed: {errors}"
+    addon_info = AddonXmlParser.parse_text(addon_xml)
+    assert AddonXmlParser.validate_version(addon_info, expected_versions[0]), \
+        f"addon.xml version {addon_info.version} should be {expected_versions[0]}"
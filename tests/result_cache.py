@@ -0,0 +1,138 @@
+"""
+Content-keyed result caching for tests that are pure functions of files.
+
+Tests opt in with `@pytest.mark.content_cached(*paths)`, listing the files
+they read (absolute, or relative to the repo root). With no paths, inputs are
+inferred from the test-impact map (.test-impact.json, see impact.py); a test
+with neither is simply run.
+
+A pass is recorded under a key hashing the node id, the contents of every
+input (a missing file hashes as missing), the test module and every repo
+module it imports (test_helpers.py, tools/...). When a later run computes a
+key that already passed, the test is reported as CACHED without executing.
+Several keys are kept per test, so switching between artifact sets reuses
+earlier results. `--content-cache-refresh` runs everything again (and
+records the new passes).
+
+Results live in pytest's cache (.pytest_cache); `-p no:cacheprovider` or
+`--cache-clear` disables or resets them. Registered from conftest.py.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pytest
+
+from impact import IMPACT_MAP, load_map, module_files
+
+CACHE_KEY = "content-cache/passes"
+KEYS_PER_TEST = 256
+MARKER = "content_cached"
+HIT = ("content_cache", "hit")
+
+
+def add_options(parser) -> None:
+    group = parser.getgroup("content-cache", "content-keyed result caching")
+    group.addoption("--content-cache-refresh", action="store_true",
+                    help=f"Run @{MARKER} tests even when their inputs already passed")
+
+
+def file_digest(path: Path) -> str:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+    except IsADirectoryError:
+        # Directory inputs: hash the listing and every file below it
+        digest = hashlib.sha256()
+        for child in sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts):
+            digest.update(f"{child.relative_to(path).as_posix()}\0{file_digest(child)}\0".encode())
+        return digest.hexdigest()
+
+
+def _relative_label(path: Path, root: Path) -> Optional[str]:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return None
+
+
+def content_key(nodeid: str, inputs: Iterable[Path], root: Path) -> str:
+    """Hash of the node id and the (path, content) of each input, order-independent."""
+    digest = hashlib.sha256(nodeid.encode())
+    for path in sorted({Path(os.path.abspath(p)) for p in inputs}):
+        label = _relative_label(path, root) or str(path)
+        digest.update(f"\0{label}\0{file_digest(path)}".encode())
+    return digest.hexdigest()
+
+
+class ContentCachePlugin:
+    """Skips @content_cached tests whose inputs match an earlier pass."""
+
+    def __init__(self, config):
+        self.root = Path(config.rootpath).resolve()
+        self.cache = config.cache
+        self.refresh = config.getoption("content_cache_refresh")
+        self.passes: Dict[str, List[str]] = self.cache.get(CACHE_KEY, {})
+        self.impact_map = None
+        self.keys: Dict[str, str] = {}
+        self.failed: set = set()
+        self.dirty = False
+
+    def inputs_for(self, item) -> Optional[List[Path]]:
+        """Declared or inferred input files, or None when the test cannot be cached."""
+        marker = item.get_closest_marker(MARKER)
+        if marker is None:
+            return None
+        declared = [Path(p) if Path(p).is_absolute() else self.root / p for p in marker.args]
+        if not declared:
+            if self.impact_map is None:
+                self.impact_map = load_map(self.root / IMPACT_MAP) or {}
+            recorded = self.impact_map.get(item.nodeid)
+            if not recorded:
+                return None
+            declared = [self.root / p.rstrip("/") for p in recorded]
+        module = getattr(item, "module", None)
+        sources = [Path(f) for f in module_files(module)] if module is not None else [Path(item.fspath)]
+        return declared + [p for p in sources if _relative_label(p.resolve(), self.root) is not None]
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        inputs = self.inputs_for(item)
+        if inputs is None:
+            return None
+        key = self.keys[item.nodeid] = content_key(item.nodeid, inputs, self.root)
+        if self.refresh or key not in self.passes.get(item.nodeid, []):
+            return None
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for when in ("setup", "call", "teardown"):
+            report = pytest.TestReport(item.nodeid, item.location, {k: 1 for k in item.keywords},
+                                       "passed", None, when, user_properties=[HIT])
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        key = self.keys.get(report.nodeid)
+        if key is None or HIT in report.user_properties:
+            return
+        if not report.passed:
+            self.failed.add(report.nodeid)
+        elif report.when == "teardown" and report.nodeid not in self.failed:
+            keys = [k for k in self.passes.get(report.nodeid, []) if k != key] + [key]
+            self.passes[report.nodeid] = keys[-KEYS_PER_TEST:]
+            self.dirty = True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_report_teststatus(self, report, config):
+        if report.when == "call" and HIT in report.user_properties:
+            return "cached", "c", "CACHED"
+        return None
+
+    def pytest_sessionfinish(self, session):
+        if self.dirty:
+            self.cache.set(CACHE_KEY, self.passes)
@@ -0,0 +1,63 @@
+"""
+Import-time regression tests for the example addon's lazy resources.lib package.
+
+The lazy-loading checks are deterministic and always run. The warm import
+budget measures wall-clock time, so it is marked slow and only runs with
+--run-slow (make test-scaling).
+"""
+
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add tools directory to path to import bench_addon_import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from bench_addon_import import IMPORT_STATEMENT, measure
+
+ADDON_DIR = Path(__file__).parent.parent.parent / "script.module.example"
+
+# Warm `import resources.lib`, median of fresh interpreters. Today it is a few
+# hundred µs; importing one eager dependency (importlib alone is ~6ms warm) breaks it.
+IMPORT_BUDGET_US = 2500
+
+
+def run_in_addon(code: str) -> str:
+    result = subprocess.run([sys.executable, "-B", "-c", code], cwd=ADDON_DIR,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_import_loads_no_submodules():
+    loaded = run_in_addon(
+        "import sys, resources.lib; "
+        "print(sorted(m for m in sys.modules if m.startswith('resources.lib.') or m in ('importlib', 'warnings')))"
+    )
+    assert loaded == "[]"
+
+
+def test_lazy_attributes_resolve():
+    output = run_in_addon(
+        "import resources.lib as lib; "
+        "print(lib.greet('Kodi')); print(lib.hello_world.hello_world()); "
+        "print('greet' in dir(lib), lib.__all__)"
+    )
+    assert output.splitlines() == [
+        "Hello Kodi, welcome to the Kodi addon module!",
+        "Hello from Kodi addon!",
+        "True ['cached_greeter', 'greet', 'greet_many', 'hello_world']",
+    ]
+
+
+def test_unknown_attribute_raises():
+    output = run_in_addon(
+        "import resources.lib as lib\n"
+        "try:\n    lib.missing\nexcept AttributeError as e:\n    print(e)"
+    )
+    assert output == "module 'resources.lib' has no attribute 'missing'"
+
+
+@pytest.mark.slow
+def test_warm_import_within_budget():
+    assert measure(IMPORT_STATEMENT, ADDON_DIR, runs=7, warm=True) <= IMPORT_BUDGET_US
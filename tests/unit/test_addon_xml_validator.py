@@ -0,0 +1,94 @@
+"""
+Unit tests for the single-pass Kodi addon.xml validator (AddonXmlValidator).
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add tests directory to path to import test_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_helpers import AddonXmlValidator
+
+FIXTURE_ADDON_XML = Path(__file__).parent.parent.parent / "script.module.example" / "addon.xml"
+
+TEMPLATE = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<addon id="{id}" name="Example" version="{version}" provider-name="Test">
+    <requires>
+        <import addon="xbmc.python" version="3.0.0"/>{imports}
+    </requires>
+    <extension point="xbmc.python.module" library="lib"/>{extensions}
+    <extension point="xbmc.addon.metadata">
+        <summary lang="en_GB">Summary</summary>
+        <summary lang="de_DE">Zusammenfassung</summary>{metadata}
+        <news>v1.0.0</news>
+    </extension>
+</addon>
+"""
+
+
+def addon_xml(id="script.module.example", version="1.0.0", imports="", extensions="", metadata=""):
+    return TEMPLATE.format(id=id, version=version, imports=imports, extensions=extensions, metadata=metadata)
+
+
+def errors_of(raw_xml):
+    is_valid, errors = AddonXmlValidator.validate(raw_xml)
+    assert is_valid == (not errors)
+    return [e.split(": ", 1)[1] for e in errors]
+
+
+def test_fixture_and_template_are_valid():
+    assert AddonXmlValidator.validate_file(FIXTURE_ADDON_XML) == (True, [])
+    assert errors_of(addon_xml()) == []
+    assert errors_of(addon_xml().encode("utf-8")) == []
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({"id": "bad id!"}, "invalid addon id 'bad id!'"),
+    ({"version": "v1.0"}, "invalid addon version 'v1.0'"),
+    ({"imports": '\n        <import addon="script.module.six" version="1.x"/>'},
+     "invalid version '1.x' for import 'script.module.six'"),
+    ({"imports": '\n        <import addon="xbmc.python" version="3.0.1"/>'}, "duplicate import of 'xbmc.python'"),
+    ({"imports": '\n        <import version="1.0.0"/>'}, "<import> missing required attribute 'addon'"),
+    ({"imports": '\n        <import addon="a.b" optional="yes"/>'}, "import 'a.b' has optional='yes', expected true/false"),
+    ({"extensions": '\n    <extension point="xbmc.unknown"/>'}, "unknown extension point 'xbmc.unknown'"),
+    ({"extensions": '\n    <extension point="xbmc.python.module" library="lib2"/>'},
+     "duplicate extension point 'xbmc.python.module'"),
+    ({"extensions": '\n    <extension point="xbmc.service"/>'}, "extension 'xbmc.service' missing required attribute 'library'"),
+    ({"extensions": '\n    <extension library="x"/>'}, "<extension> missing required attribute 'point'"),
+    ({"metadata": "\n        <news>again</news>"}, "duplicate <news> in xbmc.addon.metadata"),
+    ({"metadata": '\n        <summary lang="de_DE">Doppelt</summary>'},
+     "duplicate <summary[de_DE]> in xbmc.addon.metadata"),
+])
+def test_structural_errors(kwargs, expected):
+    assert errors_of(addon_xml(**kwargs)) == [expected]
+
+
+def test_missing_root_attributes_and_extensions():
+    errors = errors_of('<addon id="x" version="1.0.0"/>')
+    assert errors == [
+        "<addon> missing required attribute 'name'",
+        "<addon> missing required attribute 'provider-name'",
+        "<addon> has no <extension>",
+    ]
+
+
+def test_errors_carry_line_numbers():
+    _, errors = AddonXmlValidator.validate(addon_xml(extensions='\n    <extension point="xbmc.unknown"/>'))
+    assert errors == ["line 7: unknown extension point 'xbmc.unknown'"]
+
+
+def test_malformed_document():
+    is_valid, errors = AddonXmlValidator.validate('<addon id="x">\n<requires>\n</addon>')
+    assert not is_valid
+    assert errors[-1].startswith("line 3: not well-formed")
+
+
+def test_validate_many_reports_only_failures():
+    documents = [(f"addon-{i}.xml", addon_xml(id=f"script.module.a{i}").encode()) for i in range(2000)]
+    documents[1234] = ("addon-1234.xml", addon_xml(version="one").encode())
+
+    failures = AddonXmlValidator.validate_many(iter(documents))
+
+    assert list(failures) == ["addon-1234.xml"]
@@ -0,0 +1,83 @@
+"""
+Unit tests for the content-addressed .artifacts store (tools/artifact_store.py).
+"""
+
+import os
+from pathlib import Path
+import sys
+
+# Add tools directory to path to import artifact_store
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from artifact_store import ArtifactStore
+
+
+def make_run(root: Path, name: str, files: dict) -> Path:
+    run = root / name
+    for rel, content in files.items():
+        path = run / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return run
+
+
+def test_identical_artifacts_are_stored_once(tmp_path):
+    store = ArtifactStore(tmp_path)
+    files = {"rendered-templates-1/CHANGELOG.md": b"# CHANGELOG\n", "addon.zip": b"PK" * 1000}
+    run_a = make_run(tmp_path, "20240101-000000", files)
+    run_b = make_run(tmp_path, "20240102-000000", {**files, "ci.log": b"log b"})
+
+    first = store.ingest(run_a)
+    second = store.ingest(run_b)
+
+    assert (first.new_objects, first.deduplicated) == (2, 0)
+    assert (second.new_objects, second.deduplicated, second.bytes_saved) == (1, 2, 2012)
+    assert os.path.samefile(run_a / "addon.zip", run_b / "addon.zip")
+    assert (run_b / "addon.zip").read_bytes() == b"PK" * 1000
+    stats = store.stats()
+    assert stats["objects"] == 3
+    assert stats["logical_bytes"] - stats["physical_bytes"] == 2012
+
+
+def test_reingest_skips_hashing_linked_files(tmp_path):
+    store = ArtifactStore(tmp_path)
+    run = make_run(tmp_path, "20240101-000000", {"a.txt": b"a", "b.txt": b"b"})
+    store.ingest(run)
+    (run / "c.txt").write_bytes(b"c")
+
+    again = store.ingest(run)
+
+    assert (again.files, again.hashed, again.new_objects) == (3, 1, 1)
+
+
+def test_diff_compares_manifests(tmp_path):
+    store = ArtifactStore(tmp_path)
+    run_a = make_run(tmp_path, "20240101-000000", {"same": b"x", "changed": b"1", "gone": b"g"})
+    run_b = make_run(tmp_path, "20240102-000000", {"same": b"x", "changed": b"2", "new": b"n"})
+    store.ingest(run_a)
+    store.ingest(run_b)
+
+    result = store.diff(run_a, run_b)
+
+    assert (result.added, result.removed, result.changed, result.unchanged) == (["new"], ["gone"], ["changed"], 1)
+    assert not result.identical
+    assert store.diff(run_a, run_a).identical
+
+
+def test_gc_keeps_objects_still_linked_from_retained_runs(tmp_path):
+    store = ArtifactStore(tmp_path)
+    old = make_run(tmp_path, "20240101-000000", {"shared": b"s", "only-old": b"o"})
+    new = make_run(tmp_path, "20240102-000000", {"shared": b"s", "only-new": b"n"})
+    store.ingest(old)
+    store.ingest(new)
+
+    planned = store.gc(keep=1, dry_run=True)
+    assert old.exists()
+    deleted = store.gc(keep=1)
+
+    assert deleted == planned
+    assert deleted["runs"] == ["20240101-000000"]
+    assert len(deleted["objects"]) == 1
+    assert not old.exists()
+    assert (new / "shared").read_bytes() == b"s"
+    assert store.stats()["objects"] == 2
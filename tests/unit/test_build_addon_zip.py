@@ -0,0 +1,56 @@
+"""
+Unit tests for the precompiled-bytecode addon zip builder (tools/build_addon_zip.py).
+"""
+
+import subprocess
+import sys
+import zipfile
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+
+# Add tools directory to path to import build_addon_zip
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from build_addon_zip import build_addon_zip
+
+ADDON_DIR = Path(__file__).parent.parent.parent / "script.module.example"
+PYCACHE = "script.module.example/resources/lib/__pycache__"
+CACHE_TAG = sys.implementation.cache_tag
+
+
+def test_source_only_zip_has_no_bytecode(tmp_path):
+    zip_path = build_addon_zip(ADDON_DIR, tmp_path / "addon.zip")
+
+    with zipfile.ZipFile(zip_path) as zf:
+        names = zf.namelist()
+    assert "script.module.example/resources/lib/hello_world.py" in names
+    assert not [n for n in names if "__pycache__" in n or n.endswith(".pyc")]
+
+
+def test_bytecode_zip_layout(tmp_path):
+    zip_path = build_addon_zip(ADDON_DIR, tmp_path / "addon.zip", [sys.executable])
+
+    with zipfile.ZipFile(zip_path) as zf:
+        pyc = zf.getinfo(f"{PYCACHE}/hello_world.{CACHE_TAG}.pyc")
+        header = zf.read(pyc)[:8]
+        source = zf.getinfo("script.module.example/resources/lib/hello_world.py")
+        assert f"{PYCACHE}/__init__.{CACHE_TAG}.pyc" in zf.namelist()
+
+    assert pyc.compress_type == zipfile.ZIP_STORED
+    assert source.compress_type == zipfile.ZIP_DEFLATED
+    assert header[:4] == MAGIC_NUMBER
+    # PEP 552 flags: hash-based (bit 0), checked (bit 1)
+    assert int.from_bytes(header[4:8], "little") == 0b11
+
+
+def test_extracted_bytecode_is_used_without_writing(tmp_path):
+    zip_path = build_addon_zip(ADDON_DIR, tmp_path / "addon.zip", [sys.executable], "unchecked-hash")
+    with zipfile.ZipFile(zip_path) as zf:
+        zf.extractall(tmp_path / "install")
+
+    code = "import resources.lib as lib; print(lib.greet('Kodi'))"
+    result = subprocess.run([sys.executable, "-B", "-v", "-c", code], cwd=tmp_path / "install" / "script.module.example",
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "Hello Kodi, welcome to the Kodi addon module!"
+    assert f"code object from '{tmp_path / 'install' / PYCACHE}/hello_world.{CACHE_TAG}.pyc'" in result.stderr
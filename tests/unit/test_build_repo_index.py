@@ -0,0 +1,113 @@
+"""
+Unit tests for the incremental Kodi repository index builder (tools/build_repo_index.py).
+"""
+
+import hashlib
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add tools directory to path to import build_repo_index
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from build_repo_index import build_index
+
+ADDON_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<addon id="{id}" name="Example" version="{version}" provider-name="Test">
+    <requires>
+        <import addon="xbmc.python" version="3.0.0"/>
+    </requires>
+    <extension point="xbmc.python.module" library="lib"/>
+</addon>
+"""
+
+
+def make_zip(repo_dir: Path, addon_id: str, version: str) -> Path:
+    """Create <repo>/<id>/<id>-<version>.zip laid out like the build-kodi-zip action."""
+    zip_path = repo_dir / addon_id / f"{addon_id}-{version}.zip"
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(f"{addon_id}/addon.xml", ADDON_XML.format(id=addon_id, version=version))
+        zf.writestr(f"{addon_id}/resources/lib/__init__.py", "")
+    return zip_path
+
+
+def index_versions(repo_dir: Path) -> dict:
+    root = ET.parse(repo_dir / "addons.xml").getroot()
+    return {addon.get("id"): addon.get("version") for addon in root.findall("addon")}
+
+
+def test_builds_index_and_md5(tmp_path):
+    make_zip(tmp_path, "script.module.example", "0.1.0")
+    make_zip(tmp_path, "script.module.other", "2.0.0")
+
+    stats = build_index(tmp_path)
+
+    assert (stats.total, stats.parsed, stats.written) == (2, 2, True)
+    assert index_versions(tmp_path) == {"script.module.example": "0.1.0", "script.module.other": "2.0.0"}
+    expected_md5 = hashlib.md5((tmp_path / "addons.xml").read_bytes()).hexdigest()
+    assert (tmp_path / "addons.xml.md5").read_text() == expected_md5
+
+
+def test_second_run_reuses_manifest(tmp_path):
+    make_zip(tmp_path, "script.module.example", "0.1.0")
+    build_index(tmp_path)
+
+    stats = build_index(tmp_path)
+
+    assert (stats.parsed, stats.rehashed, stats.written) == (0, 0, False)
+
+
+def test_only_new_release_is_parsed(tmp_path):
+    for i in range(20):
+        make_zip(tmp_path, f"script.module.addon{i}", "1.0.0")
+    build_index(tmp_path)
+
+    make_zip(tmp_path, "script.module.addon3", "1.1.0-rc.1")
+    make_zip(tmp_path, "script.module.addon3", "1.0.1")
+    stats = build_index(tmp_path)
+
+    assert (stats.total, stats.parsed) == (22, 2)
+    # 1.0.1 outranks 1.0.0, and the 1.1.0 prerelease outranks both
+    assert index_versions(tmp_path)["script.module.addon3"] == "1.1.0-rc.1"
+
+
+def test_touched_but_identical_zip_is_not_reparsed(tmp_path):
+    zip_path = make_zip(tmp_path, "script.module.example", "0.1.0")
+    build_index(tmp_path)
+
+    st = zip_path.stat()
+    os.utime(zip_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    stats = build_index(tmp_path)
+
+    assert (stats.rehashed, stats.parsed) == (1, 0)
+
+
+def test_removed_zip_drops_from_index(tmp_path):
+    make_zip(tmp_path, "script.module.example", "0.1.0")
+    gone = make_zip(tmp_path, "script.module.other", "1.0.0")
+    build_index(tmp_path)
+
+    gone.unlink()
+    stats = build_index(tmp_path)
+
+    assert (stats.removed, stats.written) == (1, True)
+    assert index_versions(tmp_path) == {"script.module.example": "0.1.0"}
+    assert len(list((tmp_path / ".addons-index" / "fragments").glob("*.xml"))) == 1
+
+
+def test_validate_rejects_invalid_addon_xml(tmp_path):
+    make_zip(tmp_path, "script.module.good", "1.0.0")
+    bad = tmp_path / "script.module.bad" / "script.module.bad-1.0.0.zip"
+    bad.parent.mkdir()
+    with zipfile.ZipFile(bad, "w") as zf:
+        zf.writestr("script.module.bad/addon.xml", ADDON_XML.format(id="script.module.bad", version="1.0.0")
+                    .replace('point="xbmc.python.module"', 'point="xbmc.unknown"'))
+
+    assert build_index(tmp_path).total == 2
+    with pytest.raises(ValueError, match="unknown extension point"):
+        build_index(tmp_path, force=True, validate=True)
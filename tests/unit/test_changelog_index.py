@@ -0,0 +1,101 @@
+"""
+Unit tests for the CHANGELOG.md sidecar byte-offset index and get_release_notes.
+"""
+
+import os
+from pathlib import Path
+import sys
+
+# Add tests directory to path to import test_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_helpers import ChangelogIndex, ChangelogParser
+
+
+def release_block(version: str) -> str:
+    return f"## v{version} (2024-01-01)\n\n### Features\n\n- add {version} feature ✨\n\n"
+
+
+def write_changelog(path: Path, versions) -> None:
+    path.write_text("# CHANGELOG\n\n" + "".join(release_block(v) for v in versions), encoding="utf-8")
+
+
+def test_index_offsets_cover_each_section(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.1", "1.0.0", "0.2.0"])
+
+    index = ChangelogIndex.build(changelog)
+
+    data = changelog.read_bytes()
+    for version in ("1.0.1", "1.0.0", "0.2.0"):
+        offset, length = index["entries"][version]
+        assert data[offset:offset + length].decode("utf-8") == release_block(version)
+
+
+def test_get_release_notes_reads_only_the_indexed_span(tmp_path, monkeypatch):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.1", "1.0.0", "0.2.0"])
+    ChangelogIndex.build(changelog)
+
+    def full_parse(path):
+        raise AssertionError("fresh index should avoid a full parse")
+    monkeypatch.setattr(ChangelogParser, "parse", full_parse)
+
+    release = ChangelogParser.get_release_notes(changelog, "v1.0.0")
+    assert release.version == "1.0.0"
+    assert release.sections == {"Features": ["add 1.0.0 feature ✨"]}
+
+
+def test_unindexed_version_falls_back_to_full_parse(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.0"])
+    ChangelogIndex.build(changelog)
+
+    assert ChangelogParser.get_release_notes(changelog, "9.9.9") is None
+    assert ChangelogParser.get_release_notes(changelog, "not-a-version") is None
+
+
+def test_stale_index_falls_back_to_full_parse(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.0", "0.2.0"])
+    ChangelogIndex.build(changelog)
+
+    write_changelog(changelog, ["1.0.1", "1.0.0", "0.2.0"])
+    assert ChangelogIndex.lookup(changelog, "1.0.0") is None
+    assert ChangelogParser.get_release_notes(changelog, "1.0.1").version == "1.0.1"
+
+    # Same size and mtime but different bytes: the header check catches the mismatch
+    ChangelogIndex.build(changelog)
+    st = changelog.stat()
+    changelog.write_text(changelog.read_text().replace("## v1.0.1", "## v1.0.2"), encoding="utf-8")
+    os.utime(changelog, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert ChangelogParser.get_release_notes(changelog, "1.0.1") is None
+    assert ChangelogParser.get_release_notes(changelog, "1.0.2").version == "1.0.2"
+
+
+def test_update_after_prepend_matches_full_build(tmp_path, monkeypatch):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.0", "0.2.0", "0.1.0"])
+    ChangelogIndex.build(changelog)
+    write_changelog(changelog, ["1.1.0", "1.0.1", "1.0.0", "0.2.0", "0.1.0"])
+
+    scanned = []
+    original_scan = ChangelogIndex.scan
+    monkeypatch.setattr(ChangelogIndex, "scan", staticmethod(
+        lambda data, start=0, end=None: scanned.append((start, end)) or original_scan(data, start, end)))
+    updated = ChangelogIndex.update(changelog)
+
+    first_old = updated["entries"]["1.0.0"][0]
+    assert scanned == [(0, first_old)]
+    monkeypatch.undo()
+    assert updated == ChangelogIndex.build(changelog)
+    assert ChangelogParser.get_release_notes(changelog, "1.1.0").version == "1.1.0"
+
+
+def test_update_rebuilds_when_history_was_rewritten(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    write_changelog(changelog, ["1.0.0", "0.2.0"])
+    ChangelogIndex.build(changelog)
+    write_changelog(changelog, ["1.0.1", "1.0.0"])
+
+    assert sorted(ChangelogIndex.update(changelog)["entries"]) == ["1.0.0", "1.0.1"]
@@ -0,0 +1,67 @@
+"""
+Property-based (Hypothesis) tests for ChangelogParser.
+
+Random fragments are stretched behind each parser regex's line prefix and
+checked with the curve fit from test_changelog_scaling.py; those fits are
+wall-clock and marked slow. The field check runs by default.
+
+Only this module needs hypothesis, so a missing install skips these tests and
+never the core scaling gate.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings, strategies as st  # noqa: E402
+
+# Add tests directory to path to import test_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_changelog_scaling import assert_linear  # noqa: E402
+from test_helpers import ChangelogParser  # noqa: E402
+
+
+class TestPropertyBasedPathologies:
+    """Hypothesis-driven adversarial inputs, one strategy per parser regex."""
+
+    # Characters each regex treats specially, plus filler
+    ALPHABET = "#-*+ \t().v0123456789aZ"
+
+    LINE_PREFIXES = {
+        "RELEASE_HEADER": "## v1.0.0 ",
+        "RELEASE_HEADER_PRERELEASE": "## v1.0.0-",
+        "SECTION_HEADER": "### ",
+        "LIST_ITEM": "- ",
+    }
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("regex_name", sorted(LINE_PREFIXES))
+    @settings(max_examples=10, deadline=None)
+    @given(fragment=st.text(alphabet=ALPHABET, min_size=1, max_size=12))
+    def test_stretched_line_scales_linearly(self, regex_name, fragment):
+        """Repeating a random fragment inside one line keeps parse time linear."""
+        prefix = self.LINE_PREFIXES[regex_name]
+        assert_linear(lambda n: f"## v0.0.1\n{prefix}{fragment * (n // len(fragment) + 1)}\n")
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("regex_name", sorted(LINE_PREFIXES))
+    @settings(max_examples=10, deadline=None)
+    @given(fragment=st.text(alphabet=ALPHABET + "\n", min_size=1, max_size=12))
+    def test_repeated_lines_scale_linearly(self, regex_name, fragment):
+        """Repeating a random prefixed line many times keeps parse time linear."""
+        line = self.LINE_PREFIXES[regex_name] + fragment + "\n"
+        assert_linear(lambda n: line * (n // len(line) + 1), sizes=[2 ** k for k in range(12, 21, 2)])
+
+    @settings(max_examples=50, deadline=None)
+    @given(content=st.text(alphabet=ALPHABET + "\n", max_size=400))
+    def test_parsed_fields_stay_within_one_line(self, content):
+        """No parsed version, date or item ever contains a newline."""
+        for release in ChangelogParser.parse_text(content):
+            assert "\n" not in release.version
+            assert release.date is None or "\n" not in release.date
+            for name, items in release.sections.items():
+                assert "\n" not in name
+                assert all("\n" not in item for item in items)
@@ -0,0 +1,99 @@
+"""
+Scaling tests for ChangelogParser.
+
+Parses changelogs generated at sizes growing 4x per step and fits the timing
+curve, so superlinear regex behaviour on large or adversarial changelogs fails
+instead of going unnoticed.
+
+The curve fits measure wall-clock time, so they are marked slow and only run
+with --run-slow (make test-scaling); a loaded machine can tilt a fit. The
+Hypothesis-driven inputs live in test_changelog_properties.py.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add tests directory to path to import test_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_helpers import ChangelogParser, ScalingBenchmark
+
+# Parse time may grow at most like size**MAX_EXPONENT
+MAX_EXPONENT = 1.1
+
+# Sizes double twice per step so the curve spans 256x; a single CPU cache
+# boundary then cannot tilt the fitted exponent past the limit
+SIZES = [2 ** k for k in range(12, 21, 2)]
+
+
+def realistic_changelog(n_releases: int) -> str:
+    """Build a PSR-shaped changelog with n_releases releases, newest first."""
+    blocks = []
+    for i in range(n_releases, 0, -1):
+        blocks.append(
+            f"## v{i // 100}.{i // 10 % 10}.{i % 10} (2024-01-01)\n\n"
+            f"### Features\n\n- add feature {i}\n- extend feature {i}\n\n"
+            f"### Bug Fixes\n\n- fix bug {i}\n"
+        )
+    return "# CHANGELOG\n\n" + "\n".join(blocks)
+
+
+# Adversarial documents, each parameterised by a size (lines or characters)
+PATHOLOGICAL_BUILDERS = {
+    "release_header_long_date": lambda n: "## v1.0.0 (" + ")" * n + "x\n",
+    "release_header_trailing_space": lambda n: "## v1.0.0" + " " * n + "x\n",
+    "release_header_blank_lines": lambda n: "## v1.0.0" + "\n" * n + "(date)\n",
+    "release_header_many_unterminated": lambda n: "## v1.0.0 (2024\n" * n,
+    "release_header_long_prerelease": lambda n: "## v1.0.0-" + "rc." * n + "\n",
+    "section_header_long_line": lambda n: "## v1.0.0\n### " + "a " * n + "1\n",
+    "section_header_many_empty": lambda n: "## v1.0.0\n" + "### Features\n" * n,
+    "list_item_long_line": lambda n: "## v1.0.0\n### Features\n- " + "-" * n + "\n",
+    "list_item_whitespace": lambda n: "## v1.0.0\n### Features\n-" + " \t" * n + "x\n",
+    "list_item_many": lambda n: "## v1.0.0\n### Features\n" + "- x\n" * n,
+}
+
+
+def assert_linear(make_input, sizes=SIZES, attempts=3):
+    """
+    Fail if ChangelogParser.parse_text scales worse than MAX_EXPONENT.
+
+    A backtracking blowup exceeds the limit on every measurement, while a
+    noisy one (another process stealing the CPU mid-curve) rarely repeats,
+    so the curve is re-measured up to `attempts` times before failing.
+    """
+    for _ in range(attempts):
+        samples = ScalingBenchmark.measure(ChangelogParser.parse_text, make_input, sizes)
+        exponent = ScalingBenchmark.fit_exponent(samples)
+        if exponent <= MAX_EXPONENT:
+            return
+    pytest.fail(f"Parse time grows like n^{exponent:.2f} (limit {MAX_EXPONENT}): {samples}")
+
+
+def test_fit_exponent_recovers_known_curves():
+    """The curve fit itself reports 1.0 for linear and 2.0 for quadratic samples."""
+    linear = [(n, n * 1e-6) for n in SIZES]
+    quadratic = [(n, n * n * 1e-9) for n in SIZES]
+    assert ScalingBenchmark.fit_exponent(linear) == pytest.approx(1.0)
+    assert ScalingBenchmark.fit_exponent(quadratic) == pytest.approx(2.0)
+
+
+@pytest.mark.slow
+def test_realistic_changelog_scales_linearly():
+    """Parse time of a normal changelog grows linearly with release count."""
+    assert len(ChangelogParser.parse_text(realistic_changelog(16))) == 16
+    assert_linear(realistic_changelog, sizes=[2 ** k for k in range(6, 14, 2)])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("builder", sorted(PATHOLOGICAL_BUILDERS))
+def test_pathological_changelog_scales_linearly(builder):
+    """Adversarial line lengths and line counts do not trigger regex backtracking blowups."""
+    assert_linear(PATHOLOGICAL_BUILDERS[builder])
+
+
+def test_release_header_does_not_span_lines():
+    """A date in parentheses on a later line is not folded into the release header."""
+    releases = ChangelogParser.parse_text(PATHOLOGICAL_BUILDERS["release_header_blank_lines"](3))
+    assert [r.version for r in releases] == ["1.0.0"]
+    assert releases[0].date is None
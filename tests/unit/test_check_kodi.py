@@ -0,0 +1,106 @@
+"""
+Unit tests for tools/check_kodi.py (single-project output and discovery mode).
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path to import check_kodi
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from check_kodi import discover, matrix_lines
+
+CHECK_KODI = Path(__file__).parent.parent.parent / "tools" / "check_kodi.py"
+
+KODI_PYPROJECT = """
+[project]
+name = "{name}"
+
+[tool.arranger]
+kodi-addon-directory = "script.module.{name}"
+
+[tool.psr-prepare.changelog]
+news_types = {{feat = "new"}}
+"""
+
+PYPI_PYPROJECT = """
+[project]
+name = "{name}"
+"""
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    for i in range(3):
+        (tmp_path / "addons" / f"a{i}").mkdir(parents=True)
+        (tmp_path / "addons" / f"a{i}" / "pyproject.toml").write_text(KODI_PYPROJECT.format(name=f"a{i}"))
+    (tmp_path / "libs" / "pypi").mkdir(parents=True)
+    (tmp_path / "libs" / "pypi" / "pyproject.toml").write_text(PYPI_PYPROJECT.format(name="pypi"))
+    # Never searched
+    (tmp_path / "libs" / "pypi" / ".venv" / "dep").mkdir(parents=True)
+    (tmp_path / "libs" / "pypi" / ".venv" / "dep" / "pyproject.toml").write_text(PYPI_PYPROJECT.format(name="dep"))
+    return tmp_path
+
+
+def test_single_project_output_unchanged(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(KODI_PYPROJECT.format(name="x"))
+
+    result = subprocess.run([sys.executable, str(CHECK_KODI), str(pyproject)], capture_output=True, text=True)
+
+    assert result.stdout.splitlines() == [
+        "is_kodi=true", "kodi_addon_directory=script.module.x", "kodi_directory=script.module.x",
+    ]
+
+
+def test_discover_classifies_every_project(monorepo):
+    projects, parsed = discover(monorepo)
+
+    assert parsed == 4
+    assert [(p["dir"], p["is_kodi"], p["kodi_addon_directory"]) for p in projects] == [
+        ("addons/a0", True, "script.module.a0"),
+        ("addons/a1", True, "script.module.a1"),
+        ("addons/a2", True, "script.module.a2"),
+        ("libs/pypi", False, None),
+    ]
+    assert projects[0]["psr_prepare"] == {"changelog": {"news_types": {"feat": "new"}}}
+
+
+def test_cache_reuses_unchanged_files(monorepo, tmp_path):
+    cache = tmp_path / "cache" / "check_kodi.json"
+    first, _ = discover(monorepo, cache_path=cache)
+
+    second, parsed = discover(monorepo, cache_path=cache)
+    assert (second, parsed) == (first, 0)
+
+    (monorepo / "libs" / "pypi" / "pyproject.toml").write_text(KODI_PYPROJECT.format(name="pypi"))
+    third, parsed = discover(monorepo, cache_path=cache)
+    assert parsed == 1
+    assert third[-1]["is_kodi"]
+
+
+def test_broken_pyproject_is_reported(monorepo):
+    (monorepo / "addons" / "a1" / "pyproject.toml").write_text("[project\n")
+
+    result = subprocess.run([sys.executable, str(CHECK_KODI), "--discover", str(monorepo)],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert "Error reading addons/a1/pyproject.toml" in result.stderr
+    assert json.loads(result.stdout)["kodi_directories"] == ["addons/a0", "addons/a2"]
+
+
+def test_matrix_lines(monorepo):
+    projects, _ = discover(monorepo)
+
+    lines = dict(line.split("=", 1) for line in matrix_lines(projects))
+
+    assert len(json.loads(lines["matrix"])["include"]) == 4
+    assert json.loads(lines["kodi_matrix"])["include"][0] == {
+        "project": "addons/a0", "is_kodi": True, "kodi_directory": "script.module.a0",
+    }
+    assert lines["project_count"] == "4"
@@ -0,0 +1,112 @@
+"""
+Unit tests for the ci-simulate consolidated log index (tools/ci_log_index.py).
+"""
+
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add tools directory to path to import ci_log_index
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from ci_log_index import LOG_NAME, CiLogIndex, split_steps
+
+WF = "[PSR Template Test Harness/{job}]"
+
+
+def phase_log(phase: int, expected: str, latest: str, released: str) -> str:
+    job = WF.format(job=f"phase-{phase}")
+    lines = [
+        f"{job} ⭐ Run Main Run PSR Phase {phase}",
+        f"{job} ⭐ Run Main Debug - Verify tag visibility and PSR starting point (Phase {phase})",
+        f"{job}   | === All tags ===",
+        f"{job}   | {latest}",
+        f"{job}   | ",
+        f"{job}   | === Latest tag ===",
+        f"{job}   | {latest}",
+        f"{job}   | ",
+        f"{job}   | === Phase config (from phase-config.json) ===",
+        f"{job}   | {{",
+        f'{job}   |   "version": "{expected}"',
+        f"{job}   | }}",
+        f"{job}   | ",
+        f"{job}   | === Steps output version ===",
+        f"{job}   | Version from steps.phase-config.outputs.version: {expected}",
+        f"{job}   ✅  Success - Main Debug - Verify tag visibility and PSR starting point (Phase {phase}) [120ms]",
+        f"{job} ⭐ Run Main Run PSR (ACT mode - local simulation with gitea)",
+        f"{job}   | [12:00:00] INFO     Creating changelog",
+        f"{job}   | {released}",
+        f"{job}   ✅  Success - Main Run PSR (ACT mode - local simulation with gitea) [3.1s]",
+        f"{job}   ✅  Success - Main Run PSR Phase {phase} [9.8s]",
+        f"{job} 🏁  Job succeeded",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_run(root: Path, name: str, *phases) -> Path:
+    run = root / name
+    run.mkdir(parents=True)
+    setup = WF.format(job="setup")
+    text = (f"{setup} ⭐ Run Main Compute branch name\n"
+            f"{setup}   | test_branch=ci/{name}\n"
+            f"{setup}   ❌  Failure - Main Compute branch name\n")
+    (run / LOG_NAME).write_text(text + "".join(phase_log(*p) for p in phases), encoding="utf-8")
+    return run
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = CiLogIndex(tmp_path / "index.sqlite")
+    yield idx
+    idx.close()
+
+
+def test_split_steps_nests_composite_steps(tmp_path):
+    run = write_run(tmp_path, "20240101-000000", (3, "v1.0.0", "v0.2.0", "1.0.0"))
+
+    with open(run / LOG_NAME, encoding="utf-8") as f:
+        records = list(split_steps(f))
+
+    assert [(r.job, r.phase, r.step, r.status) for r in records] == [
+        ("setup", None, "Compute branch name", "failure"),
+        ("phase-3", 3, "Debug - Verify tag visibility and PSR starting point (Phase 3)", "success"),
+        ("phase-3", 3, "Run PSR (ACT mode - local simulation with gitea)", "success"),
+        ("phase-3", 3, "Run PSR Phase 3", "success"),
+    ]
+    assert records[2].output == ["[12:00:00] INFO     Creating changelog", "1.0.0"]
+
+
+def test_step_output_across_runs(tmp_path, index):
+    for day in range(1, 4):
+        index.ingest(write_run(tmp_path, f"2024010{day}-000000", (3, "v1.0.0", "v0.2.0", f"1.0.{day}")))
+
+    entries = index.step_output(phase=3, step="Run PSR (ACT", last=2)
+
+    assert [(e["run"], e["output"].splitlines()[-1]) for e in entries] == [
+        ("20240103-000000", "1.0.3"),
+        ("20240102-000000", "1.0.2"),
+    ]
+
+
+def test_tag_mismatch_compares_released_and_configured_versions(tmp_path, index):
+    index.ingest(write_run(tmp_path, "20240101-000000", (1, "v0.1.0", "No tags found", "0.1.0"),
+                           (2, "v0.2.0", "v0.1.0", "0.1.1")))
+
+    assert index.tag_mismatches() == [
+        {"run": "20240101-000000", "phase": 2, "latest_tag": "v0.1.0", "expected": "v0.2.0", "released": "0.1.1"},
+    ]
+
+
+def test_unchanged_logs_are_not_reindexed(tmp_path, index):
+    run = write_run(tmp_path, "20240101-000000", (1, "v0.1.0", "No tags found", "0.1.0"))
+    assert index.ingest(run)
+    assert not index.ingest(run)
+
+    with open(run / LOG_NAME, "a", encoding="utf-8") as f:
+        f.write(phase_log(2, "v0.2.0", "v0.1.0", "0.2.0"))
+    os.utime(run / LOG_NAME, ns=(0, 1))
+
+    assert index.ingest(run)
+    assert [r["steps"] for r in index.runs()] == [7]
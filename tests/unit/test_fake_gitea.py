@@ -0,0 +1,140 @@
+"""
+Unit tests for the in-process Gitea/GitHub API stand-in (tools/fake_gitea.py).
+"""
+
+import json
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from fake_gitea import FakeGitea
+
+OWNER = "brianpatrickreavey"
+REPO = "psr-templates-fixture"
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def api(server, method, path, payload=None, data=None, content_type="application/json", auth=True):
+    body = json.dumps(payload).encode() if payload is not None else data
+    request = urllib.request.Request(f"{server.url}{path}", data=body, method=method)
+    request.add_header("Content-Type", content_type)
+    if auth:
+        request.add_header("Authorization", f"token {server.token}")
+    with urllib.request.urlopen(request) as response:
+        raw = response.read()
+        return response.status, (json.loads(raw) if raw and response.headers.get_content_type() == "application/json" else raw)
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    repo = tmp_path / "source"
+    repo.mkdir()
+    git("init", "--quiet", "--initial-branch=main", cwd=repo)
+    git("config", "user.name", "Test", cwd=repo)
+    git("config", "user.email", "test@test.local", cwd=repo)
+    (repo / "README.md").write_text("fixture\n")
+    git("add", "README.md", cwd=repo)
+    git("commit", "--quiet", "-m", "initial", cwd=repo)
+    return repo
+
+
+def test_starts_in_under_a_second(tmp_path):
+    started = time.perf_counter()
+    with FakeGitea(tmp_path / "server") as server:
+        assert api(server, "GET", "/api/v1/user")[1]["login"] == OWNER
+    assert time.perf_counter() - started < 1.0
+
+
+def test_clone_push_tag_and_list_refs(fake_gitea, source_repo, tmp_path):
+    fake_gitea.create_repo(OWNER, REPO, source=source_repo)
+    clone = tmp_path / "clone"
+    git("clone", "--quiet", fake_gitea.remote_url(OWNER, REPO), str(clone), cwd=tmp_path)
+    git("config", "user.name", "Test", cwd=clone)
+    git("config", "user.email", "test@test.local", cwd=clone)
+    git("checkout", "--quiet", "-b", "ci/test-run", cwd=clone)
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: add thing (ci-test-run)", cwd=clone)
+    git("tag", "v0.1.0", cwd=clone)
+    git("push", "--quiet", "origin", "ci/test-run", "v0.1.0", cwd=clone)
+
+    for prefix in ("/api/v1", "/api/v3", ""):
+        _, refs = api(fake_gitea, "GET", f"{prefix}/repos/{OWNER}/{REPO}/git/refs/tags")
+        assert [r["ref"] for r in refs] == ["refs/tags/v0.1.0"]
+        assert refs[0]["object"]["sha"] == git("rev-parse", "HEAD", cwd=clone)
+
+    status, _ = api(fake_gitea, "DELETE", f"/repos/{OWNER}/{REPO}/git/refs/tags/v0.1.0")
+    assert status == 204
+    assert git("ls-remote", "--tags", "origin", cwd=clone) == ""
+
+
+def test_push_requires_credentials(fake_gitea, source_repo, tmp_path):
+    fake_gitea.create_repo(OWNER, REPO, source=source_repo)
+    result = subprocess.run(
+        ["git", "push", fake_gitea.remote_url(OWNER, REPO, auth=False), "HEAD:refs/heads/ci/anon"],
+        cwd=source_repo, capture_output=True, text=True,
+        env={"GIT_TERMINAL_PROMPT": "0", "PATH": "/usr/bin:/bin:/usr/local/bin"},
+    )
+    assert result.returncode != 0
+
+
+def test_release_lifecycle_with_assets(fake_gitea, source_repo):
+    fake_gitea.create_repo(OWNER, REPO, source=source_repo)
+    base = f"/api/v1/repos/{OWNER}/{REPO}/releases"
+
+    _, release = api(fake_gitea, "POST", base, {"tag_name": "v0.1.0", "body": "notes"})
+    _, asset = api(fake_gitea, "POST", f"{base}/{release['id']}/assets?name=addon.zip",
+                   data=b"zip-bytes", content_type="application/zip")
+    # --clobber style re-upload replaces the asset of the same name
+    api(fake_gitea, "POST", f"{base}/{release['id']}/assets?name=addon.zip",
+        data=b"zip-bytes-2", content_type="application/zip")
+
+    _, latest = api(fake_gitea, "GET", f"{base}/latest", auth=False)
+    assert latest["tag_name"] == "v0.1.0"
+    assert [(a["name"], a["size"]) for a in latest["assets"]] == [("addon.zip", 11)]
+    with urllib.request.urlopen(latest["assets"][0]["browser_download_url"]) as response:
+        assert response.read() == b"zip-bytes-2"
+
+    _, by_tag = api(fake_gitea, "GET", f"{base}/tags/v0.1.0")
+    assert by_tag["id"] == release["id"]
+    assert api(fake_gitea, "DELETE", f"{base}/{release['id']}")[0] == 204
+    assert api(fake_gitea, "GET", base)[1] == []
+
+
+def test_multipart_upload_and_write_auth(fake_gitea, source_repo):
+    fake_gitea.create_repo(OWNER, REPO, source=source_repo)
+    base = f"/api/v1/repos/{OWNER}/{REPO}/releases"
+    _, release = api(fake_gitea, "POST", base, {"tag_name": "v1.0.0"})
+
+    boundary = "fakeboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"attachment\"; filename=\"CHANGELOG.md\"\r\n"
+        f"Content-Type: text/markdown\r\n\r\n## v1.0.0\r\n--{boundary}--\r\n"
+    ).encode()
+    _, asset = api(fake_gitea, "POST", f"{base}/{release['id']}/assets", data=body,
+                   content_type=f"multipart/form-data; boundary={boundary}")
+    assert (asset["name"], asset["size"]) == ("CHANGELOG.md", len(b"## v1.0.0"))
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        api(fake_gitea, "POST", base, {"tag_name": "v2.0.0"}, auth=False)
+    assert excinfo.value.code == 401
+
+
+@pytest.mark.parametrize("payload", [{}, {"name": "no tag"}, {"tag_name": ""}, ["v1.0.0"]])
+def test_release_without_tag_name_is_rejected(fake_gitea, source_repo, payload):
+    fake_gitea.create_repo(OWNER, REPO, source=source_repo)
+    base = f"/api/v1/repos/{OWNER}/{REPO}/releases"
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        api(fake_gitea, "POST", base, payload)
+    assert excinfo.value.code == 422
+    assert json.loads(excinfo.value.read()) == {"message": "[TagName]: Required"}
+    assert api(fake_gitea, "GET", base)[1] == []
@@ -0,0 +1,48 @@
+"""
+Unit tests for the example addon's greeting API (resources.lib.hello_world).
+"""
+
+import types
+from pathlib import Path
+import sys
+
+# Add the addon directory to path to import resources.lib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "script.module.example"))
+
+from resources.lib import hello_world
+
+
+def test_greet_many_matches_greet():
+    names = ["Ann", "Bob", "Ann"]
+
+    lazy = hello_world.greet_many(names)
+
+    assert not isinstance(lazy, list)
+    assert list(lazy) == [hello_world.greet(n) for n in names]
+    assert hello_world.greet_many(iter(names), as_list=True) == [hello_world.greet(n) for n in names]
+
+
+def test_greet_many_is_lazy():
+    def names():
+        yield "Ann"
+        raise AssertionError("consumed past the first name")
+
+    assert next(hello_world.greet_many(names())) == hello_world.greet("Ann")
+
+
+def test_cached_greeter_counts_hits_and_stays_bounded():
+    greeter = hello_world.cached_greeter(maxsize=2)
+
+    result = hello_world.greet_many(["Ann", "Bob", "Ann", "Cid", "Bob"], greeter=greeter, as_list=True)
+
+    assert result == [hello_world.greet(n) for n in ["Ann", "Bob", "Ann", "Cid", "Bob"]]
+    info = greeter.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 4, 2, 2)
+
+
+def test_exports_are_lazy_package_attributes():
+    import resources.lib as lib
+
+    assert isinstance(lib.hello_world, types.ModuleType)
+    assert lib.greet_many is hello_world.greet_many
+    assert lib.cached_greeter is hello_world.cached_greeter
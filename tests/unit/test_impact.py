@@ -0,0 +1,122 @@
+"""
+Unit tests for test-impact recording and selection (tests/impact.py).
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add tests directory to path to import impact
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from impact import changed_files, is_impacted
+
+TESTS_DIR = Path(__file__).parent.parent
+
+CONFTEST = '''
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import impact
+
+
+def pytest_addoption(parser):
+    impact.add_options(parser)
+
+
+def pytest_configure(config):
+    if config.getoption("impact_record") or config.getoption("impact_base"):
+        config.pluginmanager.register(impact.ImpactPlugin(config), "test-impact")
+'''
+
+TEST_READERS = '''
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_reads_changelog():
+    assert (ROOT / "CHANGELOG.md").read_text()
+
+
+def test_reads_addon_xml():
+    assert (ROOT / "addon" / "addon.xml").read_text()
+
+
+def test_runs_tool():
+    subprocess.run([sys.executable, "tools/tool.py"], cwd=ROOT, check=True)
+'''
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+def make_repo(root: Path) -> Path:
+    git(root, "init", "-q", "-b", "main")
+    git(root, "config", "user.email", "test@example.com")
+    git(root, "config", "user.name", "Test")
+    return root
+
+
+def pytest_in(repo: Path, *args: str) -> str:
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests", *args],
+                            cwd=repo, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def test_is_impacted_matches_files_and_directories():
+    assert is_impacted(["tools/a.py"], ["tools/a.py"])
+    assert not is_impacted(["tools/a.py"], ["tools/ab.py"])
+    assert is_impacted(["script.module.example/"], ["script.module.example/addon.xml"])
+    assert not is_impacted(["script.module.example/"], ["script.module.examples/addon.xml"])
+    assert not is_impacted([], ["tools/a.py"])
+
+
+def test_changed_files_covers_worktree_untracked_and_renames(tmp_path):
+    repo = make_repo(tmp_path)
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (repo / name).write_text(name)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "base")
+
+    (repo / "a.txt").write_text("changed")
+    git(repo, "mv", "b.txt", "renamed.txt")
+    (repo / "new.txt").write_text("new")
+
+    assert changed_files(repo, "HEAD") == ["a.txt", "b.txt", "new.txt", "renamed.txt"]
+
+
+def test_record_then_select_only_affected_tests(tmp_path):
+    repo = make_repo(tmp_path)
+    (repo / "tests").mkdir()
+    shutil.copy(TESTS_DIR / "impact.py", repo / "tests" / "impact.py")
+    (repo / "tests" / "conftest.py").write_text(CONFTEST)
+    (repo / "tests" / "test_readers.py").write_text(TEST_READERS)
+    (repo / "tools").mkdir()
+    (repo / "tools" / "tool.py").write_text("print('ok')\n")
+    (repo / "addon").mkdir()
+    (repo / "addon" / "addon.xml").write_text("<addon/>")
+    (repo / "CHANGELOG.md").write_text("# CHANGELOG\n")
+    (repo / ".gitignore").write_text(".test-impact.json\n__pycache__/\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "base")
+
+    assert "3 passed" in pytest_in(repo, "--impact-record")
+
+    output = pytest_in(repo, "--impact-base", "HEAD")
+    assert "test-impact: 0 of 3 tests affected by 0 changed files since HEAD" in output
+
+    (repo / "addon" / "addon.xml").write_text("<addon id='x'/>")
+    (repo / "tools" / "tool.py").write_text("print('changed')\n")
+    output = pytest_in(repo, "--impact-base", "HEAD", "-rA")
+    assert "test-impact: 2 of 3 tests affected by 2 changed files since HEAD" in output
+    assert "PASSED tests/test_readers.py::test_reads_addon_xml" in output
+    assert "PASSED tests/test_readers.py::test_runs_tool" in output
+    assert "1 deselected" in output
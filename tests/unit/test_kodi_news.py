@@ -0,0 +1,96 @@
+"""
+Unit tests for the budgeted Kodi news-block builder (tools/kodi_news.py).
+"""
+
+from pathlib import Path
+import sys
+
+# Add tools directory to path to import kodi_news
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from kodi_news import build_news, splice_news, update_addon_xml
+from test_helpers import AddonXmlParser, ChangelogParser
+
+NEWS_TYPES = {"feat": "new", "fix": "fix", "perf": "improved"}
+FIXTURE_ADDON_XML = Path(__file__).parent.parent.parent / "script.module.example" / "addon.xml"
+
+
+def release_block(version: str) -> str:
+    return (f"## v{version} (2024-01-01)\n\n"
+            f"### Features\n\n- add {version} feature\n\n"
+            f"### Bug Fixes\n\n- fix {version} bug\n\n"
+            f"### Documentation\n\n- document {version}\n\n")
+
+
+def write_changelog(path: Path, versions) -> Path:
+    path.write_text("# CHANGELOG\n\n" + "".join(release_block(v) for v in versions), encoding="utf-8")
+    return path
+
+
+def test_news_maps_sections_through_news_types(tmp_path):
+    changelog = write_changelog(tmp_path / "CHANGELOG.md", ["1.0.1", "1.0.0"])
+
+    news = build_news(ChangelogParser.iter_releases(changelog), NEWS_TYPES, budget=1500)
+
+    assert news.splitlines() == [
+        "v1.0.1 (2024-01-01)", "[new] add 1.0.1 feature", "[fix] fix 1.0.1 bug",
+        "v1.0.0 (2024-01-01)", "[new] add 1.0.0 feature", "[fix] fix 1.0.0 bug",
+    ]
+
+
+def test_budget_is_respected_and_headers_keep_an_item(tmp_path):
+    changelog = write_changelog(tmp_path / "CHANGELOG.md", ["1.0.1", "1.0.0"])
+    full = build_news(ChangelogParser.iter_releases(changelog), NEWS_TYPES, budget=1500)
+
+    for budget in range(0, len(full) + 1):
+        news = build_news(ChangelogParser.iter_releases(changelog), NEWS_TYPES, budget=budget)
+        assert len(news.encode("utf-8")) <= budget
+        assert not news.splitlines() or not news.splitlines()[-1].startswith("v")
+
+
+def test_streaming_stops_once_budget_is_full(tmp_path):
+    changelog = write_changelog(tmp_path / "CHANGELOG.md", [f"1.0.{i}" for i in range(5000, 0, -1)])
+    # Anything past the first few releases is unreadable; a bounded builder never gets there
+    with open(changelog, "ab") as f:
+        f.write(b"\xff\xfe not utf-8\n")
+
+    news = build_news(ChangelogParser.iter_releases(changelog), NEWS_TYPES, budget=200)
+    assert news.startswith("v1.0.5000")
+
+
+def test_splice_preserves_the_rest_of_the_document(tmp_path):
+    raw_xml = FIXTURE_ADDON_XML.read_text()
+    news = "v1.0.1 (2024-01-01)\n[fix] a &lt; b"
+
+    updated = splice_news(raw_xml, news)
+
+    start = raw_xml.index("<news>")
+    end = raw_xml.index("</news>") + len("</news>")
+    assert updated == raw_xml[:start] + f"<news>{news}</news>" + raw_xml[end:]
+    assert AddonXmlParser.parse_text(updated).news_content == "v1.0.1 (2024-01-01)\n[fix] a < b"
+
+
+def test_splice_inserts_news_into_metadata_extension():
+    raw_xml = ('<addon id="x" version="1.0.0">\n'
+               '    <extension point="xbmc.addon.metadata">\n'
+               '        <summary>s</summary>\n'
+               '    </extension>\n'
+               '</addon>\n')
+
+    updated = splice_news(raw_xml, "v1.0.0")
+
+    assert "        <news>v1.0.0</news>\n    </extension>" in updated
+    assert AddonXmlParser.parse_text(updated).news_content == "v1.0.0"
+
+
+def test_update_addon_xml_escapes_entries(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("## v1.0.0 (2024-01-01)\n\n### Features\n\n- support <b> & friends\n")
+    addon_xml = tmp_path / "addon.xml"
+    addon_xml.write_text(FIXTURE_ADDON_XML.read_text())
+
+    update_addon_xml(addon_xml, changelog, NEWS_TYPES)
+
+    info = AddonXmlParser.parse(addon_xml)
+    assert AddonXmlParser.extract_news_section(info) == "v1.0.0 (2024-01-01)\n[new] support <b> & friends"
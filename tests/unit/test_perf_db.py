@@ -0,0 +1,139 @@
+"""
+Unit tests for the historical performance store (tools/perf_db.py).
+"""
+
+import json
+import random
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+# Add tools directory to path to import perf_db
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from perf_db import PerfDB, changepoint_rows, changepoints, check_rows, latest_shift, min_abs_change, run_files
+
+PERF_DB = Path(__file__).parent.parent.parent / "tools" / "perf_db.py"
+
+ACT_LOG = """[Test Harness/phase-3] ⭐ Run Main Run PSR
+[Test Harness/phase-3]   | released 1.1.0
+[Test Harness/phase-3]   ✅  Success - Main Run PSR [2.5s]
+[Test Harness/phase-3] ⭐ Run Main Build zip
+[Test Harness/phase-3]   ✅  Success - Main Build zip [1m2.5s]
+"""
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="2">
+<testcase classname="tests.integration.post_psr.test_post_psr" name="test_changelog" time="0.250"/>
+<testcase classname="tests.integration.post_psr.test_post_psr" name="test_zip" time="1.500"/>
+</testsuite></testsuites>
+"""
+
+
+def write_run(run_dir: Path, psr_seconds: float = 2.5, render_seconds: float = 0.1) -> Path:
+    run_dir.mkdir(parents=True)
+    (run_dir / "ci-simulate-consolidated-gitea.log").write_text(ACT_LOG.replace("[2.5s]", f"[{psr_seconds}s]"))
+    (run_dir / "harness-results.json").write_text(json.dumps([{
+        "phase": 1, "expected_version": "0.1.0", "steps": {"psr": psr_seconds},
+        "resources": {"psr": {"wall_s": psr_seconds, "cpu_s": 1.0, "peak_rss_mb": 80.0}},
+    }]))
+    (run_dir / "bench-changelog-render.json").write_text(json.dumps({
+        "rows": [{"releases": 100, "changelog": {"seconds": render_seconds, "peak_bytes": 4096, "errors": []}}],
+        "exponents": {"changelog": 1.0},
+        "units": {"seconds": "s", "peak_bytes": "bytes"},
+    }))
+    artifact = run_dir / "1" / "pytest-post-psr"
+    artifact.mkdir(parents=True)
+    with zipfile.ZipFile(artifact / "pytest-post-psr.zip", "w") as archive:
+        archive.writestr("pytest-post-psr.xml", JUNIT)
+        archive.writestr("phase-resources.jsonl", json.dumps(
+            {"phase": 3, "step": "zip", "usage": {"wall_s": 0.4, "write_mb": 2.0}}) + "\n")
+    return run_dir
+
+
+def test_ingest_extracts_every_source(tmp_path):
+    run_dir = write_run(tmp_path / ".artifacts" / "20260101-120000")
+    db = PerfDB(tmp_path / "perf.sqlite")
+    try:
+        assert db.ingest(run_dir.name, run_files(run_dir), commit="abc1234")
+        # Unchanged files are not re-read
+        assert not db.ingest(run_dir.name, run_files(run_dir))
+
+        latest = {key: points[-1][2] for key, points in db.series().items()}
+        assert latest[("ci-log", "phase-3/Build zip", "wall_s")] == 62.5
+        assert latest[("harness", "phase-1/psr", "peak_rss_mb")] == 80.0
+        assert latest[("bench", "changelog-render/rows/releases=100/changelog", "seconds")] == 0.1
+        assert latest[("bench", "changelog-render/rows/releases=100/changelog", "peak_bytes")] == 4096
+        # Only the leaves the bench declares in "units" are metrics
+        assert not [key for key in latest if key[0] == "bench" and key[2] not in ("seconds", "peak_bytes")]
+        assert latest[("pytest", "tests.integration.post_psr.test_post_psr::test_zip", "duration_s")] == 1.5
+        assert latest[("resources", "phase-3/zip", "write_mb")] == 2.0
+        # act's numeric run directory is dropped so artifact sizes line up across runs
+        assert ("artifact", "pytest-post-psr/pytest-post-psr.zip", "bytes") in latest
+        assert db.runs()[0]["commit"] == "abc1234"
+    finally:
+        db.close()
+
+
+def test_changepoints_find_level_shift_and_ignore_noise():
+    rng = random.Random(1)
+    noisy = [10 + rng.uniform(-0.3, 0.3) for _ in range(30)]
+    shifted = noisy[:18] + [v + 3 for v in noisy[18:]]
+
+    assert changepoints(noisy, "wall_s") == []
+    assert changepoints(shifted, "wall_s") == [18]
+    # Shifts below the metric's absolute floor (50ms) are not reported
+    assert changepoints([v / 1000 for v in shifted], "wall_s") == []
+
+
+def test_bench_metrics_have_absolute_floors():
+    assert min_abs_change("seconds") == 0.001
+    assert min_abs_change("import_us") == min_abs_change("first_use_us") == 100
+    assert min_abs_change("peak_bytes") == min_abs_change("bytes") == 1024
+    # A 30µs jump in a ~300µs import is noise, however tight the baseline
+    assert changepoints([300.0] * 10 + [330.0] * 10, "import_us") == []
+    assert changepoints([300.0] * 10 + [600.0] * 10, "import_us") == [10]
+
+
+def test_commit_needs_a_named_run(tmp_path):
+    write_run(tmp_path / ".artifacts" / "20260101-120000")
+    result = subprocess.run([sys.executable, str(PERF_DB), "ingest", "--commit", "abc1234"],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "--commit applies to a named run" in result.stderr
+    assert not (tmp_path / ".artifacts" / "perf.sqlite").exists()
+
+
+def test_latest_shift_flags_only_regressions():
+    baseline = [2.0, 2.05, 1.95, 2.02, 1.98]
+
+    assert latest_shift(baseline + [3.0], "wall_s") == (2.0, 3.0)
+    assert latest_shift(baseline + [2.04], "wall_s") is None
+    assert latest_shift(baseline + [1.0], "wall_s") is None
+    assert latest_shift([2.0, 3.0], "wall_s") is None
+
+
+def test_psr_slowdown_reported_on_the_run_it_lands(tmp_path):
+    db = PerfDB(tmp_path / "perf.sqlite")
+    try:
+        for day in range(1, 9):
+            slow = day >= 6
+            run_dir = write_run(tmp_path / f"2026010{day}-120000", psr_seconds=4.0 if slow else 2.5)
+            db.ingest(run_dir.name, run_files(run_dir), commit=f"c{day}")
+            series = db.series()
+            if day == 6:
+                regressions = check_rows(series, window=10, threshold=4.0, min_change=0.1)
+                assert {(r["source"], r["key"], r["metric"]) for r in regressions} == {
+                    ("ci-log", "phase-3/Run PSR", "wall_s"),
+                    ("harness", "phase-1/psr", "wall_s"),
+                }
+                assert {r["commit"] for r in regressions} == {"c6"}
+
+        shifts = changepoint_rows(db.series(match="psr"), threshold=4.0, min_change=0.1)
+        assert {(r["key"], r["run"], r["commit"]) for r in shifts} == {
+            ("phase-3/Run PSR", "20260106-120000", "c6"),
+            ("phase-1/psr", "20260106-120000", "c6"),
+        }
+    finally:
+        db.close()
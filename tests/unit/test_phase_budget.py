@@ -0,0 +1,89 @@
+"""
+Unit tests for harness step resource accounting and budgets (tools/phase_budget.py).
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path to import phase_budget
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from phase_budget import BUDGETS_PATH, ResourceMeter, budget_for, load_budgets, violations
+
+PHASE_BUDGET = Path(__file__).parent.parent.parent / "tools" / "phase_budget.py"
+ALLOCATE_AND_WRITE = "import os; x = bytearray(200 * 1024 * 1024); os.write(1, b'.' * (8 * 1024 * 1024))"
+
+
+def test_repo_budgets_cover_every_harness_step():
+    budgets = load_budgets(BUDGETS_PATH)
+
+    assert set(budgets["defaults"]) == {"generate_commits", "prepare", "psr", "zip", "tests"}
+
+
+def test_phase_overrides_defaults(tmp_path):
+    path = tmp_path / "phase-budgets.json"
+    path.write_text(json.dumps({"defaults": {"psr": {"wall_s": 60, "cpu_s": 30}},
+                                "phases": {"3": {"psr": {"wall_s": 90}}}}))
+    budgets = load_budgets(path)
+
+    assert budget_for(budgets, 1, "psr") == {"wall_s": 60, "cpu_s": 30}
+    assert budget_for(budgets, 3, "psr") == {"wall_s": 90, "cpu_s": 30}
+    assert budget_for(budgets, 3, "zip") == {}
+
+    path.write_text(json.dumps({"defaults": {"psr": {"rss": 1}}}))
+    with pytest.raises(ValueError, match="unknown metric"):
+        load_budgets(path)
+
+
+@pytest.mark.skipif(not Path("/proc/self/io").exists(), reason="needs /proc")
+def test_meter_counts_child_processes():
+    with ResourceMeter() as meter:
+        subprocess.run([sys.executable, "-c", ALLOCATE_AND_WRITE], stdout=subprocess.DEVNULL, check=True)
+    usage = meter.usage
+
+    assert usage.peak_rss_mb > 200
+    assert usage.write_mb >= 8
+    assert usage.cpu_s > 0
+    assert violations(usage, {"peak_rss_mb": 100, "wall_s": 60}) == [f"peak_rss_mb {usage.peak_rss_mb:.2f} > 100"]
+
+    # The peak is reset per block
+    with ResourceMeter() as meter:
+        pass
+    assert meter.usage.peak_rss_mb < 200
+
+
+@pytest.mark.skipif(not Path("/proc/self/io").exists(), reason="needs /proc")
+def test_sampler_reads_are_not_counted():
+    """An idle block reads nothing; the sampler's own /proc reads are subtracted."""
+    with ResourceMeter() as meter:
+        time.sleep(0.3)
+    assert meter._proc.bytes_read > 0
+    assert meter.usage.read_mb == 0
+
+
+@pytest.mark.skipif(not Path("/proc/self/io").exists(), reason="needs /proc")
+def test_cli_fails_over_budget_and_logs(tmp_path):
+    budgets = tmp_path / "phase-budgets.json"
+    budgets.write_text(json.dumps({"defaults": {"psr": {"peak_rss_mb": 100}}}))
+    log = tmp_path / "resources.jsonl"
+
+    result = subprocess.run(
+        [sys.executable, str(PHASE_BUDGET), "--step", "psr", "--phase", "2", "--budgets", str(budgets),
+         "--log", str(log), "--", sys.executable, "-c", ALLOCATE_AND_WRITE],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 1
+    assert "ERROR: Resource budget exceeded in phase 2 step 'psr':\n  peak_rss_mb " in result.stderr
+    entry = json.loads(log.read_text())
+    assert (entry["phase"], entry["step"], entry["limits"]) == (2, "psr", {"peak_rss_mb": 100})
+    assert len(entry["violations"]) == 1
+
+    failing = subprocess.run([sys.executable, str(PHASE_BUDGET), "--step", "zip", "--budgets", str(budgets),
+                              "--", sys.executable, "-c", "raise SystemExit(4)"], capture_output=True)
+    assert failing.returncode == 4
@@ -0,0 +1,81 @@
+"""
+Unit tests for the PSR record/replay store (tools/psr_replay.py).
+"""
+
+import json
+import subprocess
+from pathlib import Path
+import sys
+
+# Add tools directory to path to import psr_replay
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from psr_replay import ReplayStore, capture_inputs
+
+PHASE_CONFIG = {"phases": {"1": {"version": "v0.1.0", "force": None}, "2": {"version": "v0.2.0", "force": None}}}
+
+
+def git(*args, cwd):
+    return subprocess.run(["git"] + list(args), cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def make_tree(path: Path) -> Path:
+    """Pre-release tree: config, templates and a phase commit."""
+    (path / ".github" / "workflows").mkdir(parents=True)
+    (path / ".github" / "workflows" / "phase-config.json").write_text(json.dumps(PHASE_CONFIG))
+    (path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    (path / "templates").mkdir()
+    (path / "templates" / "CHANGELOG.md.j2").write_text("{{ ctx }}")
+    git("init", "--quiet", "-b", "main", cwd=path)
+    git("config", "user.name", "Test", cwd=path)
+    git("config", "user.email", "test@example.com", cwd=path)
+    git("add", ".", cwd=path)
+    git("commit", "--quiet", "-m", "feat: first (ci-test-run)", cwd=path)
+    return path
+
+
+def record_release(store: ReplayStore, tree: Path) -> None:
+    inputs = capture_inputs(tree, 1)
+    (tree / "CHANGELOG.md").write_text("# CHANGELOG\n\n## v0.1.0 (2024-01-01)\n")
+    store.record(inputs, tree, ["CHANGELOG.md"], "v0.1.0", "0.1.0", "chore: release v0.1.0")
+
+
+def test_replay_restores_recorded_files(tmp_path):
+    store = ReplayStore(tmp_path / "store")
+    record_release(store, make_tree(tmp_path / "recorded"))
+
+    # An independent tree with the same history replays without a release
+    fresh = make_tree(tmp_path / "fresh")
+    outputs = store.replay(capture_inputs(fresh, 1), fresh)
+
+    assert outputs["tag"] == "v0.1.0"
+    assert outputs["commit_message"] == "chore: release v0.1.0"
+    assert (fresh / "CHANGELOG.md").read_text().startswith("# CHANGELOG")
+
+
+def test_input_changes_miss(tmp_path):
+    store = ReplayStore(tmp_path / "store")
+    tree = make_tree(tmp_path / "tree")
+    record_release(store, tree)
+    (tree / "CHANGELOG.md").unlink()
+    assert store.lookup(capture_inputs(tree, 1)) is not None
+
+    assert store.lookup(capture_inputs(tree, 2)) is None
+
+    (tree / "templates" / "CHANGELOG.md.j2").write_text("{{ ctx }}\n")
+    assert store.lookup(capture_inputs(tree, 1)) is None
+
+    (tree / "templates" / "CHANGELOG.md.j2").write_text("{{ ctx }}")
+    git("commit", "--quiet", "--allow-empty", "-m", "fix: later (ci-test-run)", cwd=tree)
+    assert store.lookup(capture_inputs(tree, 1)) is None
+
+
+def test_identical_outputs_share_one_blob(tmp_path):
+    store = ReplayStore(tmp_path / "store")
+    tree = make_tree(tmp_path / "tree")
+    (tree / "addon.xml").write_text("<addon/>")
+    store.record(capture_inputs(tree, 1), tree, ["addon.xml"], "v0.1.0", "0.1.0", None)
+    store.record(capture_inputs(tree, 2), tree, ["addon.xml"], "v0.2.0", "0.2.0", None)
+
+    assert len(store.list_records()) == 2
+    assert len(list(store.objects.rglob("*"))) == 2  # one fan-out dir + one blob
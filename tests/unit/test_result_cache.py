@@ -0,0 +1,124 @@
+"""
+Unit tests for content-keyed test result caching (tests/result_cache.py).
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tests directory to path to import result_cache
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from result_cache import content_key
+
+TESTS_DIR = Path(__file__).parent.parent
+
+CONFTEST = '''
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import result_cache
+
+
+def pytest_addoption(parser):
+    result_cache.add_options(parser)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "content_cached(*paths): cache passes")
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(result_cache.ContentCachePlugin(config), "content-cache")
+'''
+
+TESTS = '''
+from pathlib import Path
+
+import pytest
+
+DATA = Path(__file__).parent.parent / "data.txt"
+
+
+@pytest.mark.content_cached("data.txt")
+def test_declared():
+    assert DATA.read_text().startswith("ok")
+
+
+@pytest.mark.content_cached
+def test_inferred():
+    assert DATA.read_text()
+
+
+def test_uncached():
+    pass
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "tests").mkdir()
+    for helper in ("impact.py", "result_cache.py"):
+        shutil.copy(TESTS_DIR / helper, tmp_path / "tests" / helper)
+    (tmp_path / "tests" / "conftest.py").write_text(CONFTEST)
+    (tmp_path / "tests" / "test_data.py").write_text(TESTS)
+    (tmp_path / "data.txt").write_text("ok 1")
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    return tmp_path
+
+
+def run(project: Path, *args: str) -> dict:
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "tests", *args],
+                            cwd=project, capture_output=True, text=True)
+    summary = result.stdout.strip().splitlines()[-1]
+    return {label: int(count) for count, label in re.findall(r"(\d+) (\w+)", summary) if label != "in"}
+
+
+def test_passes_are_cached_per_input_content(project):
+    # test_inferred has no impact map entry, so it always runs
+    assert run(project) == {"passed": 3}
+    assert run(project) == {"passed": 2, "cached": 1}
+
+    (project / "data.txt").write_text("ok 2")
+    assert run(project) == {"passed": 3}
+    (project / "data.txt").write_text("ok 1")
+    assert run(project) == {"passed": 2, "cached": 1}
+
+    assert run(project, "--content-cache-refresh") == {"passed": 3}
+
+
+def test_test_source_change_invalidates(project):
+    run(project)
+    (project / "tests" / "test_data.py").write_text(TESTS + "\n# edited\n")
+
+    assert run(project) == {"passed": 3}
+
+
+def test_failures_are_not_cached(project):
+    (project / "data.txt").write_text("bad")
+    assert run(project) == {"failed": 1, "passed": 2}
+    assert run(project) == {"failed": 1, "passed": 2}
+
+
+def test_inputs_inferred_from_impact_map(project):
+    impact_map = {"version": 1, "tests": {"tests/test_data.py::test_inferred": ["data.txt"]}}
+    (project / ".test-impact.json").write_text(json.dumps(impact_map))
+
+    assert run(project) == {"passed": 3}
+    assert run(project) == {"passed": 1, "cached": 2}
+    (project / "data.txt").write_text("ok 2")
+    assert run(project) == {"passed": 3}
+
+
+def test_content_key_ignores_input_order(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.write_text("a")
+
+    assert content_key("t", [a, b], tmp_path) == content_key("t", [b, a], tmp_path)
+    b.write_text("b")
+    assert content_key("t", [a, b], tmp_path) != content_key("t", [a], tmp_path)
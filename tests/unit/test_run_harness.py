@@ -0,0 +1,156 @@
+"""
+Unit tests for the act-free harness runner (tools/run_harness.py).
+
+The phase sequence runs against a small fixture repo with a stand-in release
+command, so these tests cover the git/worktree/zip/validate plumbing without
+needing psr-prepare or python-semantic-release installed.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import textwrap
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path to import run_harness
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from run_harness import HarnessError, HarnessRunner, parse_phases
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+ADDON_DIR = "script.module.example"
+
+# Tags the phase version (unless already tagged), renders CHANGELOG.md and
+# addon.xml for every tag so far, commits and pushes like `semantic-release version`
+FAKE_RELEASE = textwrap.dedent('''
+    import os, re, subprocess, sys
+    from pathlib import Path
+
+    def git(*args):
+        return subprocess.run(["git"] + list(args), check=True, capture_output=True, text=True).stdout
+
+    tag = os.environ["HARNESS_PHASE_VERSION"]
+    if tag in git("tag").split():
+        sys.exit(0)
+    tags = git("tag").split() + [tag]
+    versions = sorted((t.lstrip("v") for t in tags), key=lambda v: tuple(map(int, v.split("."))), reverse=True)
+    Path("CHANGELOG.md").write_text("# CHANGELOG\\n\\n" + "".join(
+        f"## v{v} (2024-01-01)\\n\\n### Features\\n\\n- change in {v}\\n\\n" for v in versions))
+    addon_xml = Path("@ADDON_DIR@/addon.xml")
+    addon_xml.write_text(re.sub(r'version="[^"]*" provider', f'version="{versions[0]}" provider', addon_xml.read_text()))
+    git("add", "CHANGELOG.md", str(addon_xml))
+    git("commit", "-m", f"chore(release): {tag}")
+    git("tag", tag)
+    git("push", "origin", "HEAD", tag)
+''').replace("@ADDON_DIR@", ADDON_DIR)
+
+
+def git(*args, cwd):
+    return subprocess.run(["git"] + list(args), cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def fixture_repo(tmp_path):
+    """Minimal fixture repo carrying the real phase-config.json and addon.xml, plus a stale tag."""
+    repo = tmp_path / "source"
+    (repo / ".github" / "workflows").mkdir(parents=True)
+    shutil.copy(REPO_ROOT / ".github" / "workflows" / "phase-config.json", repo / ".github" / "workflows")
+    shutil.copytree(REPO_ROOT / ADDON_DIR, repo / ADDON_DIR, ignore=shutil.ignore_patterns("__pycache__"))
+    (repo / "pyproject.toml").write_text(f'[tool.arranger]\nkodi-addon-directory = "{ADDON_DIR}"\n')
+    git("init", "--quiet", "-b", "main", cwd=repo)
+    git("config", "user.name", "Test", cwd=repo)
+    git("config", "user.email", "test@example.com", cwd=repo)
+    git("add", ".", cwd=repo)
+    git("commit", "--quiet", "-m", "initial", cwd=repo)
+    git("commit", "--quiet", "--allow-empty", "-m", "second", cwd=repo)
+    git("tag", "v9.9.9", cwd=repo)
+    return repo
+
+
+@pytest.fixture
+def runner(fixture_repo, tmp_path):
+    release_script = tmp_path / "fake_release.py"
+    release_script.write_text(FAKE_RELEASE)
+    return HarnessRunner(
+        fixture_repo, tmp_path / "work", "unit",
+        prepare_cmd="true", release_cmd=f"{sys.executable} {release_script}",
+    )
+
+
+def test_parse_phases():
+    assert parse_phases(None, [1, 2, 3, 4, 5]) == [1, 2, 3, 4, 5]
+    assert parse_phases("2-4", [1, 2, 3, 4, 5]) == [2, 3, 4]
+    assert parse_phases("1,5", [1, 2, 3, 4, 5]) == [1, 5]
+    with pytest.raises(HarnessError):
+        parse_phases("6", [1, 2, 3, 4, 5])
+
+
+def test_setup_creates_clean_branch(runner, fixture_repo):
+    runner.setup()
+
+    assert git("tag", cwd=runner.remote) == ""
+    assert git("rev-parse", runner.branch, cwd=runner.remote) == git("rev-parse", "main", cwd=fixture_repo)
+
+
+def test_all_phases_release_and_validate(runner):
+    results = runner.run(runner.available_phases)
+
+    assert [r.phase for r in results] == [1, 2, 3, 4, 5]
+    for result in results:
+        assert result.ok, result.errors
+        assert result.tag == result.expected_version
+
+    # Phase commits landed on the file:// remote alongside the release tags
+    subjects = git("log", "--format=%s", runner.branch, cwd=runner.remote)
+    assert "feat: [PHASE-1] add user authentication system (ci-test-run)" in subjects
+    assert git("tag", cwd=runner.remote).split() == ["v0.1.0", "v0.2.0", "v1.0.0", "v1.0.1"]
+
+    zip_path = runner.artifacts / "phase-5" / f"{ADDON_DIR}-1.0.1.zip"
+    with zipfile.ZipFile(zip_path) as zf:
+        assert f"{ADDON_DIR}/addon.xml" in zf.namelist()
+        assert 'version="1.0.1"' in zf.read(f"{ADDON_DIR}/addon.xml").decode()
+
+
+def test_failed_validation_stops_run(runner):
+    runner.phase_config["2"]["version"] = "v0.3.0"
+    runner.release_cmd = ["true"]
+
+    results = runner.run(runner.available_phases)
+
+    assert len(results) == 1
+    assert not results[0].ok
+    assert "CHANGELOG.md was not rendered" in results[0].errors
+    assert json.dumps(results[0].steps)
+
+
+def test_replay_skips_release_command(runner, fixture_repo, tmp_path):
+    from psr_replay import ReplayStore
+
+    store = ReplayStore(tmp_path / "replay")
+    runner.replay_store = store
+    assert all(r.ok for r in runner.run(runner.available_phases))
+
+    # Same inputs in a fresh run: every phase replays, the release command never runs
+    replaying = HarnessRunner(fixture_repo, tmp_path / "work2", "unit", prepare_cmd="true",
+                              release_cmd="false", replay_store=store, replay=True)
+    results = replaying.run(replaying.available_phases)
+
+    for result in results:
+        assert result.ok, result.errors
+        assert result.replayed
+    assert git("tag", cwd=replaying.remote).split() == ["v0.1.0", "v0.2.0", "v1.0.0", "v1.0.1"]
+
+
+def test_step_over_budget_fails_phase(runner):
+    runner.budgets = {"defaults": {"zip": {"peak_rss_mb": 10_000}}, "phases": {"2": {"psr": {"wall_s": 0}}}}
+
+    results = runner.run(runner.available_phases)
+
+    assert [r.ok for r in results] == [True, False]
+    assert results[0].resources["psr"]["cpu_s"] > 0
+    assert results[1].errors[0].startswith("Resource budget exceeded in phase 2 step 'psr':\n  wall_s ")
+    assert "psr" in results[1].steps
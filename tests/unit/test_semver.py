@@ -0,0 +1,126 @@
+"""
+Unit tests for the Version model and semver-aware changelog ordering.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add tests directory to path to import test_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_helpers import AddonXmlInfo, AddonXmlParser, ChangelogParser, Version
+
+PRERELEASE_CHANGELOG = """# CHANGELOG
+
+## v1.0.0 (2024-03-01)
+
+### Features
+
+- stable API
+
+## v1.0.0-rc.2+build.7 (2024-02-20)
+
+### Bug Fixes
+
+- fix release candidate
+
+## v1.0.0-rc.1 (2024-02-10)
+
+### Features
+
+- first candidate
+
+## v0.2.0 (2024-01-15)
+
+### Features
+
+- second release
+"""
+
+
+def test_parse_components():
+    """Prerelease and build identifiers are split on dots."""
+    version = Version.parse("v1.2.3-rc.1+build.5")
+    assert (version.major, version.minor, version.patch) == (1, 2, 3)
+    assert version.prerelease == ("rc", "1")
+    assert version.build == ("build", "5")
+    assert version.is_prerelease
+    assert str(version) == "1.2.3-rc.1+build.5"
+
+
+@pytest.mark.parametrize("text", ["1.2", "1.2.3-", "1.2.3+", "1.2.3-rc..1", "v", "1.2.3 beta"])
+def test_parse_rejects_invalid(text):
+    """Malformed versions raise ValueError and try_parse returns None."""
+    with pytest.raises(ValueError):
+        Version.parse(text)
+    assert Version.try_parse(text) is None
+
+
+def test_parse_is_cached():
+    """Parsing the same string twice returns the same instance."""
+    assert Version.parse("4.5.6-alpha") is Version.parse("4.5.6-alpha")
+
+
+def test_precedence_follows_semver():
+    """Ordering follows the semver 2.0.0 precedence example."""
+    ordered = [
+        "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta",
+        "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.1", "1.10.0", "2.0.0",
+    ]
+    versions = [Version.parse(v) for v in ordered]
+    assert sorted(reversed(versions)) == versions
+    assert all(a < b for a, b in zip(versions, versions[1:]))
+
+
+def test_build_metadata_ignored_for_precedence_only():
+    """Build metadata does not change ordering but does distinguish equality."""
+    plain, built = Version.parse("1.0.0"), Version.parse("1.0.0+build.1")
+    assert plain.sort_key == built.sort_key
+    assert not plain < built and not built < plain
+    assert plain != built
+    assert len({plain, built, Version.parse("v1.0.0")}) == 2
+
+
+def test_changelog_parses_prerelease_headers():
+    """Prerelease and build-metadata headers are no longer dropped."""
+    releases = ChangelogParser.parse_text(PRERELEASE_CHANGELOG)
+    assert ChangelogParser.get_all_versions(releases) == [
+        "1.0.0", "1.0.0-rc.2+build.7", "1.0.0-rc.1", "0.2.0",
+    ]
+    assert releases[1].date == "2024-02-20"
+    assert releases[1].sections == {"Bug Fixes": ["fix release candidate"]}
+
+
+def test_get_release_compares_parsed_versions():
+    """Lookups accept a 'v' prefix and match prerelease versions exactly."""
+    releases = ChangelogParser.parse_text(PRERELEASE_CHANGELOG)
+    assert ChangelogParser.get_release(releases, "v1.0.0-rc.1").version == "1.0.0-rc.1"
+    assert ChangelogParser.get_release(releases, "1.0.0").version == "1.0.0"
+    assert ChangelogParser.get_release(releases, "1.0.0-rc.3") is None
+    assert ChangelogParser.get_release(releases, "not-a-version") is None
+
+
+def test_validate_descending():
+    """Strict descending order is checked in one pass over the sort keys."""
+    releases = ChangelogParser.parse_text(PRERELEASE_CHANGELOG)
+    assert ChangelogParser.validate_descending(releases) == (True, [])
+
+    shuffled = [releases[2], releases[0], releases[1], releases[3]]
+    is_descending, violations = ChangelogParser.validate_descending(shuffled)
+    assert not is_descending
+    assert violations == [("1.0.0-rc.1", "1.0.0")]
+    assert ChangelogParser.sort_releases(shuffled) == releases
+
+
+def test_validate_descending_rejects_duplicates():
+    """Two headers with equal precedence are not strictly descending."""
+    releases = ChangelogParser.parse_text("## v1.0.0\n- a\n## v1.0.0+rebuild\n- b\n")
+    assert ChangelogParser.validate_descending(releases) == (False, [("1.0.0", "1.0.0+rebuild")])
+
+
+def test_addon_validate_version_semver_and_fallback():
+    """Semver versions compare parsed; non-semver Kodi versions compare as strings."""
+    assert AddonXmlParser.validate_version(AddonXmlInfo(id="a", version="1.0.0-rc.1"), "v1.0.0-rc.1")
+    assert not AddonXmlParser.validate_version(AddonXmlInfo(id="a", version="1.0.0-rc.1"), "1.0.0")
+    assert AddonXmlParser.validate_version(AddonXmlInfo(id="a", version="1.0"), "v1.0")
@@ -0,0 +1,160 @@
+"""
+Unit tests for the in-process template render engine (tools/render_helpers.py).
+
+Uses small stand-in templates shaped like the arranged PSR templates, so the
+engine itself is covered even before psr-prepare has populated templates/.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+pytest.importorskip("jinja2")
+
+# Add tests directory to path to import helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add tools directory to path to import render_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from render_helpers import TemplateRenderEngine, phase_context_spec, synthetic_history_spec
+from test_helpers import AddonXmlParser, ChangelogParser
+
+CHANGELOG_J2 = """# CHANGELOG
+{% for version, release in ctx.history.released.items() %}
+## {{ version.as_tag() }} ({{ release.tagged_date.strftime("%Y-%m-%d") }})
+{% for type_, commits in release["elements"] | dictsort %}
+### {{ type_ | title }}
+{% for commit in commits %}
+- {{ commit.descriptions[0] }} ([`{{ commit.short_hash }}`]({{ commit.hexsha | commit_hash_url }}))
+{% endfor %}{% endfor %}{% endfor %}
+"""
+
+ADDON_XML_J2 = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+{% set latest = (ctx.history.released.values() | list)[0] %}
+<addon id="script.module.example" name="Example Module" version="{{ latest.version }}" provider-name="Test">
+    <extension point="xbmc.addon.metadata">
+        <news>v{{ latest.version }}</news>
+    </extension>
+</addon>
+"""
+
+
+@pytest.fixture
+def engine(tmp_path):
+    template_dir = tmp_path / "templates"
+    (template_dir / "script.module.example").mkdir(parents=True)
+    (template_dir / "CHANGELOG.md.j2").write_text(CHANGELOG_J2)
+    (template_dir / "script.module.example" / "addon.xml.j2").write_text(ADDON_XML_J2)
+    return TemplateRenderEngine(template_dir, bytecode_cache_dir=tmp_path / "bytecode")
+
+
+def test_phase_specs_follow_phase_config():
+    """Docs-only phase 4 creates no release; its commits roll into 1.0.1."""
+    assert [r["version"] for r in phase_context_spec(3)["releases"]] == ["1.0.0", "0.2.0", "0.1.0"]
+    spec_4, spec_5 = phase_context_spec(4), phase_context_spec(5)
+    assert [r["version"] for r in spec_4["releases"]] == ["1.0.0", "0.2.0", "0.1.0"]
+    assert len(spec_4["unreleased"]) == 2
+    assert spec_5["releases"][0]["version"] == "1.0.1"
+    assert len(spec_5["releases"][0]["commits"]) == 4
+    assert spec_5["unreleased"] == []
+
+
+@pytest.mark.parametrize("phase", [1, 2, 3, 4, 5])
+def test_rendered_outputs_parse(engine, phase):
+    """Rendered changelog and addon.xml parse with the existing helpers."""
+    spec = phase_context_spec(phase)
+    expected = [r["version"] for r in spec["releases"]]
+
+    releases = ChangelogParser.parse_text(engine.render("CHANGELOG.md.j2", spec))
+    assert ChangelogParser.get_all_versions(releases) == expected
+    assert ChangelogParser.validate_descending(releases)[0]
+    assert all(release.sections for release in releases)
+
+    addon_info = AddonXmlParser.parse_text(engine.render("script.module.example/addon.xml.j2", spec))
+    assert AddonXmlParser.validate_version(addon_info, expected[0])
+
+
+def test_renders_are_memoized(engine):
+    """Same template and context hit the memo; an equal spec built separately does too."""
+    engine.render("CHANGELOG.md.j2", phase_context_spec(2))
+    engine.render("CHANGELOG.md.j2", phase_context_spec(2))
+    engine.render("CHANGELOG.md.j2", phase_context_spec(3))
+    assert (engine.hits, engine.misses) == (1, 2)
+
+
+def test_template_change_invalidates_memo(engine):
+    """Editing a template changes its hash, so the next render is fresh."""
+    spec = phase_context_spec(1)
+    before = engine.render("CHANGELOG.md.j2", spec)
+
+    path = engine.template_dir / "CHANGELOG.md.j2"
+    path.write_text(path.read_text().replace("# CHANGELOG", "# Release History"))
+    after = engine.render("CHANGELOG.md.j2", spec)
+
+    assert before.startswith("# CHANGELOG")
+    assert after.startswith("# Release History")
+    assert engine.misses == 2
+
+
+def test_partial_change_invalidates_memo(engine):
+    """Editing an included partial re-renders the templates that include it, and only those."""
+    partial = engine.template_dir / ".header.j2"
+    partial.write_text("# CHANGELOG")
+    template = engine.template_dir / "CHANGELOG.md.j2"
+    template.write_text(template.read_text().replace("# CHANGELOG", '{% include ".header.j2" %}'))
+    spec = phase_context_spec(1)
+    assert engine.render("CHANGELOG.md.j2", spec).startswith("# CHANGELOG")
+    engine.render("script.module.example/addon.xml.j2", spec)
+
+    partial.write_text("# Release History")
+
+    assert engine.render("CHANGELOG.md.j2", spec).startswith("# Release History")
+    engine.render("script.module.example/addon.xml.j2", spec)
+    assert (engine.hits, engine.misses) == (1, 3)
+
+
+def test_memo_hits_do_not_reparse_templates(engine, monkeypatch):
+    """The reference graph is cached per file; only a changed template is parsed again."""
+    partial = engine.template_dir / ".header.j2"
+    partial.write_text("# CHANGELOG")
+    template = engine.template_dir / "CHANGELOG.md.j2"
+    template.write_text(template.read_text().replace("# CHANGELOG", '{% include ".header.j2" %}'))
+    spec = phase_context_spec(1)
+    engine.render("CHANGELOG.md.j2", spec)
+
+    parsed = []
+    parse = engine.environment.parse
+
+    def counting_parse(source, *args, **kwargs):
+        parsed.append(source)
+        return parse(source, *args, **kwargs)
+
+    monkeypatch.setattr(engine.environment, "parse", counting_parse)
+    for _ in range(3):
+        engine.render("CHANGELOG.md.j2", spec)
+    assert parsed == []
+
+    partial.write_text("# Release History")
+    assert engine.render("CHANGELOG.md.j2", spec).startswith("# Release History")
+    assert parsed[0] == "# Release History"
+
+
+def test_synthetic_history_uses_news_types():
+    """Synthetic releases are strictly newest first and only use news_types commit types."""
+    spec = synthetic_history_spec(250, {"feat": "new", "fix": "fix", "perf": "improved"})
+    versions = [release["version"] for release in spec["releases"]]
+    assert len(versions) == len(set(versions)) == 250
+    assert versions[0] == "0.2.50" and versions[-1] == "0.0.1"
+    types = {subject.split(":")[0] for release in spec["releases"] for subject in release["commits"]}
+    assert types == {"feat", "fix", "perf"}
+
+
+def test_render_benchmark_validates_output(engine):
+    """The benchmark renders, validates and fits a curve over the requested sizes."""
+    from bench_changelog_render import run_benchmark
+
+    results = run_benchmark(engine.template_dir, [10, 20, 40], {"feat": "new", "fix": "fix"}, repeat=1)
+
+    assert [row["releases"] for row in results["rows"]] == [10, 20, 40]
+    assert all(not row["changelog"]["errors"] and not row["addon_xml"]["errors"] for row in results["rows"])
+    assert set(results["exponents"]) == {"changelog", "addon_xml"}
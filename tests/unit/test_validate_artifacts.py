@@ -0,0 +1,87 @@
+"""
+Unit tests for shared-memory parallel artifact validation (tools/validate_artifacts.py).
+"""
+
+import pickle
+import sys
+import zipfile
+from pathlib import Path
+
+# Add tools directory to path to import validate_artifacts
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from validate_artifacts import ADDON_XML, CHANGELOG, ArtifactBatch, synthetic_changelog, validate
+from test_helpers import ChangelogParser
+
+FIXTURE_ADDON_XML = Path(__file__).parent.parent.parent / "script.module.example" / "addon.xml"
+
+CHANGELOG_MD = """# CHANGELOG
+
+## v1.1.0 (2024-02-01)
+
+### Features
+
+- add greet_many ([`abc1234`](url))
+
+## v1.0.0 (2024-01-01)
+
+### Bug Fixes
+
+- fix greeting
+"""
+
+
+def test_results_match_parse_text(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text(CHANGELOG_MD)
+    batch = ArtifactBatch()
+    batch.add_file(changelog)
+    batch.add_bytes("zip:CHANGELOG.md", CHANGELOG_MD.encode(), CHANGELOG)
+
+    with batch:
+        results = validate(batch, workers=2)
+        materialized = [batch.releases(i, r) for i, r in enumerate(results)]
+
+    assert [r.errors for r in results] == [[], []]
+    assert [span[0] for span in results[0].spans] == ["1.1.0", "1.0.0"]
+    assert materialized[0] == materialized[1] == ChangelogParser.parse_text(CHANGELOG_MD)
+
+
+def test_errors_reported_per_document(tmp_path):
+    broken = CHANGELOG_MD.replace("v1.1.0", "v0.9.0") + "\n{{ release.version }}\n"
+    zip_path = tmp_path / "script.module.example-1.0.0.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("script.module.example/addon.xml", FIXTURE_ADDON_XML.read_bytes())
+    batch = ArtifactBatch()
+    batch.add_bytes("broken.md", broken.encode(), CHANGELOG)
+    batch.add_bytes("empty.md", b"", CHANGELOG)
+    batch.add_bytes("zip", zipfile.ZipFile(zip_path).read("script.module.example/addon.xml"), ADDON_XML)
+    batch.add_bytes("bad.xml", b"<addon id='x'>", ADDON_XML)
+
+    with batch:
+        results = {r.name: r.errors for r in validate(batch, workers=2)}
+        inline = {r.name: r.errors for r in validate(batch, workers=0)}
+
+    assert results == inline
+    assert [e.split(": ", 1)[1] for e in results["broken.md"]] == [
+        "1.0.0 listed after 0.9.0, expected descending order", "unrendered Jinja2 syntax",
+    ]
+    assert results["empty.md"] == ["no release headers"]
+    assert results["zip"] == []
+    assert "not well-formed" in results["bad.xml"][-1]
+
+
+def test_result_size_does_not_grow_with_content():
+    small, large = synthetic_changelog(10_000), synthetic_changelog(10_000).replace(b"add a feature", b"x" * 2000)
+    batch = ArtifactBatch()
+    batch.add_bytes("small", small, CHANGELOG)
+    batch.add_bytes("large", large, CHANGELOG)
+
+    with batch:
+        results = validate(batch, workers=2)
+
+    assert len(large) > 10 * len(small)
+    sizes = [len(pickle.dumps((r.errors, r.spans))) for r in results]
+    # Only offsets grow (a few bytes wider), not the release contents
+    assert sizes[1] - sizes[0] < 100
+    assert sizes[0] < len(small) // 10
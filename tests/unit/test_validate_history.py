@@ -0,0 +1,87 @@
+"""
+Unit tests for tag-history validation over one git cat-file stream (tools/validate_history.py).
+"""
+
+import subprocess
+from pathlib import Path
+import sys
+from typing import List, Optional
+
+# Add tools directory to path to import validate_history
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from validate_history import validate_history
+
+ADDON_XML_PATH = "script.module.example/addon.xml"
+ADDON_XML = '<?xml version="1.0" encoding="UTF-8"?>\n<addon id="script.module.example" version="{version}"/>\n'
+
+
+def changelog(versions: List[str]) -> str:
+    return "# CHANGELOG\n\n" + "".join(
+        f"## v{v} (2024-01-01)\n\n### Features\n\n- change in {v}\n\n" for v in reversed(versions)
+    )
+
+
+def build_history(repo: Path, releases: List[str], addon_versions: Optional[List[str]] = None) -> None:
+    """Create one commit + tag per release with git fast-import (much faster than per-commit git calls)."""
+    subprocess.run(["git", "init", "--quiet", "-b", "main", str(repo)], check=True)
+    addon_versions = addon_versions or releases
+    stream = []
+    for i, version in enumerate(releases):
+        files = {"CHANGELOG.md": changelog(releases[:i + 1]),
+                 ADDON_XML_PATH: ADDON_XML.format(version=addon_versions[i])}
+        stream.append(f"commit refs/heads/main\nmark :{i + 1}\n"
+                      f"committer Test <test@example.com> {1700000000 + i} +0000\n"
+                      f"data 7\nrelease\n")
+        if i:
+            stream.append(f"from :{i}\n")
+        for path, content in files.items():
+            data = content.encode()
+            stream.append(f"M 100644 inline {path}\ndata {len(data)}\n{content}\n")
+        stream.append(f"reset refs/tags/v{version}\nfrom :{i + 1}\n\n")
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=repo, input="".join(stream).encode(), check=True)
+
+
+def test_valid_history(tmp_path):
+    releases = ["0.1.0", "0.2.0", "1.0.0", "1.0.1"]
+    build_history(tmp_path, releases)
+
+    report = validate_history(tmp_path, addon_xml_path=ADDON_XML_PATH)
+
+    assert report.ok, [t.errors for t in report.tags]
+    assert [t.tag for t in report.tags] == ["v0.1.0", "v0.2.0", "v1.0.0", "v1.0.1"]
+
+
+def test_reports_stale_addon_xml_and_missing_section(tmp_path):
+    build_history(tmp_path, ["0.1.0", "0.2.0"], addon_versions=["0.1.0", "0.1.0"])
+    subprocess.run(["git", "tag", "v0.3.0", "v0.2.0"], cwd=tmp_path, check=True)
+
+    report = validate_history(tmp_path, addon_xml_path=ADDON_XML_PATH)
+    errors = {t.tag: t.errors for t in report.tags}
+
+    assert errors["v0.1.0"] == []
+    assert errors["v0.2.0"] == [f"{ADDON_XML_PATH} version 0.1.0 != 0.2.0"]
+    assert "CHANGELOG.md has no 0.3.0 section" in errors["v0.3.0"]
+
+
+def test_identical_blobs_parsed_once(tmp_path):
+    build_history(tmp_path, ["0.1.0"])
+    for extra in ("v0.1.0-rc.1", "v0.1.0+build.1"):
+        subprocess.run(["git", "tag", extra, "v0.1.0"], cwd=tmp_path, check=True)
+
+    report = validate_history(tmp_path, addon_xml_path=ADDON_XML_PATH)
+
+    assert len(report.tags) == 3
+    assert report.blob_refs == 6
+    assert report.blobs_parsed == 2
+
+
+def test_hundreds_of_tags(tmp_path):
+    releases = [f"{i // 100}.{i % 100}.0" for i in range(1, 301)]
+    build_history(tmp_path, releases)
+
+    report = validate_history(tmp_path, addon_xml_path=ADDON_XML_PATH)
+
+    assert report.ok
+    assert len(report.tags) == 300
+    assert report.blobs_parsed == 600
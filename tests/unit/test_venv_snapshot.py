@@ -0,0 +1,91 @@
+"""
+Unit tests for hash-keyed virtualenv snapshots (tools/venv_snapshot.py).
+
+A shell build command stands in for `uv venv` + `uv pip install` and leaves a
+build marker, so a rebuild vs a restore is observable.
+"""
+
+import os
+from pathlib import Path
+import sys
+
+# Add tools directory to path to import venv_snapshot
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from venv_snapshot import DEFAULT_BUILD_CMD, VenvSnapshots
+
+BUILD_CMD = (
+    "mkdir -p {target}/bin {target}/lib && "
+    "echo built >> {target}/../builds.log && "
+    "echo 'home = /usr/bin' > {target}/pyvenv.cfg && "
+    "ln -s /usr/bin/env {target}/bin/python"
+)
+
+
+def make_store(tmp_path: Path) -> VenvSnapshots:
+    project = tmp_path / "project"
+    project.mkdir(exist_ok=True)
+    (project / "uv.lock").write_text("version = 1\n")
+    (project / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    return VenvSnapshots(tmp_path / "cache", project, sys.executable)
+
+
+def build_count(tmp_path: Path) -> int:
+    return (tmp_path / "builds.log").read_text().count("built")
+
+
+def test_builds_once_then_restores(tmp_path):
+    store = make_store(tmp_path)
+    target = tmp_path / "venv"
+
+    assert store.ensure(target, BUILD_CMD) == "built"
+    (target / "scratch").write_text("left over from a phase")
+    assert store.ensure(target, BUILD_CMD) == "restored (hardlink)"
+
+    assert build_count(tmp_path) == 1
+    assert not (target / "scratch").exists()
+    assert os.readlink(target / "bin" / "python") == "/usr/bin/env"
+    snapshot_cfg = store.snapshot_dir(target, BUILD_CMD) / "venv" / "pyvenv.cfg"
+    assert os.stat(target / "pyvenv.cfg").st_ino == os.stat(snapshot_cfg).st_ino
+
+
+def test_copy_mode_does_not_share_inodes(tmp_path):
+    store = make_store(tmp_path)
+    target = tmp_path / "venv"
+    store.ensure(target, BUILD_CMD)
+
+    assert store.ensure(target, BUILD_CMD, mode="copy") == "restored (copy)"
+    snapshot_cfg = store.snapshot_dir(target, BUILD_CMD) / "venv" / "pyvenv.cfg"
+    assert os.stat(target / "pyvenv.cfg").st_ino != os.stat(snapshot_cfg).st_ino
+
+
+def test_key_tracks_lockfile_pyproject_build_cmd_and_target(tmp_path):
+    store = make_store(tmp_path)
+    target = tmp_path / "venv"
+    key = store.key(target)
+
+    assert store.key(target) == key
+    assert store.key(tmp_path / "other-venv") != key
+    assert store.key(target, BUILD_CMD) != key
+
+    (store.project_dir / "uv.lock").write_text("version = 2\n")
+    lock_key = store.key(target)
+    assert lock_key != key
+
+    (store.project_dir / "pyproject.toml").write_text("[project]\nname = 'y'\n")
+    assert store.key(target) not in (key, lock_key)
+
+
+def test_lockfile_change_forces_rebuild(tmp_path):
+    store = make_store(tmp_path)
+    target = tmp_path / "venv"
+    store.ensure(target, BUILD_CMD)
+
+    (store.project_dir / "uv.lock").write_text("version = 2\n")
+    assert store.ensure(target, BUILD_CMD) == "built"
+    assert build_count(tmp_path) == 2
+
+
+def test_default_build_installs_from_lockfile():
+    assert "uv sync --frozen" in DEFAULT_BUILD_CMD
+    assert "git+" not in DEFAULT_BUILD_CMD
@@ -0,0 +1,116 @@
+"""
+Unit tests for incremental template watch mode (tools/watch_templates.py).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+# Add tools directory to path to import watch_templates
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+
+from watch_templates import InotifyWatcher, WatchSession
+
+CHANGELOG_J2 = """# CHANGELOG
+{% from ".macros.j2" import item %}
+{% for version, release in ctx.history.released.items() %}
+## {{ version.as_tag() }} ({{ release.tagged_date.strftime("%Y-%m-%d") }})
+{% for type_, commits in release["elements"] | dictsort %}
+### {{ type_ | title }}
+{% for commit in commits %}
+{{ item(commit) }}
+{% endfor %}{% endfor %}{% endfor %}
+"""
+
+MACROS_J2 = """{% macro item(commit) %}- {{ commit.descriptions[0] }} ([`{{ commit.short_hash }}`])
+{% endmacro %}"""
+
+ADDON_XML_J2 = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+{% set latest = (ctx.history.released.values() | list)[0] %}
+<addon id="script.module.example" name="Example Module" version="{{ latest.version }}" provider-name="Test">
+    <extension point="xbmc.addon.metadata">
+        <news>v{{ latest.version }}</news>
+    </extension>
+</addon>
+"""
+
+
+@pytest.fixture
+def session(tmp_path):
+    templates = tmp_path / "templates"
+    (templates / "script.module.example").mkdir(parents=True)
+    (templates / "CHANGELOG.md.j2").write_text(CHANGELOG_J2)
+    (templates / ".macros.j2").write_text(MACROS_J2)
+    (templates / "script.module.example" / "addon.xml.j2").write_text(ADDON_XML_J2)
+    return WatchSession(templates, tmp_path / "out", "CHANGELOG.md", "script.module.example", phase=5)
+
+
+def test_full_pass_renders_and_validates(session):
+    report = session.handle(None)
+
+    assert session.ok(), report
+    assert session.templates() == ["CHANGELOG.md.j2", "script.module.example/addon.xml.j2"]
+    assert "  CHANGELOG.md: ok, 4 releases (4 re-parsed)" in report
+    assert "  script.module.example/addon.xml: ok, version 1.0.1" in report
+
+
+def test_only_affected_templates_rerender(session):
+    session.handle(None)
+    addon_template = session.template_dir / "script.module.example" / "addon.xml.j2"
+    addon_template.write_text(ADDON_XML_J2.replace('version="{{ latest.version }}"', 'version="9.9.9"'))
+
+    report = session.handle([addon_template])
+
+    assert [line.split(":")[0].strip() for line in report if not line.startswith("    ")] == [
+        "script.module.example/addon.xml.j2", "script.module.example/addon.xml", "addon.xml version 9.9.9 != newest changelog release 1.0.1",
+    ]
+    assert not session.ok()
+
+    (session.template_dir / ".macros.j2").write_text(MACROS_J2.replace("- {{", "* {{"))
+    report = session.handle([session.template_dir / ".macros.j2"])
+    assert report[0].startswith("  CHANGELOG.md.j2: rendered in")
+    assert len(report) == 3
+
+
+def test_output_edit_reparses_only_changed_release(session):
+    session.handle(None)
+    changelog = session.out_root / "CHANGELOG.md"
+    lines = changelog.read_text().splitlines(keepends=True)
+    first_item = next(i for i, line in enumerate(lines) if line.startswith("- "))
+    lines[first_item] = "- edited by hand\n"
+    changelog.write_text("".join(lines))
+
+    assert session.handle([changelog]) == ["  CHANGELOG.md: ok, 4 releases (1 re-parsed)"]
+    assert session.results[changelog].releases[0].sections
+    # Unchanged bytes (e.g. our own write echoed back by inotify) are not re-validated
+    assert session.handle([changelog]) == []
+
+
+def test_render_errors_are_reported(session):
+    session.handle(None)
+    template = session.template_dir / "CHANGELOG.md.j2"
+    template.write_text(CHANGELOG_J2 + "{% if %}\n")
+
+    report = session.handle([template])
+
+    assert report[0].startswith("  CHANGELOG.md.j2: render failed at line")
+    assert not session.ok()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_reports_writes_and_new_directories(tmp_path):
+    watcher = InotifyWatcher([tmp_path], recursive=[tmp_path])
+    try:
+        (tmp_path / "a.j2").write_text("a")
+        (tmp_path / "a.j2.swp").write_text("swap")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.j2").write_text("b")
+        assert watcher.wait() == {tmp_path / "a.j2", tmp_path / "sub" / "b.j2"}
+
+        (tmp_path / "sub" / "b.j2").write_text("b2")
+        assert watcher.wait() == {tmp_path / "sub" / "b.j2"}
+    finally:
+        watcher.close()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Content-addressed storage for .artifacts/<timestamp>/ run directories.
+
+Most files a ci-simulate run uploads (addon zips, rendered CHANGELOG.md and
+addon.xml, logs) are byte-identical across runs. `ingest` hashes every file
+of a run into .artifacts/.cas/objects/<aa>/<sha256> and replaces the file in
+the run folder with a hardlink to that object, so each distinct artifact is
+stored once. A manifest (<run>/.cas-manifest.json) records path -> sha256/size
+for the run, so `diff` compares two runs without reading any artifact.
+
+Objects are referenced only through hardlinks: an object whose link count
+has dropped to 1 belongs to no run any more, and `gc` removes it after
+applying run retention.
+
+Usage:
+  artifact_store.py ingest RUN_DIR [--root DIR]
+  artifact_store.py diff RUN_A RUN_B [--root DIR]
+  artifact_store.py gc [--keep N] [--keep-days D] [--dry-run] [--root DIR]
+  artifact_store.py stats [--root DIR]
+
+Options:
+  --root DIR      Artifacts root (default: .artifacts)
+  --keep N        Keep the newest N runs (default: keep all)
+  --keep-days D   Keep runs modified within the last D days (default: keep all)
+  --dry-run       Report what gc would delete
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_ROOT = Path(".artifacts")
+CAS_DIR = ".cas"
+MANIFEST_NAME = ".cas-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class IngestStats:
+    """Counts from ingesting one run."""
+    files: int = 0
+    hashed: int = 0
+    new_objects: int = 0
+    deduplicated: int = 0
+    bytes_saved: int = 0
+
+
+@dataclass
+class RunDiff:
+    """Manifest-level difference between two runs."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def sha256_file(path: Path) -> str:
+    """Hash a file in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    CAS rooted at <root>/.cas shared by every run directory under root.
+
+    Args:
+        root: Artifacts root containing one directory per run
+    """
+
+    def __init__(self, root: Path = DEFAULT_ROOT):
+        self.root = root
+        self.objects = root / CAS_DIR / "objects"
+
+    def object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha
+
+    def runs(self) -> List[Path]:
+        """Run directories, oldest first (names are timestamps)."""
+        if not self.root.is_dir():
+            return []
+        return sorted(p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    @staticmethod
+    def load_manifest(run_dir: Path) -> Dict[str, dict]:
+        try:
+            data = json.loads((run_dir / MANIFEST_NAME).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get("files", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+    def ingest(self, run_dir: Path) -> IngestStats:
+        """
+        Move every file of run_dir into the CAS and hardlink it back.
+
+        Files already linked to their object (same inode as recorded in the
+        manifest) are skipped without hashing, so re-ingesting is cheap.
+        """
+        stats = IngestStats()
+        previous = self.load_manifest(run_dir)
+        manifest: Dict[str, dict] = {}
+
+        for dirpath, dirnames, filenames in os.walk(run_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                rel = path.relative_to(run_dir).as_posix()
+                if rel.startswith(MANIFEST_NAME) or path.is_symlink():
+                    continue
+                stats.files += 1
+                st = path.stat()
+                known = previous.get(rel)
+                if known and known["ino"] == st.st_ino and known["size"] == st.st_size:
+                    manifest[rel] = known
+                    continue
+
+                stats.hashed += 1
+                sha = sha256_file(path)
+                obj = self.object_path(sha)
+                if obj.exists():
+                    if not os.path.samefile(obj, path):
+                        self._replace_with_link(obj, path)
+                        stats.deduplicated += 1
+                        stats.bytes_saved += st.st_size
+                else:
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(path, obj)
+                    # Objects are shared by every run that links them; keep them immutable
+                    os.chmod(obj, stat.S_IMODE(st.st_mode) & ~0o222)
+                    stats.new_objects += 1
+                manifest[rel] = {"sha256": sha, "size": st.st_size, "ino": obj.stat().st_ino}
+
+        tmp = run_dir / (MANIFEST_NAME + ".tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "files": manifest}, indent=1, sort_keys=True))
+        os.replace(tmp, run_dir / MANIFEST_NAME)
+        return stats
+
+    @staticmethod
+    def _replace_with_link(obj: Path, path: Path) -> None:
+        tmp = path.with_name(f".{path.name}.cas-{os.getpid()}")
+        os.link(obj, tmp)
+        os.replace(tmp, path)
+
+    def diff(self, run_a: Path, run_b: Path) -> RunDiff:
+        """Compare two runs by manifest (paths and hashes only)."""
+        a, b = self.load_manifest(run_a), self.load_manifest(run_b)
+        result = RunDiff()
+        for rel in sorted(set(a) | set(b)):
+            if rel not in b:
+                result.removed.append(rel)
+            elif rel not in a:
+                result.added.append(rel)
+            elif a[rel]["sha256"] != b[rel]["sha256"]:
+                result.changed.append(rel)
+            else:
+                result.unchanged += 1
+        return result
+
+    def gc(self, keep: Optional[int] = None, keep_days: Optional[float] = None,
+           dry_run: bool = False) -> Dict[str, List[str]]:
+        """
+        Delete runs outside the retention window, then unreferenced objects.
+
+        A run is kept if it is among the newest `keep` runs or was modified
+        within `keep_days`; with neither set, every run is kept and only
+        orphaned objects are collected.
+
+        Returns:
+            {"runs": deleted run names, "objects": deleted object hashes}
+        """
+        runs = self.runs()
+        doomed: List[Path] = []
+        if keep is not None or keep_days is not None:
+            newest = set(runs[-keep:]) if keep else set()
+            cutoff = time.time() - keep_days * 86400 if keep_days is not None else None
+            for run in runs:
+                recent = cutoff is not None and run.stat().st_mtime >= cutoff
+                if run not in newest and not recent:
+                    doomed.append(run)
+
+        # Links the doomed runs still hold; zero once they are actually removed
+        pending_links: Counter = Counter()
+        for run in doomed:
+            if dry_run:
+                pending_links.update(entry["ino"] for entry in self.load_manifest(run).values())
+            else:
+                shutil.rmtree(run)
+
+        orphans = []
+        if self.objects.is_dir():
+            for obj in self.objects.glob("*/*"):
+                st = obj.stat()
+                if st.st_nlink - pending_links[st.st_ino] <= 1:
+                    orphans.append(obj.name)
+                    if not dry_run:
+                        obj.unlink()
+        return {"runs": [r.name for r in doomed], "objects": sorted(orphans)}
+
+    def stats(self) -> Dict[str, int]:
+        """Logical bytes across run manifests vs physical bytes in the CAS."""
+        runs = self.runs()
+        objects = list(self.objects.glob("*/*")) if self.objects.is_dir() else []
+        return {
+            "runs": len(runs),
+            "objects": len(objects),
+            "logical_bytes": sum(entry["size"] for run in runs for entry in self.load_manifest(run).values()),
+            "physical_bytes": sum(obj.stat().st_size for obj in objects),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicated artifact storage for .artifacts runs")
+    parser.add_argument("command", choices=["ingest", "diff", "gc", "stats"])
+    parser.add_argument("runs", nargs="*", type=Path)
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT)
+    parser.add_argument("--keep", type=int)
+    parser.add_argument("--keep-days", type=float)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root)
+    expected_runs = {"ingest": 1, "diff": 2, "gc": 0, "stats": 0}[args.command]
+    if len(args.runs) != expected_runs:
+        print(f"ERROR: {args.command} takes {expected_runs} run director{'y' if expected_runs == 1 else 'ies'}",
+              file=sys.stderr)
+        sys.exit(1)
+    for run in args.runs:
+        if not run.is_dir():
+            print(f"ERROR: {run} is not a directory", file=sys.stderr)
+            sys.exit(1)
+
+    if args.command == "ingest":
+        stats = store.ingest(args.runs[0])
+        print(f"files={stats.files} hashed={stats.hashed} new={stats.new_objects} "
+              f"deduplicated={stats.deduplicated} saved={stats.bytes_saved}")
+    elif args.command == "diff":
+        result = store.diff(*args.runs)
+        for label, paths in (("+", result.added), ("-", result.removed), ("M", result.changed)):
+            for rel in paths:
+                print(f"{label} {rel}")
+        print(f"{result.unchanged} unchanged" + ("" if result.identical else ", runs differ"))
+        sys.exit(0 if result.identical else 1)
+    elif args.command == "gc":
+        deleted = store.gc(args.keep, args.keep_days, args.dry_run)
+        verb = "would delete" if args.dry_run else "deleted"
+        print(f"{verb} {len(deleted['runs'])} runs, {len(deleted['objects'])} objects")
+    else:
+        stats = store.stats()
+        print(f"runs={stats['runs']} objects={stats['objects']} "
+              f"logical={stats['logical_bytes']} physical={stats['physical_bytes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Measure the import time Kodi pays for the example addon's resources.lib.
+
+Each sample is a fresh interpreter run with `-X importtime`, started from the
+addon directory:
+
+  cold   no bytecode cache (a new empty PYTHONPYCACHEPREFIX per run), so every
+         module is compiled, as on the first invocation after installing a zip
+  warm   bytecode cached from a priming run, as on later invocations
+
+For both, `import resources.lib` and `import + first call` (resources.lib.greet)
+are reported as the median cumulative microseconds spent importing the
+`resources` package, including submodules loaded later on first use. No
+__pycache__ is written into the addon directory.
+
+Usage:
+  bench_addon_import.py [--addon-dir DIR] [--runs N] [--budget-us US] [--json FILE]
+
+Options:
+  --addon-dir DIR   Addon directory (default: <kodi-addon-directory> from pyproject.toml)
+  --runs N          Samples per measurement (default: 15)
+  --budget-us US    Exit non-zero when the warm `import resources.lib` median exceeds US
+  --json FILE       Also write the results as JSON
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from release_metadata import PyprojectConfig  # noqa: E402
+
+IMPORT_STATEMENT = "import resources.lib"
+FIRST_USE_STATEMENT = "import resources.lib; resources.lib.greet('Kodi')"
+# Result leaves perf_db records, with their units (written as "units" in --json)
+METRIC_UNITS = {"import_us": "us", "first_use_us": "us"}
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def default_addon_dir() -> Path:
+    config = PyprojectConfig.load(REPO_ROOT / "pyproject.toml")
+    return REPO_ROOT / config.get("tool", {}).get("arranger", {}).get("kodi-addon-directory", "script.module.example")
+
+
+def importtime(statement: str, addon_dir: Path, pycache_prefix: Optional[Path]) -> Dict[str, int]:
+    """
+    Run statement in a fresh interpreter and return {module: cumulative µs} for top-level imports.
+
+    Nested imports are already counted in their importer's cumulative time.
+
+    Args:
+        statement: Python code to run (-c)
+        addon_dir: Working directory, so `resources` resolves to the addon's package
+        pycache_prefix: PYTHONPYCACHEPREFIX for this run; None reads the addon's own
+            __pycache__ and writes no bytecode (a read-only install)
+
+    Raises:
+        RuntimeError: If the statement fails
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    flags = ["-X", "importtime"]
+    if pycache_prefix is None:
+        flags.append("-B")
+    else:
+        env["PYTHONPYCACHEPREFIX"] = str(pycache_prefix)
+    result = subprocess.run([sys.executable, *flags, "-c", statement],
+                            cwd=addon_dir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match and match.group(3) == " ":
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def package_cost(timings: Dict[str, int]) -> int:
+    """
+    Cumulative µs spent importing the addon's `resources` package.
+
+    Submodules loaded lazily on attribute access show up as their own
+    top-level imports, so every top-level resources* entry is summed.
+    """
+    return sum(us for name, us in timings.items() if name == "resources" or name.startswith("resources."))
+
+
+def measure(statement: str, addon_dir: Path, runs: int, warm: bool) -> int:
+    """Median cumulative µs over `runs` fresh interpreters."""
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if warm:
+            importtime(statement, addon_dir, Path(tmp))
+        for i in range(runs):
+            prefix = Path(tmp) if warm else Path(tmp) / f"cold-{i}"
+            samples.append(package_cost(importtime(statement, addon_dir, prefix)))
+    return int(statistics.median(samples))
+
+
+def run_benchmark(addon_dir: Path, runs: int) -> Dict[str, Dict[str, int]]:
+    return {
+        mode: {
+            "import_us": measure(IMPORT_STATEMENT, addon_dir, runs, mode == "warm"),
+            "first_use_us": measure(FIRST_USE_STATEMENT, addon_dir, runs, mode == "warm"),
+        }
+        for mode in ("cold", "warm")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resources.lib import time")
+    parser.add_argument("--addon-dir", type=Path)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-us", type=int)
+    parser.add_argument("--json", type=Path)
+    args = parser.parse_args()
+
+    addon_dir: Optional[Path] = args.addon_dir or default_addon_dir()
+    if not (addon_dir / "resources" / "lib" / "__init__.py").is_file():
+        print(f"ERROR: {addon_dir} has no resources/lib/__init__.py", file=sys.stderr)
+        sys.exit(1)
+
+    results = run_benchmark(addon_dir, args.runs)
+    print(f"{'mode':<6} {'import (µs)':>12} {'import+use (µs)':>16}")
+    for mode, row in results.items():
+        print(f"{mode:<6} {row['import_us']:>12} {row['first_use_us']:>16}")
+    if args.json:
+        args.json.write_text(json.dumps({**results, "units": METRIC_UNITS}, indent=2))
+
+    if args.budget_us is not None and results["warm"]["import_us"] > args.budget_us:
+        print(f"ERROR: warm import {results['warm']['import_us']}µs exceeds budget {args.budget_us}µs",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
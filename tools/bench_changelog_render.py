@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering of the arranged templates against long release histories.
+
+Synthesizes PSR-shaped histories (100 -> 10k releases by default) whose commit
+types come from news_types in [tool.psr-prepare.changelog], renders
+CHANGELOG.md.j2 and addon.xml.j2, validates the output with ChangelogParser /
+AddonXmlParser, and reports render time and peak memory per size plus the
+fitted scaling exponent. A template that re-sorts or rescans the history per
+release shows up as an exponent near 2.
+
+Usage:
+  bench_changelog_render.py [--template-dir DIR] [--sizes N,N,...] [--max-exponent K] [--json FILE]
+
+Options:
+  --template-dir DIR   Arranged templates (default: templates/, run psr-prepare first)
+  --sizes N,N,...      Release counts to render (default: 100,200,...,6400,10000)
+  --max-exponent K     Exit non-zero when the changelog exponent exceeds K (default: 1.2)
+  --json FILE          Also write the results as JSON
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from render_helpers import (  # noqa: E402
+    ADDON_XML_TEMPLATE,
+    CHANGELOG_TEMPLATE,
+    TemplateRenderEngine,
+    build_context,
+    synthetic_history_spec,
+)
+from release_metadata import AddonXmlParser, ChangelogParser, PyprojectConfig  # noqa: E402
+from scaling import ScalingBenchmark  # noqa: E402
+
+DEFAULT_SIZES = [100, 200, 400, 800, 1600, 3200, 6400, 10000]
+# Result leaves perf_db records, with their units (written as "units" in --json)
+METRIC_UNITS = {"seconds": "s", "peak_bytes": "bytes", "output_bytes": "bytes"}
+
+
+def measure_render(engine, template_name, ctx, repeat):
+    """Return (best seconds, peak traced bytes, output) for one template and context."""
+    seconds = ScalingBenchmark.time_call(lambda c: engine.render_context(template_name, c), ctx, repeat)
+    tracemalloc.start()
+    try:
+        output = engine.render_context(template_name, ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, output
+
+
+def validate_changelog(output, spec):
+    """Check that every synthesized release came out, newest first."""
+    releases = ChangelogParser.parse_text(output)
+    expected = [release["version"] for release in spec["releases"]]
+    all_present, missing = ChangelogParser.validate_all_versions_present(releases, expected)
+    is_descending, violations = ChangelogParser.validate_descending(releases)
+    errors = []
+    if not all_present:
+        errors.append(f"{len(missing)} releases missing (first: {missing[0]})")
+    if not is_descending:
+        errors.append(f"out of order: {violations[0]}")
+    return errors
+
+
+def validate_addon_xml(output, spec):
+    """Check that addon.xml carries the newest version."""
+    addon_info = AddonXmlParser.parse_text(output)
+    newest = spec["releases"][0]["version"]
+    if not AddonXmlParser.validate_version(addon_info, newest):
+        return [f"addon.xml version {addon_info.version} != {newest}"]
+    return []
+
+
+def run_benchmark(template_dir, sizes, news_types, repeat=3):
+    """
+    Render both templates at each size.
+
+    Returns:
+        Dict with per-size rows and fitted exponents per template
+    """
+    engine = TemplateRenderEngine(template_dir)
+    rows = []
+    for size in sizes:
+        spec = synthetic_history_spec(size, news_types)
+        ctx = build_context(spec)
+        row = {"releases": size}
+        for key, template_name, validate in (
+            ("changelog", CHANGELOG_TEMPLATE, validate_changelog),
+            ("addon_xml", ADDON_XML_TEMPLATE, validate_addon_xml),
+        ):
+            seconds, peak, output = measure_render(engine, template_name, ctx, repeat)
+            row[key] = {
+                "seconds": seconds,
+                "peak_bytes": peak,
+                "output_bytes": len(output.encode("utf-8")),
+                "errors": validate(output, spec),
+            }
+        rows.append(row)
+
+    exponents = {
+        key: ScalingBenchmark.fit_exponent([(row["releases"], row[key]["seconds"]) for row in rows])
+        for key in ("changelog", "addon_xml")
+    } if len(rows) > 1 else {}
+    return {"rows": rows, "exponents": exponents}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark changelog template rendering at scale")
+    parser.add_argument("--template-dir", type=Path, default=REPO_ROOT / "templates")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES))
+    parser.add_argument("--max-exponent", type=float, default=1.2)
+    parser.add_argument("--json", type=Path, dest="json_path")
+    args = parser.parse_args()
+
+    if not (args.template_dir / CHANGELOG_TEMPLATE).exists():
+        print(f"No {CHANGELOG_TEMPLATE} in {args.template_dir} (run psr-prepare first)", file=sys.stderr)
+        sys.exit(1)
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    news_types = PyprojectConfig.load_news_types(REPO_ROOT / "pyproject.toml")
+    started = time.perf_counter()
+    results = run_benchmark(args.template_dir, sizes, news_types)
+
+    print(f"{'releases':>9} {'changelog ms':>13} {'peak KiB':>9} {'addon.xml ms':>13} {'peak KiB':>9}  status")
+    failed = False
+    for row in results["rows"]:
+        errors = row["changelog"]["errors"] + row["addon_xml"]["errors"]
+        failed = failed or bool(errors)
+        print(f"{row['releases']:>9} "
+              f"{row['changelog']['seconds'] * 1000:>13.2f} {row['changelog']['peak_bytes'] / 1024:>9.0f} "
+              f"{row['addon_xml']['seconds'] * 1000:>13.2f} {row['addon_xml']['peak_bytes'] / 1024:>9.0f}  "
+              f"{'; '.join(errors) or 'ok'}")
+
+    for key, exponent in results["exponents"].items():
+        print(f"{key} time ~ releases^{exponent:.2f}")
+    print(f"Total benchmark time: {time.perf_counter() - started:.1f}s")
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps({**results, "units": METRIC_UNITS}, indent=2))
+
+    exponent = results["exponents"].get("changelog", 0.0)
+    if exponent > args.max_exponent:
+        print(f"ERROR: changelog render scales as releases^{exponent:.2f} (limit {args.max_exponent})",
+              file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the example addon's greeting API for large list rendering.
+
+Builds a list of names drawn (seeded) from a pool of distinct names, so names
+repeat like library entries do, and times:
+
+  loop        [greet(n) for n in names], one call per list item
+  batch       greet_many(names, as_list=True)
+  cached      greet_many(names, greeter=cached_greeter(...), as_list=True),
+              with the cache's hit rate
+
+Usage:
+  bench_hello_world.py [--sizes N,N,...] [--distinct K] [--cache-size M] [--repeat R]
+
+Options:
+  --sizes N,N,...   List lengths (default: 10000,1000000)
+  --distinct K      Distinct names in the pool (default: 2000)
+  --cache-size M    cached_greeter maxsize (default: 4096)
+  --repeat R        Best of R timings (default: 3)
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "script.module.example"))
+
+from resources.lib import hello_world  # noqa: E402
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(size: int, distinct: int, cache_size: int, repeat: int):
+    rng = random.Random(size)
+    pool = [f"Artist {i}" for i in range(distinct)]
+    names = [rng.choice(pool) for _ in range(size)]
+    greet, greet_many = hello_world.greet, hello_world.greet_many
+
+    rows = [
+        ("loop", best_of(lambda: [greet(n) for n in names], repeat), None),
+        ("batch", best_of(lambda: greet_many(names, as_list=True), repeat), None),
+    ]
+    greeter = hello_world.cached_greeter(cache_size)
+    cached = best_of(lambda: greet_many(names, greeter=greeter, as_list=True), repeat)
+    info = greeter.cache_info()
+    rows.append(("cached", cached, info.hits / (info.hits + info.misses)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark greet vs greet_many")
+    parser.add_argument("--sizes", default="10000,1000000")
+    parser.add_argument("--distinct", type=int, default=2000)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'names':>9} {'mode':<7} {'ns/name':>8} {'names/s':>12} {'hit rate':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for mode, seconds, hit_rate in bench(size, args.distinct, args.cache_size, args.repeat):
+            hits = f"{hit_rate:.1%}" if hit_rate is not None else "-"
+            print(f"{size:>9} {mode:<7} {seconds / size * 1e9:>8.1f} {size / seconds:>12,.0f} {hits:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Build the Kodi addon zip, optionally with precompiled bytecode.
+
+Without --python this matches build-kodi-zip's `zip -r <name>-<version>.zip
+<dir>`: sources only. With one or more --python interpreters, the addon is
+compiled by each of them (`-m compileall`) and the zip also carries
+<pkg>/__pycache__/<module>.<cache_tag>.pyc for every target, so a device whose
+addon directory is read-only still imports without compiling.
+
+Kodi extracts addon zips on install, so the usual file mtimes are not
+guaranteed to survive; the .pyc files are hash-based (PEP 552) and stay valid
+regardless of mtimes. `checked-hash` re-hashes the source on import and falls
+back to it if edited; `unchecked-hash` trusts the .pyc outright. .pyc members
+are stored uncompressed: they gain little from deflate and are read back as-is.
+
+`bench` builds both zips, extracts each, and compares cold-start import of
+resources.lib (no bytecode writes, like a read-only profile) in fresh
+interpreters.
+
+Usage:
+  build_addon_zip.py build ADDON_DIR OUT_ZIP [--python EXE ...] [--invalidation MODE]
+  build_addon_zip.py bench [ADDON_DIR] [--runs N]
+
+Options:
+  --python EXE         Interpreter to compile for (repeatable; default: sources only)
+  --invalidation MODE  checked-hash or unchecked-hash (default: checked-hash)
+  --runs N             Samples per zip for bench (default: 15)
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_addon_import import FIRST_USE_STATEMENT, default_addon_dir, importtime, package_cost  # noqa: E402
+
+INVALIDATION_MODES = ("checked-hash", "unchecked-hash")
+
+
+def compile_tree(root: Path, pythons: Sequence[str], invalidation: str = "checked-hash") -> None:
+    """
+    Write __pycache__ bytecode for every .py under root with each interpreter.
+
+    Raises:
+        RuntimeError: If an interpreter fails to compile the tree
+    """
+    for python in pythons:
+        result = subprocess.run([python, "-m", "compileall", "-q", "--invalidation-mode", invalidation, str(root)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{python} could not compile {root}:\n{result.stdout}{result.stderr}")
+
+
+def build_addon_zip(addon_root: Path, out_path: Path, pythons: Optional[Sequence[str]] = None,
+                    invalidation: str = "checked-hash") -> Path:
+    """
+    Zip addon_root under its own directory name, adding bytecode for each interpreter in pythons.
+
+    Args:
+        addon_root: Addon directory (its name becomes the top-level zip folder)
+        out_path: Zip to write
+        pythons: Interpreters to compile for; None or empty ships sources only
+        invalidation: PEP 552 invalidation mode for the .pyc files
+
+    Returns:
+        out_path
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        staged = Path(tmp) / addon_root.name
+        # Never ship whatever bytecode the working tree happens to have
+        shutil.copytree(addon_root, staged, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+        if pythons:
+            compile_tree(staged, pythons, invalidation)
+
+        with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(staged, addon_root.name)
+            for path in sorted(staged.rglob("*")):
+                compress = zipfile.ZIP_STORED if path.suffix == ".pyc" else zipfile.ZIP_DEFLATED
+                zf.write(path, path.relative_to(staged.parent).as_posix(), compress_type=compress)
+    return out_path
+
+
+def cold_start_us(zip_path: Path, runs: int) -> int:
+    """Median import+first-use µs of resources.lib from the extracted zip, never writing bytecode."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extractall(tmp)
+            addon_dir = Path(tmp) / zf.namelist()[0].split("/")[0]
+        samples = [package_cost(importtime(FIRST_USE_STATEMENT, addon_dir, None)) for _ in range(runs)]
+    return int(statistics.median(samples))
+
+
+def bench(addon_root: Path, runs: int) -> Dict[str, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        source_zip = build_addon_zip(addon_root, Path(tmp) / "source.zip")
+        bytecode_zip = build_addon_zip(addon_root, Path(tmp) / "bytecode.zip", [sys.executable])
+        return {
+            "source_us": cold_start_us(source_zip, runs),
+            "bytecode_us": cold_start_us(bytecode_zip, runs),
+            "source_bytes": source_zip.stat().st_size,
+            "bytecode_bytes": bytecode_zip.stat().st_size,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Kodi addon zip, optionally with bytecode")
+    parser.add_argument("command", choices=["build", "bench"])
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--python", action="append", default=[])
+    parser.add_argument("--invalidation", choices=INVALIDATION_MODES, default="checked-hash")
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if len(args.paths) != 2:
+            print("ERROR: build takes ADDON_DIR OUT_ZIP", file=sys.stderr)
+            sys.exit(1)
+        addon_root, out_path = args.paths
+    else:
+        addon_root = args.paths[0] if args.paths else default_addon_dir()
+    if not addon_root.is_dir():
+        print(f"ERROR: {addon_root} is not a directory", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "build":
+        try:
+            build_addon_zip(addon_root, out_path, args.python, args.invalidation)
+        except RuntimeError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        targets: List[str] = args.python or ["sources only"]
+        print(f"{out_path} ({', '.join(targets)})")
+    else:
+        results = bench(addon_root, args.runs)
+        print(f"{'zip':<10} {'cold import+use (µs)':>21} {'size (bytes)':>13}")
+        print(f"{'source':<10} {results['source_us']:>21} {results['source_bytes']:>13}")
+        print(f"{'bytecode':<10} {results['bytecode_us']:>21} {results['bytecode_bytes']:>13}")
+
+
+if __name__ == "__main__":
+    main()
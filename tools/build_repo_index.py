@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Build the Kodi repository index (addons.xml + addons.xml.md5) incrementally.
+
+Scans a repository directory for addon zips (as produced by the
+build-kodi-zip action, e.g. <repo>/script.module.example/script.module.example-1.0.1.zip),
+merges each addon's <addon> element into addons.xml and writes its md5.
+
+Only zips whose size/mtime changed are re-hashed, and only zips whose sha256
+changed are re-parsed with AddonXmlParser. Parsed <addon> elements are kept as
+fragment files next to an on-disk manifest, and addons.xml is streamed from
+those fragments, so a single-addon release into a large repository costs one
+parse plus a sequential copy.
+
+When several zips carry the same addon id, the highest version wins.
+
+With --validate, each newly parsed addon.xml also goes through
+AddonXmlValidator; a structurally invalid addon aborts the build.
+
+Usage:
+  build_repo_index.py [--force] [--validate] <repository_dir>
+
+Options:
+  --force       Ignore the manifest and re-parse every zip
+  --validate    Reject zips whose addon.xml fails structural validation
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import AddonXmlParser, AddonXmlValidator, Version  # noqa: E402
+
+INDEX_DIR = ".addons-index"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>\s*')
+INDEX_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<addons>\n'
+INDEX_FOOTER = '</addons>\n'
+
+
+@dataclass
+class IndexStats:
+    """Counts from one index build."""
+    total: int = 0
+    parsed: int = 0
+    rehashed: int = 0
+    removed: int = 0
+    written: bool = False
+
+
+def sha256_file(path: Path) -> str:
+    """Hash a file in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_addon_xml(zip_path: Path) -> str:
+    """Return the addon.xml text from the top-level addon directory of a zip."""
+    with zipfile.ZipFile(zip_path) as zf:
+        candidates = [n for n in zf.namelist() if n.count('/') == 1 and n.endswith('/addon.xml')]
+        if not candidates:
+            raise ValueError(f"No <addon_id>/addon.xml found in {zip_path}")
+        return zf.read(candidates[0]).decode('utf-8')
+
+
+def addon_fragment(raw_xml: str) -> str:
+    """Strip the XML declaration so the <addon> element can be embedded in addons.xml."""
+    return XML_DECLARATION.sub('', raw_xml, count=1).rstrip() + '\n'
+
+
+def version_key(version: str) -> Tuple[int, object]:
+    """Sort key that prefers semver precedence and falls back to the raw string."""
+    parsed = Version.try_parse(version)
+    return (1, parsed.sort_key) if parsed is not None else (0, version)
+
+
+def iter_zips(repo_dir: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield (posix relative path, DirEntry) for every zip under repo_dir, skipping the index dir."""
+    stack = [('', str(repo_dir))]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                rel = f"{rel_dir}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != INDEX_DIR:
+                        stack.append((rel + '/', entry.path))
+                elif entry.name.endswith('.zip'):
+                    yield rel, entry
+
+
+def load_manifest(index_dir: Path) -> Dict[str, dict]:
+    """Load manifest entries, returning an empty manifest if missing or outdated."""
+    manifest_path = index_dir / MANIFEST_NAME
+    try:
+        data = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('entries', {})
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temporary file and rename."""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def stream_index(repo_dir: Path, fragments_dir: Path, entries: Dict[str, dict]) -> str:
+    """
+    Stream addons.xml from fragment files and return its md5.
+
+    The latest version of each addon id is written, ordered by id, so the
+    output is deterministic regardless of scan order.
+    """
+    latest: Dict[str, dict] = {}
+    for entry in entries.values():
+        current = latest.get(entry['id'])
+        if current is None or version_key(entry['version']) > version_key(current['version']):
+            latest[entry['id']] = entry
+
+    index_path = repo_dir / 'addons.xml'
+    tmp_path = index_path.with_name('addons.xml.tmp')
+    md5 = hashlib.md5()
+    with open(tmp_path, 'wb') as out:
+        def emit(data: bytes) -> None:
+            out.write(data)
+            md5.update(data)
+
+        emit(INDEX_HEADER.encode('utf-8'))
+        fragments_root = str(fragments_dir)
+        for addon_id in sorted(latest):
+            with open(os.path.join(fragments_root, latest[addon_id]['sha256'] + '.xml'), 'rb') as f:
+                emit(f.read())
+        emit(INDEX_FOOTER.encode('utf-8'))
+    os.replace(tmp_path, index_path)
+
+    checksum = md5.hexdigest()
+    write_atomic(repo_dir / 'addons.xml.md5', checksum)
+    return checksum
+
+
+def build_index(repo_dir: Path, force: bool = False, validate: bool = False) -> IndexStats:
+    """
+    Update addons.xml and addons.xml.md5 under repo_dir.
+
+    Args:
+        repo_dir: Kodi repository directory containing addon zips
+        force: Re-parse every zip instead of trusting the manifest
+        validate: Run AddonXmlValidator on every addon.xml that gets parsed
+
+    Returns:
+        IndexStats describing how much work was done
+    """
+    index_dir = repo_dir / INDEX_DIR
+    fragments_dir = index_dir / 'fragments'
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+
+    old_entries = {} if force else load_manifest(index_dir)
+    entries: Dict[str, dict] = {}
+    stats = IndexStats()
+
+    for rel, dir_entry in iter_zips(repo_dir):
+        st = dir_entry.stat()
+        previous: Optional[dict] = old_entries.get(rel)
+
+        if previous and previous['size'] == st.st_size and previous['mtime_ns'] == st.st_mtime_ns:
+            entries[rel] = previous
+            continue
+
+        zip_path = Path(dir_entry.path)
+        stats.rehashed += 1
+        sha256 = sha256_file(zip_path)
+        fragment_path = fragments_dir / f"{sha256}.xml"
+        if previous and previous['sha256'] == sha256 and fragment_path.exists():
+            entries[rel] = dict(previous, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            continue
+
+        raw_xml = read_addon_xml(zip_path)
+        if validate:
+            is_valid, errors = AddonXmlValidator.validate(raw_xml)
+            if not is_valid:
+                raise ValueError(f"addon.xml in {zip_path} is invalid: {'; '.join(errors)}")
+        info = AddonXmlParser.parse_text(raw_xml)
+        if not info.id or not info.version:
+            raise ValueError(f"addon.xml in {zip_path} is missing id or version")
+        fragment_path.write_text(addon_fragment(raw_xml))
+        stats.parsed += 1
+        entries[rel] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'sha256': sha256,
+            'id': info.id,
+            'version': info.version,
+        }
+
+    stats.total = len(entries)
+    stats.removed = len(set(old_entries) - set(entries))
+
+    unchanged = entries == old_entries
+    outputs_exist = (repo_dir / 'addons.xml').exists() and (repo_dir / 'addons.xml.md5').exists()
+    if not (unchanged and outputs_exist):
+        stream_index(repo_dir, fragments_dir, entries)
+        # No indent: keeps json on its C encoder fast path for large manifests
+        write_atomic(index_dir / MANIFEST_NAME, json.dumps(
+            {'version': MANIFEST_VERSION, 'entries': entries}, separators=(',', ':')
+        ))
+        stats.written = True
+
+    # Drop fragments no longer referenced by any zip
+    live = {entry['sha256'] for entry in entries.values()}
+    if stats.removed or stats.parsed:
+        for fragment in fragments_dir.glob('*.xml'):
+            if fragment.stem not in live:
+                fragment.unlink()
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Kodi repository addons.xml incrementally")
+    parser.add_argument('repository_dir', type=Path, help="Directory containing addon zips")
+    parser.add_argument('--force', action='store_true', help="Re-parse every zip")
+    parser.add_argument('--validate', action='store_true', help="Reject structurally invalid addon.xml")
+    args = parser.parse_args()
+
+    if not args.repository_dir.is_dir():
+        print(f"Repository directory {args.repository_dir} does not exist", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        stats = build_index(args.repository_dir, force=args.force, validate=args.validate)
+    except Exception as e:
+        print(f"Error building index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"addons={stats.total} parsed={stats.parsed} rehashed={stats.rehashed} "
+          f"removed={stats.removed} written={str(stats.written).lower()}")
+
+
+if __name__ == '__main__':
+    main()
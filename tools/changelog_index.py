@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Maintain the CHANGELOG.md sidecar index and print one release's notes.
+
+The index (CHANGELOG.md.idx) maps each version to the byte offset and length
+of its section, so publishing a release body or a Kodi <news> block reads
+only that section instead of parsing the whole changelog. A stale or missing
+index falls back to a full parse.
+
+Usage:
+  changelog_index.py build  [--changelog PATH]
+  changelog_index.py update [--changelog PATH]
+  changelog_index.py notes VERSION [--changelog PATH]
+
+Commands:
+  build     Index every release header
+  update    Re-index after new releases were prepended (scans only the new head)
+  notes     Print the section body for VERSION (e.g. v1.0.1)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import ChangelogIndex, ChangelogParser  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CHANGELOG.md byte-offset index")
+    parser.add_argument("command", choices=["build", "update", "notes"])
+    parser.add_argument("version", nargs="?")
+    parser.add_argument("--changelog", type=Path, default=Path("CHANGELOG.md"))
+    args = parser.parse_args()
+
+    if not args.changelog.exists():
+        print(f"ERROR: {args.changelog} not found", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command in ("build", "update"):
+        index = ChangelogIndex.build(args.changelog) if args.command == "build" else ChangelogIndex.update(args.changelog)
+        print(f"Indexed {len(index['entries'])} releases in {ChangelogIndex.index_path(args.changelog)}")
+        return
+
+    if not args.version:
+        print("ERROR: notes requires a VERSION", file=sys.stderr)
+        sys.exit(1)
+    release = ChangelogParser.get_release_notes(args.changelog, args.version)
+    if release is None:
+        print(f"ERROR: {args.version} not found in {args.changelog}", file=sys.stderr)
+        sys.exit(1)
+    print(release.raw_content)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,121 @@
 Check for Kodi project in pyproject.toml and output environment variables.
 Usage: python check_kodi.py <path_to_pyproject.toml>
 Outputs: is_kodi, kodi_project_name, kodi_directory
+
+Discovery mode classifies every project under a tree in one pass:
+Usage: python check_kodi.py --discover ROOT [--format json|matrix] [--cache FILE] [--workers N]
+  json     one document: {"projects": [...], "kodi_directories": [...]}
+  matrix   GITHUB_OUTPUT lines: matrix=, kodi_matrix= ({"include": [...]}) and project_count=
+pyproject.toml files are parsed in a thread pool; with --cache, results are
+reused for files whose sha256 is unchanged since the previous run.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import sys
 import tomllib
-import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python check_kodi.py <path_to_pyproject.toml>", file=sys.stderr)
-        sys.exit(1)
+# Directories never searched for projects
+SKIP_DIRS = {'.git', '.hg', '.tox', '.nox', '.venv', 'venv', 'node_modules', '__pycache__', 'build', 'dist'}
+CACHE_VERSION = 1
+
+
+def find_pyprojects(root):
+    """Yield every pyproject.toml under root, skipping VCS, virtualenv and build directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.endswith('.egg-info'))
+        if 'pyproject.toml' in filenames:
+            yield Path(dirpath) / 'pyproject.toml'
 
-    pyproject_path = sys.argv[1]
+
+def classify(config):
+    """Kodi classification and template settings from a parsed pyproject.toml."""
+    tool = config.get('tool', {})
+    arranger = tool.get('arranger', {})
+    kodi_name = arranger.get('kodi-addon-directory')
+    return {
+        'name': config.get('project', {}).get('name'),
+        'is_kodi': bool(kodi_name),
+        'kodi_addon_directory': kodi_name,
+        'arranger': arranger,
+        'psr_prepare': tool.get('psr-prepare', {}),
+    }
+
+
+def load_project(path, root, cached):
+    """
+    Classify one pyproject.toml, reusing cached when its content hash matches.
+
+    Returns:
+        (result dict, whether it was parsed)
+    """
+    relative = path.relative_to(root).as_posix()
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        return {'path': relative, 'error': str(e)}, False
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached.get('sha256') == digest:
+        return cached, False
+
+    result = {'path': relative, 'dir': Path(relative).parent.as_posix(), 'sha256': digest}
+    try:
+        result.update(classify(tomllib.loads(raw.decode('utf-8'))))
+    except (tomllib.TOMLDecodeError, UnicodeDecodeError) as e:
+        result['error'] = str(e)
+    return result, True
+
+
+def discover(root, workers=8, cache_path=None):
+    """
+    Classify every project under root.
+
+    Returns:
+        (projects sorted by path, number of files actually parsed)
+    """
+    root = Path(root)
+    cache = {}
+    if cache_path and Path(cache_path).exists():
+        try:
+            data = json.loads(Path(cache_path).read_text())
+            if data.get('version') == CACHE_VERSION and data.get('root') == str(root.resolve()):
+                cache = data.get('projects', {})
+        except json.JSONDecodeError:
+            pass
+
+    paths = list(find_pyprojects(root))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = list(pool.map(
+            lambda p: load_project(p, root, cache.get(p.relative_to(root).as_posix())), paths))
+
+    projects = [result for result, _ in loaded]
+    if cache_path:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(cache_path).write_text(json.dumps({
+            'version': CACHE_VERSION,
+            'root': str(root.resolve()),
+            'projects': {p['path']: p for p in projects if 'sha256' in p},
+        }, sort_keys=True))
+    return projects, sum(parsed for _, parsed in loaded)
+
+
+def matrix_lines(projects):
+    """GITHUB_OUTPUT lines with strategy matrices for all projects and for Kodi projects."""
+    include = [{'project': p['dir'], 'is_kodi': p['is_kodi'], 'kodi_directory': p['kodi_addon_directory'] or ''}
+               for p in projects if 'error' not in p]
+    kodi = [entry for entry in include if entry['is_kodi']]
+    return [
+        f"matrix={json.dumps({'include': include}, separators=(',', ':'))}",
+        f"kodi_matrix={json.dumps({'include': kodi}, separators=(',', ':'))}",
+        f"project_count={len(include)}",
+    ]
+
+
+def check_single(pyproject_path):
     try:
         with open(pyproject_path, 'rb') as f:
             config = tomllib.load(f)
@@ -22,8 +125,7 @@ def main():
         print(f"Error reading {pyproject_path}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    arranger = config.get('tool', {}).get('arranger', {})
-    kodi_name = arranger.get('kodi-addon-directory')
+    kodi_name = classify(config)['kodi_addon_directory']
 
     if kodi_name:
         print(f"is_kodi=true")
@@ -32,5 +134,41 @@ def main():
     else:
         print("is_kodi=false")
 
+
+def main():
+    parser = argparse.ArgumentParser(usage="python check_kodi.py <path_to_pyproject.toml> | --discover ROOT [options]")
+    parser.add_argument('pyproject', nargs='?')
+    parser.add_argument('--discover', metavar='ROOT')
+    parser.add_argument('--format', choices=['json', 'matrix'], default='json')
+    parser.add_argument('--cache', metavar='FILE')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    if bool(args.pyproject) == bool(args.discover):
+        print("Usage: python check_kodi.py <path_to_pyproject.toml>", file=sys.stderr)
+        sys.exit(1)
+    if args.pyproject:
+        check_single(args.pyproject)
+        return
+
+    if not Path(args.discover).is_dir():
+        print(f"Error: {args.discover} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    projects, parsed = discover(args.discover, args.workers, args.cache)
+    errors = [p for p in projects if 'error' in p]
+    for project in errors:
+        print(f"Error reading {project['path']}: {project['error']}", file=sys.stderr)
+
+    if args.format == 'matrix':
+        print('\n'.join(matrix_lines(projects)))
+    else:
+        print(json.dumps({
+            'projects': projects,
+            'kodi_directories': [p['dir'] for p in projects if p.get('is_kodi')],
+            'parsed': parsed,
+        }, indent=2))
+    sys.exit(1 if errors else 0)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
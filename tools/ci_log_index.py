@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Index ci-simulate consolidated logs into SQLite and query them.
+
+`ingest` streams each .artifacts/<timestamp>/ci-simulate-consolidated-gitea.log
+once, splitting it on act's step markers into (job, phase, step) records:
+
+  [<workflow>/<job>] ⭐ Run Main <step name>      step starts
+  [<workflow>/<job>]   | <output line>           step output
+  [<workflow>/<job>]   ✅  Success - Main <step> [3.1s]  step ends (❌ Failure)
+
+Step output is stored zlib-compressed next to the step. The run-psr-phase
+debug step ("Debug - Verify tag visibility ...") is also parsed into a
+per-phase row with the latest tag PSR started from and the phase-config
+version, and the PSR step's output gives the version PSR released. Logs whose
+size and mtime are unchanged since the last ingest are skipped, so queries
+never rescan raw logs.
+
+Usage:
+  ci_log_index.py ingest [RUN_DIR ...] [--db FILE]
+  ci_log_index.py step --phase N [--step TEXT] [--last N] [--db FILE]
+  ci_log_index.py tag-mismatch [--db FILE]
+  ci_log_index.py runs [--db FILE]
+
+Options:
+  --db FILE     SQLite index (default: .artifacts/ci-logs.sqlite)
+  --phase N     Phase number
+  --step TEXT   Substring of the step name (default: "Run PSR")
+  --last N      Only the newest N runs (default: 200)
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ARTIFACTS_DIR = Path(".artifacts")
+LOG_NAME = "ci-simulate-consolidated-gitea.log"
+DEFAULT_DB = ARTIFACTS_DIR / "ci-logs.sqlite"
+
+LINE_RE = re.compile(r"^\[(?P<workflow>[^\]/]+)/(?P<job>[^\]]+)\] (?P<rest>.*)$")
+STEP_START_RE = re.compile(r"^⭐\s+Run (?:Main )?(?P<step>.+?)\s*$")
+STEP_END_RE = re.compile(
+    r"^\s*(?P<mark>✅|❌)\s+(?P<status>Success|Failure) - (?:Main )?(?P<step>.+?)(?:\s+\[(?P<duration>[^\]]*)\])?\s*$")
+# Go time.Duration strings as act prints them: 120ms, 3.1s, 1m2.5s, 1h0m3s
+DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(h|ms|µs|us|ns|m|s)")
+DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 1e-3, "µs": 1e-6, "us": 1e-6, "ns": 1e-9}
+OUTPUT_RE = re.compile(r"^\s*\| ?(?P<text>.*)$")
+JOB_PHASE_RE = re.compile(r"phase-(\d+)")
+STEP_PHASE_RE = re.compile(r"\bPhase (\d+)\b")
+VERSION_LINE_RE = re.compile(r"^v?\d+\.\d+\.\d+(?:[-+][0-9A-Za-z.-]+)?$")
+
+DEBUG_STEP_PREFIX = "Debug - Verify tag visibility"
+PSR_STEP_PREFIX = "Run PSR"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    log_size INTEGER NOT NULL,
+    log_mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    job TEXT NOT NULL,
+    phase INTEGER,
+    step TEXT NOT NULL,
+    status TEXT,
+    lines INTEGER NOT NULL,
+    output BLOB NOT NULL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS steps_phase_step ON steps (phase, step);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    phase INTEGER NOT NULL,
+    latest_tag TEXT,
+    expected_version TEXT,
+    released_version TEXT,
+    PRIMARY KEY (run_id, phase)
+);
+"""
+
+
+@dataclass
+class StepRecord:
+    """One act step and its output."""
+    job: str
+    step: str
+    phase: Optional[int]
+    status: Optional[str] = None
+    output: List[str] = field(default_factory=list)
+    duration_s: Optional[float] = None
+
+
+def phase_of(job: str, step: str) -> Optional[int]:
+    """Phase from the job id (phase-N), else from the step name ("... Phase N ...")."""
+    match = JOB_PHASE_RE.search(job) or STEP_PHASE_RE.search(step)
+    return int(match.group(1)) if match else None
+
+
+def parse_duration(text: Optional[str]) -> Optional[float]:
+    """Seconds in a Go duration string ("1m2.5s"), or None if it is not one."""
+    if not text or DURATION_PART_RE.sub("", text.strip()):
+        return None
+    return sum(float(value) * DURATION_UNITS[unit] for value, unit in DURATION_PART_RE.findall(text))
+
+
+def split_steps(lines: Iterable[str]) -> Iterator[StepRecord]:
+    """
+    Stream act log lines into StepRecords, in the order steps finish.
+
+    Jobs may interleave, so open steps are tracked per job as a stack:
+    composite actions (run-psr-phase) start their inner steps before the
+    outer one ends. Output belongs to the innermost open step. Steps that
+    never report a status are emitted when the log ends.
+    """
+    open_steps: Dict[str, List[StepRecord]] = {}
+    for line in lines:
+        match = LINE_RE.match(line.rstrip("\n"))
+        if not match:
+            continue
+        job, rest = match.group("job"), match.group("rest")
+        stack = open_steps.setdefault(job, [])
+
+        start = STEP_START_RE.match(rest)
+        if start:
+            step = start.group("step")
+            stack.append(StepRecord(job, step, phase_of(job, step)))
+            continue
+        if not stack:
+            continue
+
+        end = STEP_END_RE.match(rest)
+        if end:
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth].step == end.group("step"):
+                    record = stack.pop(depth)
+                    record.status = end.group("status").lower()
+                    record.duration_s = parse_duration(end.group("duration"))
+                    yield record
+                    break
+            continue
+        output = OUTPUT_RE.match(rest)
+        if output:
+            stack[-1].output.append(output.group("text"))
+    for stack in open_steps.values():
+        yield from stack
+
+
+def parse_debug_sections(output: List[str]) -> Dict[str, Optional[str]]:
+    """Pull the latest tag and phase-config version out of the tag-visibility debug step."""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in output:
+        heading = re.match(r"^=== (.+?) ===$", line.strip())
+        if heading:
+            current = heading.group(1)
+            sections[current] = []
+        elif current is not None and line.strip():
+            sections[current].append(line)
+
+    latest = sections.get("Latest tag", [])
+    latest_tag = latest[0].strip() if latest and latest[0].strip() != "No tags found" else None
+
+    expected = None
+    for line in sections.get("Steps output version", []):
+        if ":" in line:
+            expected = line.rsplit(":", 1)[1].strip() or None
+    if expected is None:
+        try:
+            config = json.loads("\n".join(sections.get("Phase config (from phase-config.json)", [])))
+            expected = config.get("version")
+        except (json.JSONDecodeError, AttributeError):
+            pass
+    return {"latest_tag": latest_tag, "expected_version": expected}
+
+
+def released_version(output: List[str]) -> Optional[str]:
+    """The version PSR printed on stdout (the last bare version line of its step)."""
+    for line in reversed(output):
+        if VERSION_LINE_RE.match(line.strip()):
+            return line.strip()
+    return None
+
+
+class CiLogIndex:
+    """
+    SQLite index of ci-simulate runs, steps and per-phase release facts.
+
+    Args:
+        db_path: SQLite database file (created if missing)
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def ingest(self, run_dir: Path) -> bool:
+        """
+        Index run_dir's consolidated log; returns False if it was already current.
+        """
+        log_path = run_dir / LOG_NAME
+        st = log_path.stat()
+        row = self.conn.execute("SELECT id, log_size, log_mtime_ns FROM runs WHERE name = ?",
+                                (run_dir.name,)).fetchone()
+        if row and (row[1], row[2]) == (st.st_size, st.st_mtime_ns):
+            return False
+
+        with self.conn:
+            if row:
+                self.conn.execute("DELETE FROM runs WHERE id = ?", (row[0],))
+            run_id = self.conn.execute("INSERT INTO runs (name, log_size, log_mtime_ns) VALUES (?, ?, ?)",
+                                       (run_dir.name, st.st_size, st.st_mtime_ns)).lastrowid
+            phases: Dict[int, Dict[str, Optional[str]]] = {}
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                for seq, record in enumerate(split_steps(f)):
+                    self.conn.execute(
+                        "INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (run_id, seq, record.job, record.phase, record.step, record.status,
+                         len(record.output), zlib.compress("\n".join(record.output).encode("utf-8"))))
+                    if record.phase is None:
+                        continue
+                    facts = phases.setdefault(record.phase, {})
+                    if record.step.startswith(DEBUG_STEP_PREFIX):
+                        facts.update(parse_debug_sections(record.output))
+                    elif record.step.startswith(PSR_STEP_PREFIX):
+                        version = released_version(record.output)
+                        if version:
+                            facts["released_version"] = version
+            self.conn.executemany(
+                "INSERT INTO phases VALUES (?, ?, ?, ?, ?)",
+                [(run_id, phase, facts.get("latest_tag"), facts.get("expected_version"),
+                  facts.get("released_version")) for phase, facts in sorted(phases.items())])
+        return True
+
+    def step_output(self, phase: int, step: str = PSR_STEP_PREFIX, last: int = 200) -> List[dict]:
+        """Output of steps named like `step` in `phase`, for the newest `last` runs (newest first)."""
+        rows = self.conn.execute(
+            """
+            SELECT runs.name, steps.step, steps.status, steps.output
+            FROM steps JOIN runs ON runs.id = steps.run_id
+            WHERE steps.phase = ? AND instr(steps.step, ?) > 0
+              AND runs.id IN (SELECT id FROM runs ORDER BY name DESC LIMIT ?)
+            ORDER BY runs.name DESC, steps.seq
+            """, (phase, step, last))
+        return [{"run": run, "step": name, "status": status, "output": zlib.decompress(blob).decode("utf-8")}
+                for run, name, status, blob in rows]
+
+    def tag_mismatches(self) -> List[dict]:
+        """
+        Phases whose released version differs from phase-config's version.
+
+        Versions are compared without the tag_format "v" prefix; phases where
+        either side is unknown are not reported.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT runs.name, phases.phase, phases.latest_tag, phases.expected_version, phases.released_version
+            FROM phases JOIN runs ON runs.id = phases.run_id
+            WHERE phases.expected_version IS NOT NULL AND phases.released_version IS NOT NULL
+              AND ltrim(phases.expected_version, 'v') != ltrim(phases.released_version, 'v')
+            ORDER BY runs.name DESC, phases.phase
+            """)
+        return [{"run": run, "phase": phase, "latest_tag": latest, "expected": expected, "released": released}
+                for run, phase, latest, expected, released in rows]
+
+    def runs(self) -> List[dict]:
+        rows = self.conn.execute(
+            """
+            SELECT runs.name, count(steps.seq), sum(steps.status = 'failure')
+            FROM runs LEFT JOIN steps ON steps.run_id = runs.id
+            GROUP BY runs.id ORDER BY runs.name DESC
+            """)
+        return [{"run": name, "steps": steps, "failed": failed or 0} for name, steps, failed in rows]
+
+
+def find_run_dirs(root: Path = ARTIFACTS_DIR) -> List[Path]:
+    """Run directories under root that have a consolidated log."""
+    return sorted(p.parent for p in root.glob(f"*/{LOG_NAME}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query ci-simulate consolidated logs")
+    parser.add_argument("command", choices=["ingest", "step", "tag-mismatch", "runs"])
+    parser.add_argument("run_dirs", nargs="*", type=Path)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--phase", type=int)
+    parser.add_argument("--step", default=PSR_STEP_PREFIX)
+    parser.add_argument("--last", type=int, default=200)
+    args = parser.parse_args()
+
+    index = CiLogIndex(args.db)
+    try:
+        if args.command == "ingest":
+            run_dirs = args.run_dirs or find_run_dirs()
+            missing = [str(d) for d in run_dirs if not (d / LOG_NAME).is_file()]
+            if missing:
+                print(f"ERROR: no {LOG_NAME} in: {', '.join(missing)}", file=sys.stderr)
+                sys.exit(1)
+            indexed = sum(index.ingest(d) for d in run_dirs)
+            print(f"{indexed} runs indexed, {len(run_dirs) - indexed} already current")
+        elif args.command == "step":
+            if args.phase is None:
+                print("ERROR: step requires --phase", file=sys.stderr)
+                sys.exit(1)
+            for entry in index.step_output(args.phase, args.step, args.last):
+                print(f"=== {entry['run']} :: {entry['step']} ({entry['status'] or 'unfinished'}) ===")
+                print(entry["output"])
+        elif args.command == "tag-mismatch":
+            mismatches = index.tag_mismatches()
+            for m in mismatches:
+                print(f"{m['run']} phase {m['phase']}: expected {m['expected']}, released {m['released']} "
+                      f"(started from {m['latest_tag'] or 'no tag'})")
+            sys.exit(1 if mismatches else 0)
+        else:
+            for entry in index.runs():
+                print(f"{entry['run']}: {entry['steps']} steps, {entry['failed']} failed")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
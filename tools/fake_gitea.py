@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+Lightweight in-process stand-in for the Gitea/GitHub endpoints the harness uses.
+
+Serves git smart HTTP (clone/fetch/push via `git http-backend`) from local bare
+repositories, plus the REST endpoints the workflow and cleanup actions call:
+refs/tags listing and deletion, releases (create/list/get/latest/by-tag/
+update/delete) and release asset upload/download. Releases are kept in an
+on-disk JSON store next to the bare repositories.
+
+The same routes are served under /api/v1 (Gitea), /api/v3 (GitHub Enterprise
+style, for `gh` with GH_HOST) and at the root (api.github.com style). It starts
+in well under a second and needs no Docker, so it can back pytest fixtures.
+
+Usage:
+  fake_gitea.py [--port 3000] [--root /tmp/fake-gitea] [--user USER] [--populate REPO_PATH]
+
+Prints GITEA_USER=, GITEA_PASS= and GITEA_TOKEN= lines like
+docker-gitea-start.sh, then serves until interrupted.
+"""
+
+import argparse
+import base64
+import email.parser
+import email.policy
+import json
+import os
+import re
+import secrets
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+DEFAULT_USER = "brianpatrickreavey"
+DEFAULT_PASS = "gitea-secure-pass-123"
+REPO_NAME = "psr-templates-fixture"
+
+API_PREFIXES = ("/api/v1", "/api/v3", "")
+GIT_SERVICE_PATH = re.compile(r'^/([^/]+)/([^/]+?)(?:\.git)?/(info/refs|git-upload-pack|git-receive-pack|HEAD|objects/.*)$')
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def run_git(*args: str, cwd: Optional[Path] = None) -> str:
+    """Run a git command and return stdout, raising on failure."""
+    result = subprocess.run(['git'] + list(args), cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+class ReleaseStore:
+    """On-disk release and asset store for one repository (thread-safe)."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.assets_dir = root / "assets"
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self.path = root / "releases.json"
+        self.lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {"next_id": 1, "releases": []}
+        return json.loads(self.path.read_text())
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=1))
+        os.replace(tmp, self.path)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(reversed(self._load()["releases"]))
+
+    def get(self, release_id: int) -> Optional[Dict[str, Any]]:
+        return next((r for r in self.list() if r["id"] == release_id), None)
+
+    def by_tag(self, tag: str) -> Optional[Dict[str, Any]]:
+        return next((r for r in self.list() if r["tag_name"] == tag), None)
+
+    def create(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(fields, dict) or not isinstance(fields.get("tag_name"), str) or not fields["tag_name"]:
+            # Gitea's binding error for CreateReleaseOption.TagName (binding:"Required")
+            raise ValueError("[TagName]: Required")
+        with self.lock:
+            data = self._load()
+            if any(r["tag_name"] == fields["tag_name"] for r in data["releases"]):
+                raise ValueError(f"Release for tag {fields['tag_name']} already exists")
+            release = {
+                "id": data["next_id"],
+                "tag_name": fields["tag_name"],
+                "target_commitish": fields.get("target_commitish", "main"),
+                "name": fields.get("name") or fields["tag_name"],
+                "body": fields.get("body", ""),
+                "draft": bool(fields.get("draft", False)),
+                "prerelease": bool(fields.get("prerelease", False)),
+                "created_at": now_iso(),
+                "published_at": now_iso(),
+                "assets": [],
+            }
+            data["next_id"] += 1
+            data["releases"].append(release)
+            self._save(data)
+            return release
+
+    def update(self, release_id: int, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            data = self._load()
+            for release in data["releases"]:
+                if release["id"] == release_id:
+                    for key in ("tag_name", "target_commitish", "name", "body", "draft", "prerelease"):
+                        if key in fields:
+                            release[key] = fields[key]
+                    self._save(data)
+                    return release
+            return None
+
+    def delete(self, release_id: int) -> bool:
+        with self.lock:
+            data = self._load()
+            kept = [r for r in data["releases"] if r["id"] != release_id]
+            if len(kept) == len(data["releases"]):
+                return False
+            data["releases"] = kept
+            self._save(data)
+        shutil.rmtree(self.assets_dir / str(release_id), ignore_errors=True)
+        return True
+
+    def add_asset(self, release_id: int, name: str, content: bytes, content_type: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            data = self._load()
+            release = next((r for r in data["releases"] if r["id"] == release_id), None)
+            if release is None:
+                return None
+            name = Path(name).name  # never let an upload name escape the asset dir
+            # Re-uploading a name replaces it (gh release upload --clobber)
+            release["assets"] = [a for a in release["assets"] if a["name"] != name]
+            asset = {
+                "id": data["next_id"],
+                "name": name,
+                "size": len(content),
+                "content_type": content_type,
+                "created_at": now_iso(),
+            }
+            data["next_id"] += 1
+            asset_dir = self.assets_dir / str(release_id)
+            asset_dir.mkdir(parents=True, exist_ok=True)
+            (asset_dir / name).write_bytes(content)
+            release["assets"].append(asset)
+            self._save(data)
+            return asset
+
+    def delete_asset(self, asset_id: int) -> bool:
+        with self.lock:
+            data = self._load()
+            for release in data["releases"]:
+                for asset in release["assets"]:
+                    if asset["id"] == asset_id:
+                        release["assets"].remove(asset)
+                        (self.assets_dir / str(release["id"]) / asset["name"]).unlink(missing_ok=True)
+                        self._save(data)
+                        return True
+            return False
+
+    def asset_path(self, tag: str, name: str) -> Optional[Path]:
+        release = self.by_tag(tag)
+        if release is None or not any(a["name"] == name for a in release["assets"]):
+            return None
+        return self.assets_dir / str(release["id"]) / name
+
+
+class FakeGitea:
+    """
+    Git + release API server backed by a directory of bare repositories.
+
+    Args:
+        root: Directory holding git/<owner>/<repo>.git and releases/<owner>/<repo>/
+        port: TCP port (0 picks a free one)
+        user: Accepted username
+        password: Accepted password
+    """
+
+    def __init__(self, root: Path, port: int = 0, user: str = DEFAULT_USER, password: str = DEFAULT_PASS):
+        self.root = Path(root)
+        self.user = user
+        self.password = password
+        self.tokens = {secrets.token_hex(20)}
+        self.git_root = self.root / "git"
+        self.git_root.mkdir(parents=True, exist_ok=True)
+        self._stores: Dict[Tuple[str, str], ReleaseStore] = {}
+        self._stores_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    @property
+    def token(self) -> str:
+        return next(iter(self.tokens))
+
+    def start(self) -> "FakeGitea":
+        # Short poll interval so stop() returns promptly between tests
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeGitea":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def repo_path(self, owner: str, repo: str) -> Path:
+        return self.git_root / owner / f"{repo}.git"
+
+    def remote_url(self, owner: str, repo: str, auth: bool = True) -> str:
+        """HTTP clone URL, with credentials embedded unless auth=False."""
+        creds = f"{self.user}:{self.token}@" if auth else ""
+        return f"http://{creds}localhost:{self.port}/{owner}/{repo}.git"
+
+    def create_repo(self, owner: str, repo: str, source: Optional[Path] = None) -> Path:
+        """
+        Create a bare repository, optionally mirroring every ref of a local source repo.
+
+        Returns:
+            Path to the bare repository
+        """
+        path = self.repo_path(owner, repo)
+        if path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if source is not None:
+            run_git("clone", "--quiet", "--mirror", str(source), str(path))
+            run_git("remote", "remove", "origin", cwd=path)
+        else:
+            run_git("init", "--quiet", "--bare", "--initial-branch=main", str(path))
+        run_git("config", "http.receivepack", "true", cwd=path)
+        return path
+
+    def releases(self, owner: str, repo: str) -> ReleaseStore:
+        key = (owner, repo)
+        with self._stores_lock:
+            if key not in self._stores:
+                self._stores[key] = ReleaseStore(self.root / "releases" / owner / repo)
+            return self._stores[key]
+
+    def check_auth(self, header: Optional[str]) -> bool:
+        """Accept Basic user:password, Basic user:token, or token/Bearer <token>."""
+        if not header:
+            return False
+        scheme, _, value = header.partition(" ")
+        scheme = scheme.lower()
+        if scheme in ("token", "bearer"):
+            return value.strip() in self.tokens
+        if scheme == "basic":
+            try:
+                user, _, secret = base64.b64decode(value.strip()).decode("utf-8").partition(":")
+            except (ValueError, UnicodeDecodeError):
+                return False
+            return user == self.user and (secret == self.password or secret in self.tokens)
+        return False
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(GiteaRequestHandler):
+            gitea = server
+
+        return Handler
+
+
+class GiteaRequestHandler(BaseHTTPRequestHandler):
+    """Routes git smart HTTP and REST API requests for a FakeGitea instance."""
+
+    gitea: FakeGitea
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        if os.environ.get("FAKE_GITEA_VERBOSE"):
+            super().log_message(format, *args)
+
+    # --- request plumbing -------------------------------------------------
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_bytes(self, status: int, body: bytes, content_type: str = "application/octet-stream",
+                   extra_headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_json(self, status: int, payload: Any) -> None:
+        self.send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def send_error_json(self, status: int, message: str) -> None:
+        self.send_json(status, {"message": message})
+
+    def require_auth(self) -> bool:
+        if self.gitea.check_auth(self.headers.get("Authorization")):
+            return True
+        self.send_bytes(401, b'{"message":"Unauthorized"}', "application/json",
+                        {"WWW-Authenticate": 'Basic realm="fake-gitea"'})
+        return False
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_HEAD(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def do_PATCH(self):
+        self.dispatch()
+
+    def do_DELETE(self):
+        self.dispatch()
+
+    def dispatch(self) -> None:
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = parse_qs(parsed.query)
+        try:
+            if GIT_SERVICE_PATH.match(path):
+                self.handle_git(path, parsed.query)
+                return
+            for prefix in API_PREFIXES:
+                if prefix and not path.startswith(prefix + "/"):
+                    continue
+                if self.handle_api(self.command, path[len(prefix):], query):
+                    return
+            if path in ("/", ""):
+                self.send_bytes(200, b"fake-gitea", "text/plain")
+                return
+            self.send_error_json(404, f"Not found: {self.command} {path}")
+        except ValueError as e:
+            self.send_error_json(422, str(e))
+
+    # --- git smart HTTP ---------------------------------------------------
+
+    def handle_git(self, path: str, query_string: str) -> None:
+        owner, repo, _ = GIT_SERVICE_PATH.match(path).groups()
+        repo_path = self.gitea.repo_path(owner, repo)
+        if not repo_path.exists():
+            self.send_error_json(404, f"Repository {owner}/{repo} not found")
+            return
+        is_push = "git-receive-pack" in path or "service=git-receive-pack" in query_string
+        if is_push and not self.require_auth():
+            return
+
+        body = self.read_body()
+        git_path = "/" + path.split(".git/", 1)[1] if ".git/" in path else "/" + path.split("/", 3)[3]
+        env = dict(os.environ)
+        env.update({
+            "GIT_PROJECT_ROOT": str(repo_path),
+            "GIT_HTTP_EXPORT_ALL": "1",
+            "PATH_INFO": git_path,
+            "REQUEST_METHOD": self.command,
+            "QUERY_STRING": query_string,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(body)),
+            "REMOTE_ADDR": self.client_address[0],
+            "REMOTE_USER": self.gitea.user if is_push else "",
+            "HTTP_CONTENT_ENCODING": self.headers.get("Content-Encoding", ""),
+            "GIT_PROTOCOL": self.headers.get("Git-Protocol", ""),
+        })
+        result = subprocess.run(["git", "http-backend"], input=body, env=env, capture_output=True)
+        header_blob, _, payload = result.stdout.partition(b"\r\n\r\n")
+        status = 200
+        headers: Dict[str, str] = {}
+        for line in header_blob.decode("latin-1").split("\r\n"):
+            key, _, value = line.partition(":")
+            if key.lower() == "status":
+                status = int(value.strip().split()[0])
+            elif key:
+                headers[key.strip()] = value.strip()
+        content_type = headers.pop("Content-Type", "application/octet-stream")
+        self.send_bytes(status, payload, content_type, headers)
+
+    # --- REST API ---------------------------------------------------------
+
+    def handle_api(self, method: str, path: str, query: Dict[str, List[str]]) -> bool:
+        """Handle an API route; return False if nothing matched."""
+        gitea = self.gitea
+
+        if path == "/user" and method == "GET":
+            if self.require_auth():
+                self.send_json(200, {"id": 1, "login": gitea.user, "username": gitea.user})
+            return True
+
+        if path == "/user/repos" and method == "POST":
+            if self.require_auth():
+                fields = json.loads(self.read_body() or b"{}")
+                if gitea.repo_path(gitea.user, fields["name"]).exists():
+                    self.send_error_json(409, "The repository with the same name already exists.")
+                else:
+                    gitea.create_repo(gitea.user, fields["name"])
+                    self.send_json(201, {"id": 1, "name": fields["name"], "full_name": f"{gitea.user}/{fields['name']}"})
+            return True
+
+        match = re.match(r'^/users/([^/]+)/tokens$', path)
+        if match and method == "POST":
+            if self.require_auth():
+                token = secrets.token_hex(20)
+                gitea.tokens.add(token)
+                fields = json.loads(self.read_body() or b"{}")
+                self.send_json(201, {"id": len(gitea.tokens), "name": fields.get("name", ""), "sha1": token})
+            return True
+
+        match = re.match(r'^/repos/([^/]+)/([^/]+)(/.*)?$', path)
+        if not match:
+            return False
+        owner, repo, rest = match.group(1), match.group(2), match.group(3) or ""
+        repo_path = gitea.repo_path(owner, repo)
+        if not repo_path.exists():
+            self.send_error_json(404, f"Repository {owner}/{repo} not found")
+            return True
+        if method != "GET" and not self.require_auth():
+            return True
+        return self.handle_repo_api(method, owner, repo, repo_path, rest, query)
+
+    def handle_repo_api(self, method: str, owner: str, repo: str, repo_path: Path,
+                        rest: str, query: Dict[str, List[str]]) -> bool:
+        store = self.gitea.releases(owner, repo)
+
+        if rest == "" and method == "GET":
+            self.send_json(200, {"name": repo, "full_name": f"{owner}/{repo}", "default_branch": "main"})
+            return True
+
+        match = re.match(r'^/git/refs(?:/(.*))?$', rest)
+        if match:
+            ref_path = match.group(1) or ""
+            if method == "GET":
+                refs = self.list_refs(repo_path, "refs/" + ref_path if ref_path else "refs/")
+                exact = [r for r in refs if r["ref"] == f"refs/{ref_path}"]
+                self.send_json(200 if refs else 404, exact[0] if exact else refs)
+            elif method == "DELETE":
+                try:
+                    run_git("update-ref", "-d", f"refs/{ref_path}", cwd=repo_path)
+                    self.send_bytes(204, b"")
+                except RuntimeError as e:
+                    self.send_error_json(422, str(e))
+            else:
+                return False
+            return True
+
+        if rest == "/tags" and method == "GET":
+            tags = [{"name": r["ref"][len("refs/tags/"):], "commit": {"sha": r["object"]["sha"]}}
+                    for r in self.list_refs(repo_path, "refs/tags/")]
+            self.send_json(200, tags)
+            return True
+
+        if rest == "/releases":
+            if method == "GET":
+                self.send_json(200, [self.release_json(owner, repo, r) for r in store.list()])
+            elif method == "POST":
+                fields = json.loads(self.read_body() or b"{}")
+                self.send_json(201, self.release_json(owner, repo, store.create(fields)))
+            else:
+                return False
+            return True
+
+        if rest == "/releases/latest" and method == "GET":
+            published = [r for r in store.list() if not r["draft"] and not r["prerelease"]]
+            if published:
+                self.send_json(200, self.release_json(owner, repo, published[0]))
+            else:
+                self.send_error_json(404, "No published release")
+            return True
+
+        match = re.match(r'^/releases/tags/(.+)$', rest)
+        if match:
+            release = store.by_tag(match.group(1))
+            if release is None:
+                self.send_error_json(404, f"Release for tag {match.group(1)} not found")
+            elif method == "GET":
+                self.send_json(200, self.release_json(owner, repo, release))
+            elif method == "DELETE":
+                store.delete(release["id"])
+                self.send_bytes(204, b"")
+            else:
+                return False
+            return True
+
+        match = re.match(r'^/releases/(\d+)$', rest)
+        if match:
+            release_id = int(match.group(1))
+            if method == "GET":
+                release = store.get(release_id)
+            elif method == "PATCH":
+                fields = json.loads(self.read_body() or b"{}")
+                if not isinstance(fields, dict):
+                    raise ValueError("request body must be a JSON object")
+                release = store.update(release_id, fields)
+            elif method == "DELETE":
+                if store.delete(release_id):
+                    self.send_bytes(204, b"")
+                else:
+                    self.send_error_json(404, f"Release {release_id} not found")
+                return True
+            else:
+                return False
+            if release is None:
+                self.send_error_json(404, f"Release {release_id} not found")
+            else:
+                self.send_json(200, self.release_json(owner, repo, release))
+            return True
+
+        match = re.match(r'^/releases/(\d+)/assets$', rest)
+        if match:
+            release_id = int(match.group(1))
+            release = store.get(release_id)
+            if release is None:
+                self.send_error_json(404, f"Release {release_id} not found")
+            elif method == "GET":
+                self.send_json(200, self.release_json(owner, repo, release)["assets"])
+            elif method == "POST":
+                name, content, content_type = self.read_upload(query)
+                asset = store.add_asset(release_id, name, content, content_type)
+                self.send_json(201, self.asset_json(owner, repo, release, asset))
+            else:
+                return False
+            return True
+
+        match = re.match(r'^/releases/(?:\d+/)?assets/(\d+)$', rest)
+        if match and method == "DELETE":
+            if store.delete_asset(int(match.group(1))):
+                self.send_bytes(204, b"")
+            else:
+                self.send_error_json(404, "Asset not found")
+            return True
+
+        match = re.match(r'^/releases/download/([^/]+)/(.+)$', rest)
+        if match and method in ("GET", "HEAD"):
+            asset_path = store.asset_path(match.group(1), match.group(2))
+            if asset_path is None:
+                self.send_error_json(404, "Asset not found")
+            else:
+                self.send_bytes(200, asset_path.read_bytes())
+            return True
+
+        return False
+
+    def read_upload(self, query: Dict[str, List[str]]) -> Tuple[str, bytes, str]:
+        """Accept GitHub raw uploads (?name=) and Gitea multipart uploads (attachment field)."""
+        body = self.read_body()
+        content_type = self.headers.get("Content-Type", "application/octet-stream")
+        if content_type.startswith("multipart/form-data"):
+            message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+            )
+            for part in message.iter_parts():
+                if part.get_param("name", header="content-disposition") == "attachment":
+                    name = query.get("name", [part.get_filename() or "attachment"])[0]
+                    return name, part.get_payload(decode=True) or b"", part.get_content_type()
+            raise ValueError("multipart upload without an 'attachment' field")
+        if "name" not in query:
+            raise ValueError("asset upload requires ?name=")
+        return query["name"][0], body, content_type
+
+    def list_refs(self, repo_path: Path, prefix: str) -> List[Dict[str, Any]]:
+        output = run_git("for-each-ref", "--format=%(refname) %(objectname) %(objecttype)", prefix, cwd=repo_path)
+        refs = []
+        for line in output.splitlines():
+            ref, sha, obj_type = line.split(" ")
+            refs.append({"ref": ref, "object": {"sha": sha, "type": obj_type}})
+        return refs
+
+    def release_json(self, owner: str, repo: str, release: Dict[str, Any]) -> Dict[str, Any]:
+        base = f"{self.gitea.url}/api/v1/repos/{owner}/{repo}"
+        payload = dict(release)
+        payload["url"] = f"{base}/releases/{release['id']}"
+        payload["html_url"] = f"{self.gitea.url}/{owner}/{repo}/releases/tag/{release['tag_name']}"
+        payload["upload_url"] = f"{base}/releases/{release['id']}/assets{{?name,label}}"
+        payload["assets"] = [self.asset_json(owner, repo, release, a) for a in release["assets"]]
+        return payload
+
+    def asset_json(self, owner: str, repo: str, release: Dict[str, Any], asset: Dict[str, Any]) -> Dict[str, Any]:
+        payload = dict(asset)
+        payload["browser_download_url"] = (
+            f"{self.gitea.url}/api/v1/repos/{owner}/{repo}/releases/download/{release['tag_name']}/{asset['name']}"
+        )
+        return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Gitea/GitHub API stand-in")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--root", type=Path, default=Path("/tmp/fake-gitea"))
+    parser.add_argument("--user", default=DEFAULT_USER)
+    parser.add_argument("--populate", type=Path, help="Mirror this local repository as <user>/" + REPO_NAME)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    server = FakeGitea(args.root, port=args.port, user=args.user)
+    if args.populate:
+        server.create_repo(args.user, REPO_NAME, source=args.populate)
+    server.start()
+    print(f"Fake Gitea ready at {server.url} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    print(f"GITEA_USER={server.user}")
+    print(f"GITEA_PASS={server.password}")
+    print(f"GITEA_TOKEN={server.token}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
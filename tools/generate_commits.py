@@ -52,35 +52,59 @@ def create_commit(message, cwd=None):
     full_message = f"{message} (ci-test-run)"
     run_git('commit', '-m', full_message, '--allow-empty', cwd=cwd)
 
+# Commit subjects per phase (the " (ci-test-run)" marker is appended by create_commit)
+PHASE_COMMITS = {
+    1: [
+        'feat: [PHASE-1] add user authentication system',
+        'feat: [PHASE-1] implement data caching layer',
+    ],
+    2: [
+        'fix: [PHASE-2] resolve null pointer exception',
+        'feat: [PHASE-2] add request rate limiting',
+    ],
+    3: [
+        'fix: [PHASE-3] correct database query',
+        'feat: [PHASE-3] redesign API endpoints',
+    ],
+    4: [
+        'docs: [PHASE-4] update API documentation',
+        'docs: [PHASE-4] improve README examples',
+    ],
+    5: [
+        'fix: [PHASE-5] correct sorting order in results',
+        'docs: [PHASE-5] clarify installation steps',
+    ],
+}
+
+def create_phase_commits(phase, repo_path):
+    """Create the commits listed for a phase in PHASE_COMMITS."""
+    for message in PHASE_COMMITS[phase]:
+        create_commit(message, cwd=repo_path)
+
 def phase_1_features(repo_path):
     """Phase 1: Features → 0.1.0 (minor bump)."""
     print("Phase 1: Pure Features")
-    create_commit('feat: [PHASE-1] add user authentication system', cwd=repo_path)
-    create_commit('feat: [PHASE-1] implement data caching layer', cwd=repo_path)
+    create_phase_commits(1, repo_path)
 
 def phase_2_mixed(repo_path):
     """Phase 2: Mixed commits → 0.2.0 (feat > fix, so minor bump)."""
     print("Phase 2: Mixed (Fix + Feature) - feature takes precedence")
-    create_commit('fix: [PHASE-2] resolve null pointer exception', cwd=repo_path)
-    create_commit('feat: [PHASE-2] add request rate limiting', cwd=repo_path)
+    create_phase_commits(2, repo_path)
 
 def phase_3_mixed_major(repo_path):
     """Phase 3: Mixed with --force major → 1.0.0."""
     print("Phase 3: Mixed (Fix + Feature) with force major")
-    create_commit('fix: [PHASE-3] correct database query', cwd=repo_path)
-    create_commit('feat: [PHASE-3] redesign API endpoints', cwd=repo_path)
+    create_phase_commits(3, repo_path)
 
 def phase_4_documentation(repo_path):
     """Phase 4: Documentation updates → 1.0.0 (no bump, no changelog)."""
     print("Phase 4: Pure Documentation")
-    create_commit('docs: [PHASE-4] update API documentation', cwd=repo_path)
-    create_commit('docs: [PHASE-4] improve README examples', cwd=repo_path)
+    create_phase_commits(4, repo_path)
 
 def phase_5_mixed_fix_docs(repo_path):
     """Phase 5: Mixed fix + docs → 1.0.1 (fix takes precedence over docs)."""
     print("Phase 5: Mixed (Fix + Docs) - fix takes precedence")
-    create_commit('fix: [PHASE-5] correct sorting order in results', cwd=repo_path)
-    create_commit('docs: [PHASE-5] clarify installation steps', cwd=repo_path)
+    create_phase_commits(5, repo_path)
 
 def main():
     # Parse arguments
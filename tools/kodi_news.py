@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Build the Kodi <news> block from CHANGELOG.md under a byte budget.
+
+Kodi truncates addon news, so only the latest release(s) are kept. Releases
+are streamed newest-first from CHANGELOG.md and mapped through news_types from
+[tool.psr-prepare.changelog] (e.g. feat -> [new], fix -> [fix]); reading stops
+as soon as the next line would overflow the budget, so the cost is bounded by
+the budget rather than the length of the history.
+
+The block is spliced into addon.xml in place: only the <news> element's
+content changes, every other byte of the document is left as written.
+
+Output format (one release header per release, one line per item):
+
+  v1.0.1 (2024-01-01)
+  [fix] correct sorting order in results
+
+Usage:
+  kodi_news.py [--changelog PATH] [--addon-xml PATH] [--budget BYTES] [--dry-run]
+
+Options:
+  --changelog PATH   Changelog to read (default: CHANGELOG.md)
+  --addon-xml PATH   addon.xml to update (default: <kodi-addon-directory>/addon.xml)
+  --budget BYTES     Maximum size of the escaped news text (default: 1500)
+  --dry-run          Print the block instead of writing addon.xml
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import LONG_TYPE_NAMES, ChangelogParser, PyprojectConfig, ReleaseInfo  # noqa: E402
+
+DEFAULT_BUDGET = 1500
+
+# Changelog section heading (PSR long type name) -> conventional commit type
+SECTION_TYPES = {name: commit_type for commit_type, name in LONG_TYPE_NAMES.items()}
+
+NEWS_ELEMENT = re.compile(r"<news\s*/>|<news(\s[^>]*)?>(.*?)</news>", re.DOTALL)
+METADATA_EXTENSION = re.compile(
+    r'(<extension\b[^>]*\bpoint="xbmc\.addon\.metadata"[^>]*>)(.*?)([ \t]*</extension>)', re.DOTALL
+)
+
+
+def release_lines(release: ReleaseInfo, news_types: Dict[str, str]) -> List[str]:
+    """Return the escaped news lines for one release (header first), or [] if nothing maps."""
+    items = []
+    for section, entries in release.sections.items():
+        label = news_types.get(SECTION_TYPES.get(section.lower(), ""))
+        if label:
+            items.extend(escape(f"[{label}] {entry}") for entry in entries)
+    if not items:
+        return []
+    header = f"v{release.version}" + (f" ({release.date})" if release.date else "")
+    return [escape(header)] + items
+
+
+def build_news(releases: Iterable[ReleaseInfo], news_types: Dict[str, str], budget: int = DEFAULT_BUDGET) -> str:
+    """
+    Fill the budget with the newest releases' news lines.
+
+    Lines are added in order until the next one would overflow the budget
+    (in UTF-8 bytes, newlines included). A release header is only added
+    together with its first item, so no header is left without entries.
+
+    Args:
+        releases: Releases newest-first (consumed lazily)
+        news_types: commit_type -> Kodi news label
+        budget: Maximum size of the returned text in bytes
+
+    Returns:
+        The news text, possibly empty
+    """
+    lines: List[str] = []
+    used = 0
+    for release in releases:
+        candidate = release_lines(release, news_types)
+        if not candidate:
+            continue
+        # Header and first item are one unit
+        units = ["\n".join(candidate[:2])] + candidate[2:]
+        for unit in units:
+            cost = len(unit.encode("utf-8")) + (1 if lines else 0)
+            if used + cost > budget:
+                return "\n".join(lines)
+            lines.append(unit)
+            used += cost
+    return "\n".join(lines)
+
+
+def splice_news(raw_xml: str, news: str) -> str:
+    """
+    Replace the content of <news> (or insert one into the metadata extension).
+
+    Raises:
+        ValueError: If addon.xml has no xbmc.addon.metadata extension to hold <news>
+    """
+    match = NEWS_ELEMENT.search(raw_xml)
+    if match:
+        attrs = match.group(1) or ""
+        return f"{raw_xml[:match.start()]}<news{attrs}>{news}</news>{raw_xml[match.end():]}"
+
+    metadata = METADATA_EXTENSION.search(raw_xml)
+    if metadata is None:
+        raise ValueError("addon.xml has no xbmc.addon.metadata extension for <news>")
+    closing_indent = re.match(r"[ \t]*", metadata.group(3)).group(0)
+    element = f"{closing_indent}    <news>{news}</news>\n"
+    return raw_xml[:metadata.start(3)] + element + raw_xml[metadata.start(3):]
+
+
+def update_addon_xml(addon_xml: Path, changelog: Path, news_types: Dict[str, str],
+                     budget: int = DEFAULT_BUDGET) -> str:
+    """Rebuild the news block from changelog and write it into addon_xml atomically."""
+    news = build_news(ChangelogParser.iter_releases(changelog), news_types, budget)
+    raw_xml = addon_xml.read_text(encoding="utf-8")
+    updated = splice_news(raw_xml, news)
+    if updated != raw_xml:
+        tmp = addon_xml.with_name(addon_xml.name + ".tmp")
+        tmp.write_text(updated, encoding="utf-8")
+        os.replace(tmp, addon_xml)
+    return news
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a budgeted Kodi <news> block into addon.xml")
+    parser.add_argument("--changelog", type=Path, default=Path("CHANGELOG.md"))
+    parser.add_argument("--addon-xml", type=Path)
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET)
+    parser.add_argument("--pyproject", type=Path, default=Path("pyproject.toml"))
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    config = PyprojectConfig.load(args.pyproject)
+    news_types = PyprojectConfig.load_news_types(args.pyproject)
+    addon_xml = args.addon_xml
+    if addon_xml is None:
+        kodi_dir = config.get("tool", {}).get("arranger", {}).get("kodi-addon-directory")
+        if not kodi_dir:
+            print("ERROR: no --addon-xml and no [tool.arranger] kodi-addon-directory", file=sys.stderr)
+            sys.exit(1)
+        addon_xml = Path(kodi_dir) / "addon.xml"
+
+    if not args.changelog.exists():
+        print(f"ERROR: {args.changelog} not found", file=sys.stderr)
+        sys.exit(1)
+
+    if args.dry_run:
+        print(build_news(ChangelogParser.iter_releases(args.changelog), news_types, args.budget))
+        return
+    try:
+        news = update_addon_xml(addon_xml, args.changelog, news_types, args.budget)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {len(news.encode('utf-8'))}/{args.budget} bytes of news into {addon_xml}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Historical performance store for harness runs, with trend and changepoint reports.
+
+`ingest` reads each .artifacts/<timestamp>/ run directory once and stores one
+value per (source, key, metric):
+
+  source     key                                 metrics
+  ci-log     <job>/<step> in the act log         wall_s (act's step duration)
+  harness    phase-N/<step> (run_harness --json) wall_s, cpu_s, peak_rss_mb, read_mb, write_mb
+  resources  phase-N/<step> (*.jsonl written by phase_budget.py --log)  as harness
+  pytest     test id (junit XML, pytest-json-report JSON)  duration_s
+  bench      <file>/<path> (bench-*.json)        leaves named in the file's "units"
+  artifact   file path in the run dir            bytes
+
+Runs are ordered by their name (ci-simulate's %Y%m%d-%H%M%S timestamps) and
+carry the commit they were built from when given. A run whose files (paths,
+sizes and mtimes) are unchanged since its last ingest is skipped. The store
+outlives the runs it was built from: `make clean` keeps it (and the artifact
+store in .artifacts/.cas); only `make clean-history` deletes them.
+
+Every metric is a cost, so higher is worse:
+
+  trend         per series: baseline (median of the previous --window runs),
+                latest value, change and a sparkline, largest changes first
+  changepoints  level shifts over the whole history (binary segmentation on
+                medians), with the first run and commit of each new level
+  check         series whose newest run is a regression against its
+                baseline; exits 1 if any, so a slowdown surfaces on the run
+                that introduced it
+
+A bench file declares its metrics in a top-level "units" map of leaf name to
+unit ({"seconds": "s", "peak_bytes": "bytes", ...}); other numeric leaves
+(sizes, fitted exponents) are inputs or derived values and are not stored.
+
+A change counts when it is at least --threshold robust standard deviations
+(1.4826 * MAD, floored at 2% of the level), at least --min-change of the
+baseline, and above a per-metric absolute floor (50ms, 1MB, 1KiB, ...).
+
+Usage:
+  perf_db.py ingest [PATH ...] [--run NAME] [--commit SHA] [--db FILE]
+  perf_db.py trend [--source S] [--match TEXT] [--limit N] [options]
+  perf_db.py changepoints [--source S] [--match TEXT] [options]
+  perf_db.py check [options]
+
+Options:
+  PATH             Run directories (default: every .artifacts/<run>/), or files to
+                   ingest into one run named by --run
+  --run NAME       Run name for loose files (default: current %Y%m%d-%H%M%S)
+  --commit SHA     Commit the named run was built from (needs PATH)
+  --db FILE        SQLite store (default: .artifacts/perf.sqlite)
+  --source S       Only this source (ci-log, harness, resources, pytest, bench, artifact)
+  --match TEXT     Only keys containing TEXT (case-insensitive)
+  --last N         Only the newest N runs (default: 200)
+  --window N       Baseline runs for trend/check (default: 10)
+  --threshold Z    Robust z-score for a change (default: 4)
+  --min-change F   Minimum relative change (default: 0.1)
+  --limit N        Rows in the trend report (default: 30)
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ci_log_index import LOG_NAME, split_steps  # noqa: E402
+
+ARTIFACTS_DIR = Path(".artifacts")
+DEFAULT_DB = ARTIFACTS_DIR / "perf.sqlite"
+RUN_NAME_FORMAT = "%Y%m%d-%H%M%S"
+RESOURCE_METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "read_mb", "write_mb")
+# Run-directory files that describe the store rather than the run
+SKIP_FILES = {".cas-manifest.json"}
+
+# Smallest absolute change worth reporting, per metric, then per metric-name suffix
+MIN_ABS_CHANGE = {
+    "wall_s": 0.05, "cpu_s": 0.05, "duration_s": 0.05,
+    "peak_rss_mb": 1.0, "read_mb": 0.1, "write_mb": 0.1, "bytes": 1024,
+    "seconds": 0.001,
+}
+MIN_ABS_CHANGE_SUFFIX = {"_us": 100.0, "_bytes": 1024}
+NOISE_FLOOR = 0.02
+SPARKS = "▁▂▃▄▅▆▇█"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    started TEXT NOT NULL,
+    git_commit TEXT,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, source, key, metric)
+);
+CREATE INDEX IF NOT EXISTS metrics_series ON metrics (source, key, metric);
+"""
+
+Metric = Tuple[str, str, str, float]  # source, key, metric, value
+SeriesKey = Tuple[str, str, str]  # source, key, metric
+
+
+# Extraction
+
+def ci_log_metrics(path: Path) -> Iterator[Metric]:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for record in split_steps(f):
+            if record.duration_s is not None:
+                yield "ci-log", f"{record.job}/{record.step}", "wall_s", record.duration_s
+
+
+def junit_metrics(source: Union[Path, IO[bytes]]) -> Iterator[Metric]:
+    for _, element in ET.iterparse(source if not isinstance(source, Path) else str(source)):
+        if element.tag == "testcase" and element.get("time"):
+            classname, name = element.get("classname", ""), element.get("name", "")
+            yield "pytest", f"{classname}::{name}" if classname else name, "duration_s", float(element.get("time"))
+        element.clear()
+
+
+def flatten(value: Any, prefix: str) -> Iterator[Tuple[str, float]]:
+    """Numeric leaves of nested JSON as (path, value); list items are labelled by their first scalar field."""
+    if isinstance(value, bool):
+        return
+    if isinstance(value, (int, float)):
+        yield prefix, float(value)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            yield from flatten(v, f"{prefix}/{k}")
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            label = str(i)
+            if isinstance(item, dict) and item:
+                first_key, first = next(iter(item.items()))
+                if isinstance(first, (str, int)) and not isinstance(first, bool):
+                    label = f"{first_key}={first}"
+                    item = {k: v for k, v in item.items() if k != first_key}
+            yield from flatten(item, f"{prefix}/{label}")
+
+
+def json_metrics(path: Path) -> Iterator[Metric]:
+    try:
+        data = json.loads(path.read_text())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return
+    if isinstance(data, list) and data and all(isinstance(r, dict) and "phase" in r and "steps" in r for r in data):
+        # run_harness.py --json
+        for result in data:
+            resources = result.get("resources", {})
+            for step, seconds in result["steps"].items():
+                usage = resources.get(step, {"wall_s": seconds})
+                for metric in RESOURCE_METRICS:
+                    if metric in usage:
+                        yield "harness", f"phase-{result['phase']}/{step}", metric, float(usage[metric])
+    elif isinstance(data, dict) and isinstance(data.get("tests"), list) and "summary" in data:
+        # pytest-json-report
+        for test in data["tests"]:
+            phases = [test.get(when, {}).get("duration", 0.0) for when in ("setup", "call", "teardown")]
+            yield "pytest", test["nodeid"], "duration_s", float(sum(phases))
+    elif path.name.startswith("bench-") and isinstance(data, dict) and isinstance(data.get("units"), dict):
+        units = data.pop("units")
+        for leaf, value in flatten(data, path.stem[len("bench-"):]):
+            key, _, metric = leaf.rpartition("/")
+            if metric in units:
+                yield "bench", key, metric, value
+
+
+def jsonl_metrics(lines: Iterable[Union[str, bytes]]) -> Iterator[Metric]:
+    # phase_budget.py --log
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict) or "step" not in entry or "usage" not in entry:
+            continue
+        key = f"phase-{entry['phase']}/{entry['step']}" if entry.get("phase") is not None else entry["step"]
+        for metric in RESOURCE_METRICS:
+            if metric in entry["usage"]:
+                yield "resources", key, metric, float(entry["usage"][metric])
+
+
+def artifact_key(relative: str) -> str:
+    """Artifact path with act's per-run numeric directories dropped, so it lines up across runs."""
+    return "/".join(part for part in relative.split("/") if not part.isdigit())
+
+
+def file_metrics(relative: str, path: Path) -> Iterator[Metric]:
+    if path.name == LOG_NAME:
+        yield from ci_log_metrics(path)
+        return
+    if path.suffix == ".xml" and path.name != "addon.xml":
+        try:
+            yield from junit_metrics(path)
+        except ET.ParseError:
+            pass
+    elif path.suffix == ".json":
+        yield from json_metrics(path)
+    elif path.suffix == ".jsonl":
+        with open(path) as f:
+            yield from jsonl_metrics(f)
+    elif path.suffix == ".zip":
+        yield from zip_metrics(path)
+    yield "artifact", artifact_key(relative), "bytes", float(path.stat().st_size)
+
+
+def zip_metrics(path: Path) -> Iterator[Metric]:
+    """Test and resource results inside a zip (act's upload-artifact@v4 server stores artifacts zipped)."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if member.endswith(".xml") and not member.endswith("addon.xml"):
+                    with archive.open(member) as f:
+                        try:
+                            yield from junit_metrics(f)
+                        except ET.ParseError:
+                            pass
+                elif member.endswith(".jsonl"):
+                    with archive.open(member) as f:
+                        yield from jsonl_metrics(f)
+    except zipfile.BadZipFile:
+        return
+
+
+def run_files(run_dir: Path) -> List[Tuple[str, Path]]:
+    return sorted((p.relative_to(run_dir).as_posix(), p) for p in run_dir.rglob("*")
+                  if p.is_file() and p.name not in SKIP_FILES)
+
+
+def fingerprint(files: Iterable[Tuple[str, Path]]) -> str:
+    digest = hashlib.sha256()
+    for relative, path in files:
+        st = path.stat()
+        digest.update(f"{relative}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+def run_started(name: str, fallback: float) -> str:
+    try:
+        return datetime.strptime(name, RUN_NAME_FORMAT).isoformat()
+    except ValueError:
+        return datetime.fromtimestamp(fallback).isoformat(timespec="seconds")
+
+
+# Detection
+
+def noise(values: List[float], level: float) -> float:
+    """Robust standard deviation of values around level, floored at NOISE_FLOOR of the level."""
+    mad = statistics.median(abs(v - level) for v in values) if values else 0.0
+    return max(1.4826 * mad, NOISE_FLOOR * abs(level), 1e-12)
+
+
+def min_abs_change(metric: str) -> float:
+    if metric in MIN_ABS_CHANGE:
+        return MIN_ABS_CHANGE[metric]
+    return next((floor for suffix, floor in MIN_ABS_CHANGE_SUFFIX.items() if metric.endswith(suffix)), 0.0)
+
+
+def is_change(before: float, after: float, scale: float, metric: str, threshold: float, min_change: float) -> bool:
+    delta = abs(after - before)
+    return (delta / scale >= threshold and delta >= min_abs_change(metric)
+            and (before == 0 or delta / abs(before) >= min_change))
+
+
+def changepoints(values: List[float], metric: str = "", threshold: float = 4.0, min_change: float = 0.1,
+                 min_size: int = 3) -> List[int]:
+    """
+    Indices where the series settles at a new level (binary segmentation on medians).
+
+    Each split needs min_size values on both sides; a segment's best split is
+    kept if the medians either side pass is_change() against the pooled noise.
+    """
+    found: List[int] = []
+
+    def cost(segment: List[float]) -> float:
+        level = statistics.median(segment)
+        return sum(abs(v - level) for v in segment)
+
+    def split(lo: int, hi: int) -> None:
+        candidates = range(lo + min_size, hi - min_size + 1)
+        if not candidates:
+            return
+        # Best split: least total absolute deviation from each side's median
+        best = min(candidates, key=lambda t: cost(values[lo:t]) + cost(values[t:hi]))
+        left, right = values[lo:best], values[best:hi]
+        before, after = statistics.median(left), statistics.median(right)
+        residuals = [v - before for v in left] + [v - after for v in right]
+        scale = max(noise(residuals, 0.0), NOISE_FLOOR * abs(before))
+        if is_change(before, after, scale, metric, threshold, min_change):
+            # Near the ends min_size can hold the cut off the true boundary; snap it to the nearer level
+            while best < hi - 1 and abs(values[best] - before) < abs(values[best] - after):
+                best += 1
+            while best > lo + 1 and abs(values[best - 1] - after) < abs(values[best - 1] - before):
+                best -= 1
+            found.append(best)
+            split(lo, best)
+            split(best, hi)
+
+    split(0, len(values))
+    return sorted(found)
+
+
+def latest_shift(values: List[float], metric: str = "", window: int = 10, threshold: float = 4.0,
+                 min_change: float = 0.1) -> Optional[Tuple[float, float]]:
+    """(baseline, latest) when the newest value is a regression against the previous window, else None."""
+    baseline_values = values[-window - 1:-1]
+    if len(baseline_values) < 3:
+        return None
+    baseline, latest = statistics.median(baseline_values), values[-1]
+    if latest > baseline and is_change(baseline, latest, noise(baseline_values, baseline), metric,
+                                       threshold, min_change):
+        return baseline, latest
+    return None
+
+
+def sparkline(values: List[float]) -> str:
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARKS[0] * len(values)
+    return "".join(SPARKS[int((v - low) / (high - low) * (len(SPARKS) - 1))] for v in values)
+
+
+def format_value(value: float, metric: str) -> str:
+    if metric == "bytes" or metric.endswith("_bytes"):
+        return f"{value / 1024:,.1f}KiB"
+    return f"{value:,.3g}"
+
+
+# Store
+
+class PerfDB:
+    """
+    SQLite store of per-run metrics.
+
+    Args:
+        db_path: SQLite database file (created if missing)
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def ingest(self, name: str, files: List[Tuple[str, Path]], commit: Optional[str] = None,
+               started: Optional[str] = None) -> bool:
+        """
+        Store the metrics found in files as run `name`; returns False if it was already current.
+        """
+        stamp = fingerprint(files)
+        row = self.conn.execute("SELECT id, fingerprint, git_commit FROM runs WHERE name = ?", (name,)).fetchone()
+        if row and row[1] == stamp:
+            return False
+        newest = max((path.stat().st_mtime for _, path in files), default=time.time())
+        values: Dict[Tuple[str, str, str], float] = {}
+        for relative, path in files:
+            for source, key, metric, value in file_metrics(relative, path):
+                values[(source, key, metric)] = value
+        with self.conn:
+            if row:
+                self.conn.execute("DELETE FROM runs WHERE id = ?", (row[0],))
+            run_id = self.conn.execute(
+                "INSERT INTO runs (name, started, git_commit, fingerprint) VALUES (?, ?, ?, ?)",
+                (name, started or run_started(name, newest), commit or (row[2] if row else None), stamp),
+            ).lastrowid
+            self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                                  [(run_id, *key, value) for key, value in values.items()])
+        return True
+
+    def series(self, source: Optional[str] = None, match: Optional[str] = None,
+               last: int = 200) -> Dict[SeriesKey, List[Tuple[str, Optional[str], float]]]:
+        """(source, key, metric) -> [(run name, commit, value)] oldest first, over the newest `last` runs."""
+        rows = self.conn.execute(
+            """
+            SELECT metrics.source, metrics.key, metrics.metric, runs.name, runs.git_commit, metrics.value
+            FROM metrics JOIN runs ON runs.id = metrics.run_id
+            WHERE (?1 IS NULL OR metrics.source = ?1) AND (?2 IS NULL OR instr(lower(metrics.key), lower(?2)) > 0)
+              AND runs.id IN (SELECT id FROM runs ORDER BY started DESC, name DESC LIMIT ?3)
+            ORDER BY metrics.source, metrics.key, metrics.metric, runs.started, runs.name
+            """, (source, match, last))
+        result: Dict[SeriesKey, List[Tuple[str, Optional[str], float]]] = {}
+        for source_, key, metric, run, commit, value in rows:
+            result.setdefault((source_, key, metric), []).append((run, commit, value))
+        return result
+
+    def runs(self) -> List[dict]:
+        rows = self.conn.execute(
+            """
+            SELECT runs.name, runs.started, runs.git_commit, count(metrics.value)
+            FROM runs LEFT JOIN metrics ON metrics.run_id = runs.id
+            GROUP BY runs.id ORDER BY runs.started, runs.name
+            """)
+        return [{"run": name, "started": started, "commit": commit, "metrics": count}
+                for name, started, commit, count in rows]
+
+
+# Reports
+
+def trend_rows(series: Dict[SeriesKey, list], window: int) -> List[dict]:
+    rows = []
+    for (source, key, metric), points in series.items():
+        values = [value for _, _, value in points]
+        baseline_values = values[-window - 1:-1] or values
+        baseline = statistics.median(baseline_values)
+        change = (values[-1] - baseline) / baseline if baseline else 0.0
+        rows.append({"source": source, "key": key, "metric": metric, "runs": len(values),
+                     "baseline": baseline, "latest": values[-1], "change": change,
+                     "spark": sparkline(values[-20:])})
+    return sorted(rows, key=lambda r: -abs(r["change"]))
+
+
+def changepoint_rows(series: Dict[SeriesKey, list], threshold: float, min_change: float) -> List[dict]:
+    rows = []
+    for (source, key, metric), points in series.items():
+        values = [value for _, _, value in points]
+        cuts = changepoints(values, metric, threshold, min_change)
+        bounds = [0] + cuts + [len(values)]
+        for i, cut in enumerate(cuts):
+            before = statistics.median(values[bounds[i]:cut])
+            after = statistics.median(values[cut:bounds[i + 2]])
+            run, commit, _ = points[cut]
+            rows.append({"source": source, "key": key, "metric": metric, "run": run, "commit": commit,
+                         "before": before, "after": after,
+                         "change": (after - before) / before if before else 0.0})
+    return sorted(rows, key=lambda r: (r["run"], r["source"], r["key"]), reverse=True)
+
+
+def check_rows(series: Dict[SeriesKey, list], window: int, threshold: float, min_change: float) -> List[dict]:
+    newest = max((points[-1][0] for points in series.values()), default=None)
+    rows = []
+    for (source, key, metric), points in series.items():
+        if points[-1][0] != newest:
+            continue
+        shift = latest_shift([value for _, _, value in points], metric, window, threshold, min_change)
+        if shift:
+            baseline, latest = shift
+            rows.append({"source": source, "key": key, "metric": metric, "run": newest,
+                         "commit": points[-1][1], "baseline": baseline, "latest": latest,
+                         "change": (latest - baseline) / baseline if baseline else 0.0})
+    return sorted(rows, key=lambda r: -r["change"])
+
+
+def find_run_dirs(root: Path = ARTIFACTS_DIR) -> List[Path]:
+    """Run directories under root (hidden ones such as .cas are not runs)."""
+    return sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")) if root.is_dir() else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store harness performance history and report trends")
+    parser.add_argument("command", choices=["ingest", "trend", "changepoints", "check", "runs"])
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--run")
+    parser.add_argument("--commit")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--source")
+    parser.add_argument("--match")
+    parser.add_argument("--last", type=int, default=200)
+    parser.add_argument("--window", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=4.0)
+    parser.add_argument("--min-change", type=float, default=0.1)
+    parser.add_argument("--limit", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.command == "ingest" and args.commit and not args.paths:
+        print("ERROR: --commit applies to a named run; pass its directory or files", file=sys.stderr)
+        sys.exit(1)
+
+    db = PerfDB(args.db)
+    try:
+        if args.command == "ingest":
+            missing = [str(p) for p in args.paths if not p.exists()]
+            if missing:
+                print(f"ERROR: not found: {', '.join(missing)}", file=sys.stderr)
+                sys.exit(1)
+            loose = [p for p in args.paths if p.is_file()]
+            dirs = [p for p in args.paths if p.is_dir()] if args.paths else find_run_dirs()
+            ingested = sum(db.ingest(d.name, run_files(d), args.commit) for d in dirs)
+            total = len(dirs)
+            if loose:
+                name = args.run or time.strftime(RUN_NAME_FORMAT)
+                ingested += db.ingest(name, sorted((p.name, p) for p in loose), args.commit)
+                total += 1
+            print(f"{ingested} runs ingested, {total - ingested} already current")
+        elif args.command == "runs":
+            for entry in db.runs():
+                print(f"{entry['run']}  {entry['started']}  {entry['commit'] or '-':<12} {entry['metrics']} metrics")
+        else:
+            series = db.series(args.source, args.match, args.last)
+            if args.command == "trend":
+                for row in trend_rows(series, args.window)[:args.limit]:
+                    print(f"{row['change']:>+7.1%} {row['spark']:<20} {row['runs']:>4} runs  "
+                          f"{format_value(row['baseline'], row['metric']):>10} -> "
+                          f"{format_value(row['latest'], row['metric']):<10} "
+                          f"{row['source']} {row['key']} [{row['metric']}]")
+            elif args.command == "changepoints":
+                for row in changepoint_rows(series, args.threshold, args.min_change):
+                    print(f"{row['run']} ({row['commit'] or 'no commit'}) {row['change']:>+7.1%} "
+                          f"{format_value(row['before'], row['metric'])} -> {format_value(row['after'], row['metric'])}  "
+                          f"{row['source']} {row['key']} [{row['metric']}]")
+            else:
+                regressions = check_rows(series, args.window, args.threshold, args.min_change)
+                for row in regressions:
+                    print(f"REGRESSION {row['run']} ({row['commit'] or 'no commit'}) {row['change']:+.1%}: "
+                          f"{row['source']} {row['key']} [{row['metric']}] "
+                          f"{format_value(row['baseline'], row['metric'])} -> {format_value(row['latest'], row['metric'])}")
+                print(f"{len(regressions)} regressions in the newest run ({len(series)} series checked)")
+                sys.exit(1 if regressions else 0)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
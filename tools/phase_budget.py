@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Resource accounting and budgets for harness steps.
+
+A step (commit generation, prepare, PSR, zip, tests) is measured as this
+process plus everything it spawns while the step runs:
+
+  wall_s       elapsed time
+  cpu_s        user + system time, including reaped child processes (rusage)
+  peak_rss_mb  peak resident memory of the process tree, sampled from
+               /proc/<pid>/status every 20ms (VmHWM is reset at the start)
+  read_mb      bytes read via read()-like calls (/proc/self/io rchar; reaped
+  write_mb     children are folded into the parent's counters) / written (wchar);
+               the meter's own /proc reads are counted and subtracted
+
+Budgets live next to phase-config.json in phase-budgets.json: "defaults"
+maps step name -> {metric: limit}, and "phases" overrides limits per phase
+number. Steps or metrics without a limit are measured but never fail.
+
+run_harness.py meters every step in-process; composite actions wrap their
+commands with this script, which runs the command, prints the usage and exits
+non-zero when the command fails or a budget is exceeded.
+
+Usage:
+  phase_budget.py --step NAME [--phase N] [--budgets FILE] [--log FILE] -- CMD [ARGS ...]
+
+Options:
+  --step NAME     Step name the budget is looked up under (e.g. psr)
+  --phase N       Phase number (default: $HARNESS_PHASE)
+  --budgets FILE  Budget file (default: .github/workflows/phase-budgets.json)
+  --log FILE      Append the measurement as a JSON line (default: $PHASE_RESOURCE_LOG)
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_PATH = REPO_ROOT / ".github" / "workflows" / "phase-budgets.json"
+
+METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "read_mb", "write_mb")
+SAMPLE_INTERVAL_S = 0.02
+MB = 1024 * 1024
+
+
+class BudgetExceeded(RuntimeError):
+    """A step used more than its phase budget allows."""
+
+
+@dataclass
+class Usage:
+    """Resources used by one step."""
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    read_mb: float = 0.0
+    write_mb: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v, 3) for k, v in asdict(self).items()}
+
+
+class ProcReader:
+    """
+    Reads /proc files with os.read and counts the bytes.
+
+    Those reads land in this process's rchar like any other, so the meter
+    subtracts bytes_read from read_mb.
+    """
+
+    def __init__(self):
+        self.bytes_read = 0
+
+    def read(self, path: str) -> str:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        return b"".join(chunks).decode("utf-8", "replace")
+
+
+def _read_io(proc: ProcReader) -> Dict[str, int]:
+    try:
+        return {key: int(value) for key, value in (line.split(":") for line in proc.read("/proc/self/io").splitlines())}
+    except OSError:
+        return {}
+
+
+def _cpu_seconds() -> float:
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _status_kb(pid: int, field: str, proc: ProcReader) -> int:
+    try:
+        for line in proc.read(f"/proc/{pid}/status").splitlines():
+            if line.startswith(field):
+                return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _children(pid: int, proc: ProcReader) -> List[int]:
+    children: List[int] = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            children.extend(int(child) for child in proc.read(f"/proc/{pid}/task/{tid}/children").split())
+    except OSError:
+        pass
+    return children
+
+
+def tree_rss_kb(pid: int, proc: Optional[ProcReader] = None) -> int:
+    """Current resident memory of pid and all of its live descendants."""
+    proc = proc or ProcReader()
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _status_kb(current, "VmRSS:", proc)
+        stack.extend(_children(current, proc))
+    return total
+
+
+class ResourceMeter:
+    """
+    Context manager measuring this process and its children over a block.
+
+    On platforms without /proc only wall and CPU time (and the rusage peak
+    RSS) are available; the other metrics stay 0.
+    """
+
+    def __init__(self):
+        self.usage = Usage()
+        self._peak_kb = 0
+        self._proc = ProcReader()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        pid = os.getpid()
+        while True:
+            self._peak_kb = max(self._peak_kb, tree_rss_kb(pid, self._proc))
+            if self._stop.wait(SAMPLE_INTERVAL_S):
+                return
+
+    def __enter__(self) -> "ResourceMeter":
+        try:
+            # Reset VmHWM so the peak below is this block's, not the process's lifetime peak
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            pass
+        self._children_maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        # rchar read below excludes the read itself; everything the meter reads after this point is its own
+        self._own_start = self._proc.bytes_read
+        self._io = _read_io(self._proc)
+        self._cpu = _cpu_seconds()
+        self._started = time.perf_counter()
+        if os.path.isdir("/proc/self"):
+            self._thread = threading.Thread(target=self._sample, name="resource-meter", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter() - self._started
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        own_reads = self._proc.bytes_read - self._own_start
+        io = _read_io(self._proc)
+        peak_kb = max(self._peak_kb, _status_kb(os.getpid(), "VmHWM:", self._proc))
+        children_maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        if children_maxrss > self._children_maxrss:
+            # A child reaped during the block peaked above anything seen before it (kB on Linux)
+            peak_kb = max(peak_kb, children_maxrss)
+        self.usage = Usage(
+            wall_s=wall,
+            cpu_s=_cpu_seconds() - self._cpu,
+            peak_rss_mb=peak_kb / 1024,
+            read_mb=max(io.get("rchar", 0) - self._io.get("rchar", 0) - own_reads, 0) / MB,
+            write_mb=(io.get("wchar", 0) - self._io.get("wchar", 0)) / MB,
+        )
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> Dict[str, Any]:
+    """Load phase-budgets.json; a missing file means no budgets."""
+    if not Path(path).exists():
+        return {}
+    budgets = json.loads(Path(path).read_text())
+    for scope in [budgets.get("defaults", {})] + list(budgets.get("phases", {}).values()):
+        for step, limits in scope.items():
+            unknown = set(limits) - set(METRICS)
+            if unknown:
+                raise ValueError(f"{path}: unknown metric(s) {sorted(unknown)} for step '{step}'")
+    return budgets
+
+
+def budget_for(budgets: Dict[str, Any], phase: Optional[int], step: str) -> Dict[str, float]:
+    """Limits for one step: the defaults, overridden by the phase's own entries."""
+    limits = dict(budgets.get("defaults", {}).get(step, {}))
+    if phase is not None:
+        limits.update(budgets.get("phases", {}).get(str(phase), {}).get(step, {}))
+    return limits
+
+
+def violations(usage: Usage, limits: Dict[str, float]) -> List[str]:
+    used = asdict(usage)
+    return [f"{metric} {used[metric]:.2f} > {limit}" for metric, limit in limits.items() if used[metric] > limit]
+
+
+def format_usage(step: str, usage: Usage, limits: Dict[str, float]) -> str:
+    """One line per step, e.g. `psr: wall_s=1.20/180 cpu_s=0.90/120 peak_rss_mb=95.1/500 ...`."""
+    used = asdict(usage)
+    parts = [f"{metric}={used[metric]:.2f}" + (f"/{limits[metric]}" if metric in limits else "")
+             for metric in METRICS]
+    return f"{step}: {' '.join(parts)}"
+
+
+def budget_report(phase: Optional[int], step: str, usage: Usage, limits: Dict[str, float]) -> str:
+    """The failure message for a step over budget."""
+    where = f"phase {phase} step '{step}'" if phase is not None else f"step '{step}'"
+    lines = [f"Resource budget exceeded in {where}:"]
+    lines.extend(f"  {v}" for v in violations(usage, limits))
+    lines.append(f"  measured {format_usage(step, usage, limits)}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a command under a phase resource budget",
+                                     usage="phase_budget.py --step NAME [options] -- CMD [ARGS ...]")
+    parser.add_argument("--step", required=True)
+    parser.add_argument("--phase", type=int,
+                        default=int(os.environ["HARNESS_PHASE"]) if os.environ.get("HARNESS_PHASE") else None)
+    parser.add_argument("--budgets", type=Path, default=BUDGETS_PATH)
+    parser.add_argument("--log", type=Path, default=os.environ.get("PHASE_RESOURCE_LOG") or None)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+    try:
+        limits = budget_for(load_budgets(args.budgets), args.phase, args.step)
+    except (ValueError, json.JSONDecodeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with ResourceMeter() as meter:
+        try:
+            returncode = subprocess.call(command)
+        except OSError as e:
+            print(f"ERROR: cannot run {command[0]}: {e}", file=sys.stderr)
+            sys.exit(127)
+    usage = meter.usage
+    exceeded = violations(usage, limits)
+
+    print(f"[resources] {format_usage(args.step, usage, limits)}", file=sys.stderr)
+    if args.log:
+        with open(args.log, "a") as f:
+            f.write(json.dumps({"phase": args.phase, "step": args.step, "usage": usage.as_dict(),
+                                "limits": limits, "violations": exceeded}) + "\n")
+    if returncode != 0:
+        sys.exit(returncode)
+    if exceeded:
+        print(f"ERROR: {budget_report(args.phase, args.step, usage, limits)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Record and replay PSR phase outputs from a content-addressed store.
+
+The post-PSR tests need CHANGELOG.md and addon.xml as PSR rendered them, which
+normally means a full release per iteration. During a harness run
+(run_harness.py --record) each phase's inputs and outputs are captured:
+
+  inputs   commit messages reachable from HEAD, tags reachable from HEAD,
+           config hash (pyproject.toml + the phase's phase-config.json entry),
+           template hash (every file under templates/)
+  outputs  rendered files, tag, version and the release commit message
+
+Rendered files are stored once by sha256 under objects/; each phase record is
+records/<input key>.json. Replaying computes the input key from a tree in the
+same pre-release state and writes the recorded files back when it matches.
+
+Usage:
+  psr_replay.py replay --phase N [--dir DIR] [--store DIR]
+  psr_replay.py key --phase N [--dir DIR]
+  psr_replay.py list [--store DIR]
+
+Options:
+  --phase N     Phase number from phase-config.json
+  --dir DIR     Working tree in its pre-release state (default: .)
+  --store DIR   Replay store (default: $PSR_REPLAY_STORE or .psr-replay/)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHASE_CONFIG = Path(".github") / "workflows" / "phase-config.json"
+DEFAULT_STORE = Path(os.environ.get("PSR_REPLAY_STORE", REPO_ROOT / ".psr-replay"))
+RECORD_VERSION = 1
+
+
+def _git(worktree: Path, *args: str) -> str:
+    return subprocess.run(["git"] + list(args), cwd=worktree, capture_output=True, text=True, check=True).stdout
+
+
+def hash_tree(root: Path) -> str:
+    """sha256 over every file's relative path and content, in path order."""
+    digest = hashlib.sha256()
+    if root.is_dir():
+        for path in sorted(p for p in root.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(root).as_posix().encode() + b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+@dataclass
+class PhaseInputs:
+    """Everything a PSR phase's output depends on."""
+    phase: int
+    commits: List[str]
+    tags: List[str]
+    config_hash: str
+    template_hash: str
+
+    def key(self) -> str:
+        return hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()
+
+
+def capture_inputs(worktree: Path, phase: int, template_dir: str = "templates") -> PhaseInputs:
+    """
+    Capture a phase's inputs from a worktree just before PSR runs.
+
+    Commit messages are used rather than SHAs so identical histories recorded
+    on different days (different author dates, hence SHAs) share a key.
+    """
+    log = _git(worktree, "log", "--format=%s%n%b%x1e", "HEAD")
+    commits = [entry.strip() for entry in log.split("\x1e") if entry.strip()]
+    tags = sorted(_git(worktree, "tag", "--merged", "HEAD").split())
+
+    phase_entry = json.loads((worktree / PHASE_CONFIG).read_text())["phases"][str(phase)]
+    config = hashlib.sha256()
+    config.update((worktree / "pyproject.toml").read_bytes())
+    config.update(json.dumps(phase_entry, sort_keys=True).encode())
+
+    return PhaseInputs(
+        phase=phase,
+        commits=commits,
+        tags=tags,
+        config_hash=config.hexdigest(),
+        template_hash=hash_tree(worktree / template_dir),
+    )
+
+
+class ReplayStore:
+    """
+    Content-addressed store of recorded phase outputs.
+
+    Args:
+        root: Store directory (objects/ and records/ are created beneath it)
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE):
+        self.root = root
+        self.objects = root / "objects"
+        self.records = root / "records"
+
+    def put_blob(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.objects / sha[:2] / sha
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{sha}.tmp-{os.getpid()}")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return sha
+
+    def get_blob(self, sha: str) -> bytes:
+        return (self.objects / sha[:2] / sha).read_bytes()
+
+    def record(self, inputs: PhaseInputs, worktree: Path, files: List[str], tag: Optional[str],
+               version: Optional[str], commit_message: Optional[str]) -> Path:
+        """
+        Store a phase's outputs under its input key.
+
+        Args:
+            inputs: Inputs captured before PSR ran
+            worktree: Tree holding the rendered files
+            files: Paths relative to worktree to capture (missing files are skipped)
+            tag: Latest tag after the phase
+            version: Version PSR reported
+            commit_message: Release commit message, or None if PSR made no commit
+        """
+        outputs: Dict[str, str] = {}
+        for rel in files:
+            path = worktree / rel
+            if path.is_file():
+                outputs[rel] = self.put_blob(path.read_bytes())
+        record_path = self.records / f"{inputs.key()}.json"
+        record_path.parent.mkdir(parents=True, exist_ok=True)
+        record_path.write_text(json.dumps({
+            "version": RECORD_VERSION,
+            "phase": inputs.phase,
+            "recorded": time.time(),
+            "inputs": asdict(inputs),
+            "outputs": {"files": outputs, "tag": tag, "version": version, "commit_message": commit_message},
+        }, indent=2))
+        return record_path
+
+    def lookup(self, inputs: PhaseInputs) -> Optional[dict]:
+        """Return the record for inputs, or None when nothing matches."""
+        try:
+            record = json.loads((self.records / f"{inputs.key()}.json").read_text())
+        except FileNotFoundError:
+            return None
+        return record if record.get("version") == RECORD_VERSION else None
+
+    def replay(self, inputs: PhaseInputs, worktree: Path) -> Optional[dict]:
+        """Write the recorded files into worktree; returns the record's outputs, or None on a miss."""
+        record = self.lookup(inputs)
+        if record is None:
+            return None
+        outputs = record["outputs"]
+        for rel, sha in outputs["files"].items():
+            path = worktree / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(self.get_blob(sha))
+        return outputs
+
+    def list_records(self) -> List[dict]:
+        if not self.records.is_dir():
+            return []
+        records = []
+        for path in sorted(self.records.glob("*.json")):
+            record = json.loads(path.read_text())
+            records.append({"key": path.stem, "phase": record["phase"], **record["outputs"]})
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded PSR phase outputs")
+    parser.add_argument("command", choices=["replay", "key", "list"])
+    parser.add_argument("--phase", type=int)
+    parser.add_argument("--dir", type=Path, default=Path("."))
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    args = parser.parse_args()
+
+    store = ReplayStore(args.store)
+    if args.command == "list":
+        for record in store.list_records():
+            print(f"{record['key'][:16]}  phase {record['phase']}  {record['tag']}  {len(record['files'])} files")
+        return
+
+    if args.phase is None:
+        print("ERROR: --phase is required", file=sys.stderr)
+        sys.exit(1)
+    try:
+        inputs = capture_inputs(args.dir, args.phase)
+    except (subprocess.CalledProcessError, FileNotFoundError, KeyError) as e:
+        print(f"ERROR: could not capture phase {args.phase} inputs from {args.dir}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "key":
+        print(inputs.key())
+        return
+
+    started = time.perf_counter()
+    outputs = store.replay(inputs, args.dir)
+    if outputs is None:
+        print(f"No recording for phase {args.phase} with key {inputs.key()[:16]}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Replayed phase {args.phase} ({outputs['tag']}): {', '.join(outputs['files'])} "
+          f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
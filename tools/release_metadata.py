@@ -0,0 +1,886 @@
+"""
+Release metadata model shared by the harness tools and the tests.
+
+Semver versions, addon.xml parsing and validation, the CHANGELOG.md parser
+(including byte spans per release) and its persistent offset index. The
+tools import it directly; tests/test_helpers.py re-exports it for the
+integration and unit tests.
+"""
+
+import functools
+import mmap
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+
+# Identifier tuples are (is_alphanumeric, numeric_value, text) so numeric
+# identifiers sort numerically and below alphanumeric ones (semver 2.0.0, item 11)
+PrereleaseKey = Tuple[Tuple[int, int, str], ...]
+VersionSortKey = Tuple[int, int, int, int, PrereleaseKey]
+
+
+@dataclass(frozen=True)
+class Version:
+    """
+    Semantic version (semver 2.0.0) with a precomputed sort key.
+
+    Instances are immutable and hashable. Equality compares every component
+    including build metadata; ordering uses sort_key, which follows semver
+    precedence and therefore ignores build metadata.
+    """
+    major: int
+    minor: int
+    patch: int
+    prerelease: Tuple[str, ...] = ()
+    build: Tuple[str, ...] = ()
+    sort_key: VersionSortKey = field(init=False, repr=False, compare=False)
+
+    # Leading zeros are tolerated in numeric parts (they only normalise away)
+    PATTERN = re.compile(
+        r'^v?(\d+)\.(\d+)\.(\d+)'
+        r'(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?'
+        r'(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$'
+    )
+
+    def __post_init__(self):
+        prerelease_key = tuple(
+            (0, int(ident), "") if ident.isdigit() else (1, 0, ident)
+            for ident in self.prerelease
+        )
+        # A release sorts above every prerelease of the same major.minor.patch
+        key = (self.major, self.minor, self.patch, 0 if self.prerelease else 1, prerelease_key)
+        object.__setattr__(self, "sort_key", key)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse(text: str) -> "Version":
+        """
+        Parse a version string, with or without a 'v' prefix.
+
+        Results are cached, so repeated parses of the same string are free.
+
+        Raises:
+            ValueError: If text is not a valid semantic version
+        """
+        match = Version.PATTERN.match(text.strip())
+        if not match:
+            raise ValueError(f"Invalid semantic version: {text!r}")
+        major, minor, patch, prerelease, build = match.groups()
+        return Version(
+            major=int(major),
+            minor=int(minor),
+            patch=int(patch),
+            prerelease=tuple(prerelease.split('.')) if prerelease else (),
+            build=tuple(build.split('.')) if build else (),
+        )
+
+    @staticmethod
+    def try_parse(text: str) -> Optional["Version"]:
+        """Parse a version string, returning None instead of raising."""
+        try:
+            return Version.parse(text)
+        except ValueError:
+            return None
+
+    @property
+    def is_prerelease(self) -> bool:
+        """True for versions such as 1.0.0-rc.1."""
+        return bool(self.prerelease)
+
+    def as_tag(self, tag_format: str = "v{version}") -> str:
+        """Render as a git tag using PSR's tag_format (pyproject default: v{version})."""
+        return tag_format.format(version=str(self))
+
+    def __str__(self) -> str:
+        text = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            text += "-" + ".".join(self.prerelease)
+        if self.build:
+            text += "+" + ".".join(self.build)
+        return text
+
+    def __lt__(self, other: "Version") -> bool:
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: "Version") -> bool:
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: "Version") -> bool:
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: "Version") -> bool:
+        return self.sort_key >= other.sort_key
+
+
+@dataclass
+class ReleaseInfo:
+    """Parsed release information from changelog."""
+    version: str
+    date: Optional[str] = None
+    sections: Optional[Dict[str, List[str]]] = None  # section_name -> list of items
+    raw_content: str = ""
+
+    def __post_init__(self):
+        if self.sections is None:
+            self.sections = {}
+
+    @property
+    def semver(self) -> Version:
+        """Parsed form of version (cached by Version.parse)."""
+        return Version.parse(self.version)
+
+
+@dataclass
+class AddonXmlInfo:
+    """Parsed addon.xml information."""
+    id: str
+    version: str
+    name: Optional[str] = None
+    provider_name: Optional[str] = None
+    news_url: Optional[str] = None
+    news_content: Optional[str] = None
+    raw_xml: str = ""
+
+
+# Conventional commit type -> PSR's long type name (the changelog section key)
+LONG_TYPE_NAMES = {
+    "build": "build system",
+    "chore": "chores",
+    "ci": "continuous integration",
+    "docs": "documentation",
+    "feat": "features",
+    "fix": "bug fixes",
+    "perf": "performance improvements",
+    "refactor": "refactoring",
+    "style": "code style",
+    "test": "testing",
+}
+
+
+class PyprojectConfig:
+    """Reader for the fixture's [tool.*] settings in pyproject.toml."""
+
+    @staticmethod
+    def load(pyproject_path: Path) -> Dict[str, Any]:
+        """Load pyproject.toml as a dict."""
+        with open(pyproject_path, 'rb') as f:
+            return tomllib.load(f)
+
+    @staticmethod
+    def load_news_types(pyproject_path: Path) -> Dict[str, str]:
+        """
+        Get the commit_type -> Kodi news label mapping from [tool.psr-prepare.changelog].
+
+        Returns:
+            Mapping such as {"feat": "new", "fix": "fix", "perf": "improved"}, empty if unset
+        """
+        config = PyprojectConfig.load(pyproject_path)
+        return dict(config.get('tool', {}).get('psr-prepare', {}).get('changelog', {}).get('news_types', {}))
+
+
+class AddonXmlParser:
+    """Parser for Kodi addon.xml files with template rendering validation."""
+
+    @staticmethod
+    def parse(addon_xml_path: Path) -> AddonXmlInfo:
+        """
+        Parse addon.xml and extract key information.
+
+        Args:
+            addon_xml_path: Path to addon.xml file
+
+        Returns:
+            AddonXmlInfo with parsed data
+
+        Raises:
+            FileNotFoundError: If addon.xml not found
+            xml.etree.ElementTree.ParseError: If XML is malformed
+        """
+        if not addon_xml_path.exists():
+            raise FileNotFoundError(f"addon.xml not found at {addon_xml_path}")
+
+        return AddonXmlParser.parse_text(addon_xml_path.read_text())
+
+    @staticmethod
+    def parse_text(raw_xml: str) -> AddonXmlInfo:
+        """
+        Parse addon.xml content that is already in memory (e.g. read from a zip).
+
+        Args:
+            raw_xml: Full addon.xml text
+
+        Returns:
+            AddonXmlInfo with parsed data
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If XML is malformed
+        """
+        root = ET.fromstring(raw_xml)
+
+        # Extract root attributes
+        addon_id = root.get("id", "")
+        version = root.get("version", "")
+        name_elem = root.find("name")
+        name = name_elem.text if name_elem is not None else ""
+
+        # Extract provider name from info element
+        provider_name = None
+        for info in root.findall("extension"):
+            if info.get("point") == "xbmc.addon.metadata":
+                prov = info.find("provider")
+                if prov is not None:
+                    provider_name = prov.text
+                break
+
+        # Extract news URL if present in metadata
+        news_url = None
+        news_content = None
+        for extension in root.findall("extension"):
+            if extension.get("point") == "xbmc.addon.metadata":
+                # Look for news element or news URL
+                news_elem = extension.find("news")
+                if news_elem is not None:
+                    news_content = news_elem.text
+                news_url_elem = extension.find("news_url")
+                if news_url_elem is not None:
+                    news_url = news_url_elem.text
+                break
+
+        return AddonXmlInfo(
+            id=addon_id,
+            version=version,
+            name=name if name else None,
+            provider_name=provider_name,
+            news_url=news_url,
+            news_content=news_content,
+            raw_xml=raw_xml
+        )
+
+    @staticmethod
+    def validate_version(addon_info: AddonXmlInfo, expected_version: str) -> bool:
+        """
+        Validate addon version matches expected version.
+
+        Args:
+            addon_info: Parsed addon info
+            expected_version: Expected version string
+
+        Returns:
+            True if versions match (with or without 'v' prefix)
+        """
+        actual_version = addon_info.version
+        expected_clean = expected_version.lstrip('v')
+        actual_semver = Version.try_parse(actual_version)
+        expected_semver = Version.try_parse(expected_clean)
+        if actual_semver is None or expected_semver is None:
+            # Kodi also accepts non-semver versions such as "1.0"
+            return actual_version == expected_clean
+        return actual_semver == expected_semver
+
+    @staticmethod
+    def extract_news_section(addon_info: AddonXmlInfo) -> Optional[str]:
+        """
+        Extract rendered news section from addon.xml.
+
+        Returns news content if present, None otherwise.
+        """
+        return addon_info.news_content
+
+
+class AddonXmlValidator:
+    """
+    Single-pass structural validator for Kodi addon.xml.
+
+    Runs expat event handlers over the document once and keeps only the
+    element stack and a few sets for duplicate detection; no tree is built.
+    Checks:
+      - root <addon> with id, name, version and provider-name; id/version syntax
+      - one <requires>; each <import> has an addon id, valid version syntax, no duplicates
+      - every <extension> has a known point, required attributes, no duplicate points
+      - xbmc.addon.metadata singletons (<news>, <license>, ...) appear once and
+        localized elements (<summary>, <description>, ...) once per lang
+    """
+
+    ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]+$')
+    # Kodi versions: 1-4 numeric parts plus an optional ~tag, -tag or +build suffix
+    VERSION_PATTERN = re.compile(r'^\d+(?:\.\d+){0,3}(?:[~+-][0-9A-Za-z.~+-]+)?$')
+    ROOT_REQUIRED = ("id", "name", "version", "provider-name")
+    KNOWN_EXTENSION_POINTS = frozenset({
+        "xbmc.addon.metadata", "xbmc.addon.repository",
+        "xbmc.python.module", "xbmc.python.pluginsource", "xbmc.python.script",
+        "xbmc.python.library", "xbmc.python.weather", "xbmc.python.lyrics",
+        "xbmc.service", "xbmc.subtitle.module", "xbmc.webinterface", "xbmc.gui.skin",
+        "xbmc.ui.screensaver", "xbmc.player.musicviz", "xbmc.pvrclient",
+        "xbmc.metadata.scraper.albums", "xbmc.metadata.scraper.artists",
+        "xbmc.metadata.scraper.movies", "xbmc.metadata.scraper.musicvideos",
+        "xbmc.metadata.scraper.tvshows", "xbmc.metadata.scraper.library",
+        "kodi.context.item", "kodi.resource.images", "kodi.resource.language",
+        "kodi.resource.font", "kodi.resource.uisounds", "kodi.resource.games",
+        "kodi.gameclient", "kodi.game.controller", "kodi.vfs", "kodi.inputstream",
+        "kodi.peripheral", "kodi.audiodecoder", "kodi.audioencoder", "kodi.imagedecoder",
+    })
+    EXTENSION_REQUIRED = {
+        "xbmc.python.module": ("library",),
+        "xbmc.python.pluginsource": ("library",),
+        "xbmc.python.script": ("library",),
+        "xbmc.service": ("library",),
+    }
+    METADATA_SINGLETONS = frozenset({
+        "news", "platform", "license", "source", "website", "email", "forum",
+        "assets", "reuselanguageinvoker", "lifecyclestate",
+    })
+    METADATA_LOCALIZED = frozenset({"summary", "description", "disclaimer"})
+
+    @staticmethod
+    def validate(raw_xml) -> Tuple[bool, List[str]]:
+        """
+        Validate one addon.xml document.
+
+        Args:
+            raw_xml: Document as bytes or str
+
+        Returns:
+            Tuple of (is_valid: bool, errors: List[str]), each error prefixed with its line
+        """
+        V = AddonXmlValidator
+        parser = expat.ParserCreate()
+        errors: List[str] = []
+        stack: List[str] = []
+        imports: set = set()
+        points: set = set()
+        metadata_seen: set = set()
+        state = {"requires": 0, "extensions": 0, "metadata": False}
+
+        def error(message: str) -> None:
+            errors.append(f"line {parser.CurrentLineNumber}: {message}")
+
+        def start(name: str, attrs: Dict[str, str]) -> None:
+            depth = len(stack)
+            parent = stack[-1] if stack else None
+            stack.append(name)
+            if depth == 0:
+                if name != "addon":
+                    error(f"root element is <{name}>, expected <addon>")
+                    return
+                for attr in V.ROOT_REQUIRED:
+                    if not attrs.get(attr):
+                        error(f"<addon> missing required attribute '{attr}'")
+                if attrs.get("id") and not V.ID_PATTERN.match(attrs["id"]):
+                    error(f"invalid addon id '{attrs['id']}'")
+                if attrs.get("version") and not V.VERSION_PATTERN.match(attrs["version"]):
+                    error(f"invalid addon version '{attrs['version']}'")
+            elif depth == 1:
+                if name == "requires":
+                    state["requires"] += 1
+                    if state["requires"] == 2:
+                        error("duplicate <requires>")
+                elif name == "extension":
+                    state["extensions"] += 1
+                    point = attrs.get("point")
+                    if not point:
+                        error("<extension> missing required attribute 'point'")
+                        return
+                    if point not in V.KNOWN_EXTENSION_POINTS:
+                        error(f"unknown extension point '{point}'")
+                    if point in points:
+                        error(f"duplicate extension point '{point}'")
+                    points.add(point)
+                    for attr in V.EXTENSION_REQUIRED.get(point, ()):
+                        if not attrs.get(attr):
+                            error(f"extension '{point}' missing required attribute '{attr}'")
+                    if point == "xbmc.addon.metadata":
+                        state["metadata"] = True
+            elif depth == 2 and parent == "requires":
+                if name != "import":
+                    error(f"unexpected <{name}> in <requires>")
+                    return
+                addon = attrs.get("addon")
+                if not addon:
+                    error("<import> missing required attribute 'addon'")
+                elif addon in imports:
+                    error(f"duplicate import of '{addon}'")
+                else:
+                    imports.add(addon)
+                version = attrs.get("version")
+                if version is not None and not V.VERSION_PATTERN.match(version):
+                    error(f"invalid version '{version}' for import '{addon}'")
+                if attrs.get("optional", "false") not in ("true", "false"):
+                    error(f"import '{addon}' has optional='{attrs['optional']}', expected true/false")
+            elif depth == 2 and parent == "extension" and state["metadata"]:
+                if name in V.METADATA_SINGLETONS:
+                    key = name
+                elif name in V.METADATA_LOCALIZED:
+                    key = f"{name}[{attrs.get('lang', 'en_GB')}]"
+                else:
+                    return
+                if key in metadata_seen:
+                    error(f"duplicate <{key}> in xbmc.addon.metadata")
+                metadata_seen.add(key)
+
+        def end(name: str) -> None:
+            stack.pop()
+            if len(stack) == 1 and name == "extension":
+                state["metadata"] = False
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        try:
+            parser.Parse(raw_xml, True)
+        except expat.ExpatError as e:
+            errors.append(f"line {e.lineno}: not well-formed: {expat.ErrorString(e.code)}")
+            return False, errors
+
+        if state["extensions"] == 0:
+            errors.append("line 1: <addon> has no <extension>")
+        return len(errors) == 0, errors
+
+    @staticmethod
+    def validate_file(addon_xml_path: Path) -> Tuple[bool, List[str]]:
+        """Validate an addon.xml file (read as bytes so expat honours the declared encoding)."""
+        return AddonXmlValidator.validate(addon_xml_path.read_bytes())
+
+    @staticmethod
+    def validate_many(documents: Iterable[Tuple[str, bytes]]) -> Dict[str, List[str]]:
+        """
+        Validate many documents, e.g. every addon.xml in a repository ingestion batch.
+
+        Args:
+            documents: (name, raw bytes) pairs, consumed lazily
+
+        Returns:
+            Dict of name -> errors for the documents that failed (empty if all passed)
+        """
+        failures = {}
+        validate = AddonXmlValidator.validate
+        for name, raw in documents:
+            ok, errors = validate(raw)
+            if not ok:
+                failures[name] = errors
+        return failures
+
+
+class ChangelogParser:
+    """Parser for CHANGELOG.md files with template validation."""
+
+    # Regex patterns for changelog parsing
+    # Header whitespace is [ \t] rather than \s so a match can never run past the end of its line
+    RELEASE_HEADER = re.compile(
+        r'^## v?(\d+\.\d+\.\d+'
+        r'(?:-[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?'  # prerelease, e.g. -rc.1
+        r'(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?)'  # build metadata, e.g. +build.5
+        r'(?:[ \t]+\((.+?)\))?$',
+        re.MULTILINE
+    )
+    SECTION_HEADER = re.compile(r'^### ([A-Za-z\s]+)$', re.MULTILINE)
+    LIST_ITEM = re.compile(r'^[-*+]\s+(.+)$', re.MULTILINE)
+
+    @staticmethod
+    def parse(changelog_path: Path) -> List[ReleaseInfo]:
+        """
+        Parse CHANGELOG.md and extract release information.
+
+        Args:
+            changelog_path: Path to CHANGELOG.md file
+
+        Returns:
+            List of ReleaseInfo objects in order of appearance
+
+        Raises:
+            FileNotFoundError: If CHANGELOG.md not found
+        """
+        if not changelog_path.exists():
+            raise FileNotFoundError(f"CHANGELOG.md not found at {changelog_path}")
+
+        return ChangelogParser.parse_text(changelog_path.read_text())
+
+    @staticmethod
+    def parse_text(content: str) -> List[ReleaseInfo]:
+        """
+        Parse CHANGELOG.md content that is already in memory.
+
+        Args:
+            content: Full changelog text
+
+        Returns:
+            List of ReleaseInfo objects in order of appearance
+        """
+        releases = []
+
+        # Split by release headers
+        release_matches = list(ChangelogParser.RELEASE_HEADER.finditer(content))
+
+        for i, match in enumerate(release_matches):
+            version = match.group(1)
+            date = match.group(2)
+
+            # Get content between this release and the next
+            start_pos = match.end()
+            end_pos = release_matches[i + 1].start() if i + 1 < len(release_matches) else len(content)
+            release_content = content[start_pos:end_pos].strip()
+
+            # Parse sections within this release
+            sections = ChangelogParser._parse_sections(release_content)
+
+            releases.append(ReleaseInfo(
+                version=version,
+                date=date,
+                sections=sections,
+                raw_content=release_content
+            ))
+
+        return releases
+
+    @staticmethod
+    def iter_releases(changelog_path: Path) -> Iterator[ReleaseInfo]:
+        """
+        Stream releases from CHANGELOG.md in file order (newest first for PSR output).
+
+        Each release is yielded once the next header (or end of file) is read,
+        so a consumer that stops early never reads the rest of the file.
+
+        Args:
+            changelog_path: Path to CHANGELOG.md file
+
+        Yields:
+            ReleaseInfo objects in order of appearance
+        """
+        def finish(header: re.Match, lines: List[str]) -> ReleaseInfo:
+            content = "".join(lines).strip()
+            return ReleaseInfo(
+                version=header.group(1),
+                date=header.group(2),
+                sections=ChangelogParser._parse_sections(content),
+                raw_content=content,
+            )
+
+        header = None
+        lines: List[str] = []
+        with open(changelog_path, encoding="utf-8") as f:
+            for line in f:
+                match = ChangelogParser.RELEASE_HEADER.match(line.rstrip("\n"))
+                if match:
+                    if header is not None:
+                        yield finish(header, lines)
+                    header, lines = match, []
+                elif header is not None:
+                    lines.append(line)
+        if header is not None:
+            yield finish(header, lines)
+
+    @staticmethod
+    def release_spans(data) -> List[Tuple[str, int, int, int]]:
+        """
+        Locate releases in UTF-8 changelog bytes without decoding the document.
+
+        Args:
+            data: bytes, mmap or memoryview (e.g. a slice of shared memory)
+
+        Returns:
+            (version, header offset, body offset, end offset) per release, in file order;
+            release_at() turns a span back into the ReleaseInfo parse_text() would give
+        """
+        headers = [(m.group(1).decode("utf-8"), m.start(), m.end())
+                   for m in ChangelogIndex.RELEASE_HEADER.finditer(data)]
+        ends = [start for _, start, _ in headers[1:]] + [len(data)]
+        return [(version, start, body, end) for (version, start, body), end in zip(headers, ends)]
+
+    @staticmethod
+    def release_at(data, span: Tuple[str, int, int, int]) -> ReleaseInfo:
+        """Materialize one release_spans() entry of data as a ReleaseInfo."""
+        _, start, body, end = span
+        header = ChangelogParser.RELEASE_HEADER.match(str(data[start:body], "utf-8"))
+        content = str(data[body:end], "utf-8").strip()
+        return ReleaseInfo(
+            version=header.group(1),
+            date=header.group(2),
+            sections=ChangelogParser._parse_sections(content),
+            raw_content=content,
+        )
+
+    @staticmethod
+    def _parse_sections(content: str) -> Dict[str, List[str]]:
+        """
+        Parse section headers and items within release content.
+
+        Args:
+            content: Content block for a single release
+
+        Returns:
+            Dict of section_name -> list of items
+        """
+        sections: Dict[str, List[str]] = {}
+        current_section = "General"
+        sections[current_section] = []
+
+        for line in content.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+
+            section_match = ChangelogParser.SECTION_HEADER.match(line)
+            if section_match:
+                current_section = section_match.group(1).strip()
+                sections[current_section] = []
+                continue
+
+            item_match = ChangelogParser.LIST_ITEM.match(line)
+            if item_match:
+                item_text = item_match.group(1).strip()
+                if current_section in sections:
+                    sections[current_section].append(item_text)
+
+        # Remove empty sections
+        return {k: v for k, v in sections.items() if v}
+
+    @staticmethod
+    def get_release(releases: List[ReleaseInfo], version: str) -> Optional[ReleaseInfo]:
+        """
+        Get a specific release by version number.
+
+        Args:
+            releases: List of parsed releases
+            version: Version to find (e.g., "0.1.0" or "v1.0.0-rc.1")
+
+        Returns:
+            ReleaseInfo if found, None otherwise
+        """
+        target = Version.try_parse(version)
+        if target is None:
+            return None
+        for release in releases:
+            if release.semver == target:
+                return release
+        return None
+
+    @staticmethod
+    def validate_release_exists(releases: List[ReleaseInfo], version: str) -> bool:
+        """Check if a specific version exists in releases."""
+        return ChangelogParser.get_release(releases, version) is not None
+
+    @staticmethod
+    def validate_all_versions_present(releases: List[ReleaseInfo], expected_versions: List[str]) -> Tuple[bool, List[str]]:
+        """
+        Validate that all expected versions are present in changelog.
+
+        Args:
+            releases: List of parsed releases
+            expected_versions: List of expected version strings
+
+        Returns:
+            Tuple of (all_present: bool, missing_versions: List[str])
+        """
+        missing = []
+        for version in expected_versions:
+            if not ChangelogParser.validate_release_exists(releases, version):
+                missing.append(version)
+        return len(missing) == 0, missing
+
+    @staticmethod
+    def get_all_versions(releases: List[ReleaseInfo]) -> List[str]:
+        """Get list of all versions in changelog (in order)."""
+        return [r.version for r in releases]
+
+    @staticmethod
+    def validate_descending(releases: List[ReleaseInfo]) -> Tuple[bool, List[Tuple[str, str]]]:
+        """
+        Validate that releases are in strictly descending version order.
+
+        Sort keys are computed once per release and compared pairwise, so
+        no version string is parsed more than once.
+
+        Returns:
+            Tuple of (is_descending: bool, violations: List[(newer_expected, found_after)])
+        """
+        keys = [r.semver.sort_key for r in releases]
+        violations = [
+            (releases[i].version, releases[i + 1].version)
+            for i in range(len(keys) - 1)
+            if not keys[i] > keys[i + 1]
+        ]
+        return len(violations) == 0, violations
+
+    @staticmethod
+    def sort_releases(releases: List[ReleaseInfo]) -> List[ReleaseInfo]:
+        """Return releases ordered newest first by semver precedence."""
+        return sorted(releases, key=lambda r: r.semver.sort_key, reverse=True)
+
+    @staticmethod
+    def get_release_notes(changelog_path: Path, version: str) -> Optional[ReleaseInfo]:
+        """
+        Get one release's notes, reading only its bytes when a fresh sidecar index exists.
+
+        Args:
+            changelog_path: Path to CHANGELOG.md
+            version: Version to find (e.g., "1.0.1" or "v1.0.1")
+
+        Returns:
+            ReleaseInfo if found, None otherwise
+        """
+        target = Version.try_parse(version)
+        span = ChangelogIndex.lookup(changelog_path, version) if target is not None else None
+        if span is not None:
+            releases = ChangelogParser.parse_text(ChangelogIndex.read_span(changelog_path, *span))
+            if releases and releases[0].semver == target:
+                return releases[0]
+        # No index, stale index, unindexed version, or offsets no longer at the header
+        return ChangelogParser.get_release(ChangelogParser.parse(changelog_path), version)
+
+
+class ChangelogIndex:
+    """
+    Sidecar byte-offset index for CHANGELOG.md, stored as <changelog>.idx.
+
+    The first line records the changelog's size and mtime; each following
+    line is "<version> <offset> <length>". A lookup is one substring search
+    over the index bytes, so its cost does not depend on parsing the
+    changelog. An index whose size or mtime no longer matches is stale.
+    """
+
+    SUFFIX = ".idx"
+    MAGIC = "psr-changelog-index"
+    FORMAT_VERSION = 1
+    RELEASE_HEADER = re.compile(ChangelogParser.RELEASE_HEADER.pattern.encode(), re.MULTILINE)
+
+    @staticmethod
+    def index_path(changelog_path: Path) -> Path:
+        return changelog_path.with_name(changelog_path.name + ChangelogIndex.SUFFIX)
+
+    @staticmethod
+    def _key(version: str) -> str:
+        parsed = Version.try_parse(version)
+        return str(parsed) if parsed is not None else version
+
+    @staticmethod
+    def scan(data: bytes, start: int = 0, end: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (version key, byte offset) for each release header in data[start:end]."""
+        end = len(data) if end is None else end
+        return [
+            (ChangelogIndex._key(m.group(1).decode("utf-8")), m.start())
+            for m in ChangelogIndex.RELEASE_HEADER.finditer(data, start, end)
+        ]
+
+    @staticmethod
+    def _header_at(data: bytes, offset: int, key: str) -> bool:
+        match = ChangelogIndex.RELEASE_HEADER.match(data, offset)
+        return match is not None and ChangelogIndex._key(match.group(1).decode("utf-8")) == key
+
+    @staticmethod
+    def _to_index(changelog_path: Path, headers: List[Tuple[str, int]], size: int) -> Dict[str, Any]:
+        entries: Dict[str, Tuple[int, int]] = {}
+        for i, (key, offset) in enumerate(headers):
+            end = headers[i + 1][1] if i + 1 < len(headers) else size
+            entries.setdefault(key, (offset, end - offset))
+        return {"size": size, "mtime_ns": changelog_path.stat().st_mtime_ns, "entries": entries}
+
+    @staticmethod
+    def _write(changelog_path: Path, index: Dict[str, Any]) -> None:
+        lines = [f"{ChangelogIndex.MAGIC} {ChangelogIndex.FORMAT_VERSION} {index['size']} {index['mtime_ns']}"]
+        lines.extend(f"{key} {offset} {length}" for key, (offset, length) in index["entries"].items())
+        index_path = ChangelogIndex.index_path(changelog_path)
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(index_path)
+
+    @staticmethod
+    def _read_header(data: bytes) -> Optional[Tuple[int, int]]:
+        """Return (size, mtime_ns) from the index's first line, or None if unrecognised."""
+        parts = data[:data.find(b"\n")].split()
+        if len(parts) != 4 or parts[0].decode() != ChangelogIndex.MAGIC or int(parts[1]) != ChangelogIndex.FORMAT_VERSION:
+            return None
+        return int(parts[2]), int(parts[3])
+
+    @staticmethod
+    def build(changelog_path: Path) -> Dict[str, Any]:
+        """Scan the whole changelog and write its index."""
+        data = changelog_path.read_bytes()
+        index = ChangelogIndex._to_index(changelog_path, ChangelogIndex.scan(data), len(data))
+        ChangelogIndex._write(changelog_path, index)
+        return index
+
+    @staticmethod
+    def update(changelog_path: Path) -> Dict[str, Any]:
+        """
+        Refresh the index after new releases were prepended.
+
+        Previously indexed sections are expected to have shifted by the growth
+        in file size; if every old header is found at its shifted offset, only
+        the new head of the file is scanned. Otherwise the index is rebuilt.
+        """
+        old = ChangelogIndex.read(changelog_path)
+        if old is None or not old["entries"]:
+            return ChangelogIndex.build(changelog_path)
+
+        data = changelog_path.read_bytes()
+        delta = len(data) - old["size"]
+        old_headers = sorted((offset, key) for key, (offset, _) in old["entries"].items())
+        if delta < 0 or not all(ChangelogIndex._header_at(data, offset + delta, key) for offset, key in old_headers):
+            return ChangelogIndex.build(changelog_path)
+
+        first_old = old_headers[0][0] + delta
+        headers = ChangelogIndex.scan(data, 0, first_old) + [(key, offset + delta) for offset, key in old_headers]
+        index = ChangelogIndex._to_index(changelog_path, headers, len(data))
+        ChangelogIndex._write(changelog_path, index)
+        return index
+
+    @staticmethod
+    def read(changelog_path: Path) -> Optional[Dict[str, Any]]:
+        """Load the whole index (fresh or not), or None if missing or unrecognised."""
+        try:
+            data = ChangelogIndex.index_path(changelog_path).read_bytes()
+        except FileNotFoundError:
+            return None
+        header = ChangelogIndex._read_header(data)
+        if header is None:
+            return None
+        entries = {}
+        for line in data.decode("utf-8").splitlines()[1:]:
+            key, offset, length = line.rsplit(" ", 2)
+            entries[key] = (int(offset), int(length))
+        return {"size": header[0], "mtime_ns": header[1], "entries": entries}
+
+    @staticmethod
+    def is_fresh(changelog_path: Path, size: int, mtime_ns: int) -> bool:
+        try:
+            st = changelog_path.stat()
+        except FileNotFoundError:
+            return False
+        return st.st_size == size and st.st_mtime_ns == mtime_ns
+
+    @staticmethod
+    def lookup(changelog_path: Path, version: str) -> Optional[Tuple[int, int]]:
+        """
+        Return (offset, length) of version's section from a fresh index.
+
+        Returns None when the index is missing, stale, or lacks the version.
+        """
+        try:
+            data = ChangelogIndex.index_path(changelog_path).read_bytes()
+        except FileNotFoundError:
+            return None
+        header = ChangelogIndex._read_header(data)
+        if header is None or not ChangelogIndex.is_fresh(changelog_path, *header):
+            return None
+        needle = f"\n{ChangelogIndex._key(version)} ".encode("utf-8")
+        start = data.find(needle)
+        if start < 0:
+            return None
+        line_end = data.find(b"\n", start + 1)
+        _, offset, length = data[start + 1:line_end if line_end >= 0 else len(data)].rsplit(b" ", 2)
+        return int(offset), int(length)
+
+    @staticmethod
+    def read_span(changelog_path: Path, offset: int, length: int) -> str:
+        """Read length bytes at offset through mmap, without reading the rest of the file."""
+        if length <= 0:
+            return ""
+        with open(changelog_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[offset:offset + length].decode("utf-8")
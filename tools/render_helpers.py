@@ -0,0 +1,413 @@
+"""
+In-process rendering of the arranged PSR templates (CHANGELOG.md.j2, addon.xml.j2).
+
+Builds PSR-shaped changelog contexts from the phase definitions
+(phase-config.json + tools/generate_commits.py) and renders the templates
+through one shared Jinja environment with a filesystem bytecode cache.
+Rendered output is memoized by (template hash, context hash), where the
+template hash covers the template and every template it includes, imports or
+extends, so template regressions surface in milliseconds without a PSR or
+Gitea round-trip.
+
+Requires jinja2 (in the dev dependency group).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import textwrap
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from jinja2 import (
+    FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, TemplateNotFound, TemplateSyntaxError, Undefined, meta,
+)
+from jinja2.loaders import split_template_path
+from jinja2.sandbox import SandboxedEnvironment
+
+from generate_commits import PHASE_COMMITS
+from release_metadata import LONG_TYPE_NAMES, Version
+
+FIXTURE_REPO_ROOT = Path(__file__).parent.parent
+PHASE_CONFIG_PATH = FIXTURE_REPO_ROOT / ".github" / "workflows" / "phase-config.json"
+TEMPLATE_DIR = FIXTURE_REPO_ROOT / "templates"
+CHANGELOG_TEMPLATE = "CHANGELOG.md.j2"
+ADDON_XML_TEMPLATE = "script.module.example/addon.xml.j2"
+
+REPO_OWNER = "brianpatrickreavey"
+REPO_NAME = "psr-templates-fixture"
+BASE_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class SyntheticActor:
+    """Stand-in for git.Actor."""
+    name: str = "PSR Test Harness"
+    email: str = "test-harness@ci.local"
+
+
+@dataclass
+class SyntheticGitCommit:
+    """Stand-in for git.Commit with the attributes PSR templates read."""
+    hexsha: str
+    message: str
+    author: SyntheticActor = field(default_factory=SyntheticActor)
+    committed_datetime: datetime = BASE_DATE
+
+    @property
+    def summary(self) -> str:
+        return self.message.split("\n", 1)[0]
+
+
+@dataclass
+class SyntheticParsedCommit:
+    """Stand-in for PSR's ParsedCommit (conventional parser output)."""
+    bump: int
+    type: str
+    scope: str
+    descriptions: List[str]
+    breaking_descriptions: List[str]
+    commit: SyntheticGitCommit
+    release_notices: Tuple[str, ...] = ()
+    linked_issues: Tuple[str, ...] = ()
+    linked_merge_request: str = ""
+    include_in_changelog: bool = True
+
+    @property
+    def message(self) -> str:
+        return self.commit.message
+
+    @property
+    def hexsha(self) -> str:
+        return self.commit.hexsha
+
+    @property
+    def short_hash(self) -> str:
+        return self.commit.hexsha[:7]
+
+    @property
+    def linked_pull_request(self) -> str:
+        return self.linked_merge_request
+
+    @property
+    def is_merge(self) -> bool:
+        return False
+
+
+@dataclass
+class SyntheticHistory:
+    """Stand-in for PSR's ReleaseHistory."""
+    released: Dict[Version, Dict[str, Any]]
+    unreleased: Dict[str, List[SyntheticParsedCommit]]
+
+
+@dataclass
+class SyntheticChangelogContext:
+    """Stand-in for PSR's ChangelogContext, exposed to templates as ctx/context."""
+    repo_name: str
+    repo_owner: str
+    hvcs_type: str
+    history: SyntheticHistory
+    changelog_mode: str
+    prev_changelog_file: str
+    changelog_insertion_flag: str
+    mask_initial_release: bool
+
+
+def parse_commit_subject(subject: str, index: int) -> SyntheticParsedCommit:
+    """Parse 'type(scope)!: description' the way PSR's conventional parser does."""
+    header, _, description = subject.partition(": ")
+    breaking = header.endswith("!")
+    commit_type = header.rstrip("!")
+    scope = ""
+    if "(" in commit_type and commit_type.endswith(")"):
+        commit_type, scope = commit_type[:-1].split("(", 1)
+    message = f"{subject} (ci-test-run)"
+    hexsha = hashlib.sha1(f"{index}:{message}".encode("utf-8")).hexdigest()
+    bump = 3 if breaking else {"feat": 2, "fix": 1, "perf": 1}.get(commit_type, 0)
+    return SyntheticParsedCommit(
+        bump=bump,
+        type=LONG_TYPE_NAMES.get(commit_type, commit_type),
+        scope=scope,
+        descriptions=[f"{description} (ci-test-run)"],
+        breaking_descriptions=[description] if breaking else [],
+        commit=SyntheticGitCommit(hexsha=hexsha, message=message),
+    )
+
+
+def load_phases(phase_config_path: Path = PHASE_CONFIG_PATH) -> Dict[int, Dict[str, Any]]:
+    """Load phase definitions from phase-config.json keyed by phase number."""
+    config = json.loads(phase_config_path.read_text())
+    return {int(k): v for k, v in config["phases"].items()}
+
+
+def phase_context_spec(phase: int, phase_config_path: Path = PHASE_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Build the plain-data description of the release history after a phase.
+
+    Commits from phases that do not change the version (e.g. docs-only phase 4)
+    roll forward into the next release, as they do in a real PSR run.
+
+    Returns:
+        JSON-serialisable spec accepted by build_context()
+    """
+    phases = load_phases(phase_config_path)
+    releases: List[Dict[str, Any]] = []
+    pending: List[str] = []
+    previous_version: Optional[str] = None
+    for number in sorted(phases):
+        if number > phase:
+            break
+        pending.extend(PHASE_COMMITS[number])
+        version = phases[number]["version"].lstrip("v")
+        if version != previous_version:
+            releases.insert(0, {
+                "version": version,
+                "tagged_date": (BASE_DATE + timedelta(days=number)).isoformat(),
+                "commits": pending,
+            })
+            pending = []
+            previous_version = version
+    return {
+        "releases": releases,
+        "unreleased": pending,
+        "changelog_mode": "init",
+    }
+
+
+def synthetic_history_spec(n_releases: int, news_types: Dict[str, str], commits_per_release: int = 4) -> Dict[str, Any]:
+    """
+    Build a context spec with n_releases releases, newest first.
+
+    Commit types cycle through the news_types keys from [tool.psr-prepare.changelog],
+    so every release carries the sections the Kodi news mapping knows about.
+
+    Returns:
+        JSON-serialisable spec accepted by build_context()
+    """
+    commit_types = sorted(news_types) or ["feat", "fix"]
+    releases = []
+    for i in range(n_releases, 0, -1):
+        releases.append({
+            "version": f"{i // 10000}.{i // 100 % 100}.{i % 100}",
+            "tagged_date": (BASE_DATE + timedelta(hours=i)).isoformat(),
+            "commits": [
+                f"{commit_types[(i + j) % len(commit_types)]}: synthetic change {i}.{j}"
+                for j in range(commits_per_release)
+            ],
+        })
+    return {"releases": releases, "unreleased": [], "changelog_mode": "init"}
+
+
+def build_context(spec: Dict[str, Any]) -> SyntheticChangelogContext:
+    """Turn a context spec into PSR-shaped objects."""
+    index = 0
+    released: Dict[Version, Dict[str, Any]] = {}
+    for release in spec["releases"]:
+        elements: Dict[str, List[SyntheticParsedCommit]] = {}
+        for subject in release["commits"]:
+            parsed = parse_commit_subject(subject, index)
+            elements.setdefault(parsed.type, []).append(parsed)
+            index += 1
+        version = Version.parse(release["version"])
+        released[version] = {
+            "version": version,
+            "tagged_date": datetime.fromisoformat(release["tagged_date"]),
+            "elements": elements,
+            "tagger": SyntheticActor(),
+            "committer": SyntheticActor(),
+        }
+    unreleased: Dict[str, List[SyntheticParsedCommit]] = {}
+    for subject in spec["unreleased"]:
+        parsed = parse_commit_subject(subject, index)
+        unreleased.setdefault(parsed.type, []).append(parsed)
+        index += 1
+    return SyntheticChangelogContext(
+        repo_name=REPO_NAME,
+        repo_owner=REPO_OWNER,
+        hvcs_type="github",
+        history=SyntheticHistory(released=released, unreleased=unreleased),
+        changelog_mode=spec["changelog_mode"],
+        prev_changelog_file="CHANGELOG.md",
+        changelog_insertion_flag="<!-- version list -->",
+        mask_initial_release=False,
+    )
+
+
+def psr_filters() -> Dict[str, Any]:
+    """Deterministic versions of the filters PSR binds into the template environment."""
+    repo_url = f"https://github.com/{REPO_OWNER}/{REPO_NAME}"
+
+    def read_file(filepath: str) -> str:
+        path = FIXTURE_REPO_ROOT / filepath
+        return path.read_text() if path.is_file() else ""
+
+    return {
+        "autofit_text_width": lambda text, maxwidth=100, indent_size=0: textwrap.fill(
+            text, width=maxwidth, subsequent_indent=" " * indent_size
+        ),
+        "sort_numerically": lambda items, reverse=False: sorted(items, reverse=reverse),
+        "read_file": read_file,
+        "convert_md_to_rst": lambda text: text,
+        "format_w_official_vcs_name": lambda text: text.replace("%s", "GitHub"),
+        "create_server_url": lambda path, *args, **kwargs: f"https://github.com/{path.lstrip('/')}",
+        "create_repo_url": lambda path, *args, **kwargs: f"{repo_url}/{path.lstrip('/')}",
+        "commit_hash_url": lambda sha: f"{repo_url}/commit/{sha}",
+        "compare_url": lambda from_rev, to_rev: f"{repo_url}/compare/{from_rev}...{to_rev}",
+        "issue_url": lambda number: f"{repo_url}/issues/{str(number).lstrip('#')}",
+        "merge_request_url": lambda number: f"{repo_url}/pull/{str(number).lstrip('#')}",
+        "pull_request_url": lambda number: f"{repo_url}/pull/{str(number).lstrip('#')}",
+    }
+
+
+def hash_spec(spec: Dict[str, Any]) -> str:
+    """Content hash of a context spec (key order independent)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TemplateRenderEngine:
+    """
+    Renders templates from one directory through a shared, bytecode-cached environment.
+
+    Results are memoized by (template sources hash, context spec hash), so
+    re-rendering an unchanged template against an unchanged context is a
+    dictionary lookup. The sources hash covers the template and everything
+    it includes, imports or extends, so editing a partial invalidates the
+    templates that pull it in.
+    """
+
+    def __init__(self, template_dir: Path, bytecode_cache_dir: Optional[Path] = None, strict: bool = False):
+        self.template_dir = Path(template_dir)
+        if bytecode_cache_dir is None:
+            bytecode_cache_dir = Path(os.environ.get(
+                "PSR_FIXTURE_JINJA_CACHE", Path(tempfile.gettempdir()) / "psr-fixture-jinja-cache"
+            ))
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        # Mirrors PSR's changelog environment defaults
+        self.environment = SandboxedEnvironment(
+            loader=FileSystemLoader(str(self.template_dir)),
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_cache_dir)),
+            undefined=StrictUndefined if strict else Undefined,
+            trim_blocks=False,
+            lstrip_blocks=False,
+            keep_trailing_newline=False,
+            autoescape=False,
+        )
+        self.environment.filters.update(psr_filters())
+        self._memo: Dict[Tuple[str, str], str] = {}
+        self._template_hashes: Dict[str, str] = {}
+        self._nodes: Dict[str, Tuple[Optional[Tuple[int, int]], str, Set[Optional[str]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _stamp(self, template_name: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the file the loader would load, or None if there is none."""
+        pieces = split_template_path(template_name)
+        for search_path in self.environment.loader.searchpath:
+            try:
+                st = os.stat(os.path.join(search_path, *pieces))
+            except OSError:
+                continue
+            return st.st_mtime_ns, st.st_size
+        return None
+
+    def _reference_node(self, template_name: str) -> Tuple[str, Set[Optional[str]]]:
+        """
+        Source digest and referenced template names of one template.
+
+        Cached per template and re-read (and re-parsed) only when its file's
+        mtime or size changes, so a memo hit costs one stat per template.
+        """
+        stamp = self._stamp(template_name)
+        cached = self._nodes.get(template_name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        if stamp is None:
+            # e.g. {% include "x" ignore missing %}; it counts if it appears later
+            digest, references = "", set()
+        else:
+            source, _, _ = self.environment.loader.get_source(self.environment, template_name)
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            try:
+                references = set(meta.find_referenced_templates(self.environment.parse(source)))
+            except TemplateSyntaxError:
+                # The render reports the error; the source alone keys the memo meanwhile
+                references = set()
+        self._nodes[template_name] = (stamp, digest, references)
+        return digest, references
+
+    def template_hash(self, template_name: str) -> str:
+        """
+        Hash the current sources of a template and every template it includes, imports or extends.
+
+        A dynamic reference (e.g. {% include name_var %}) could load anything,
+        so it pulls in every template in the directory.
+        """
+        if self._stamp(template_name) is None:
+            raise TemplateNotFound(template_name)
+        digests: Dict[str, str] = {}
+        pending = [template_name]
+        while pending:
+            name = pending.pop()
+            if name in digests:
+                continue
+            digests[name], references = self._reference_node(name)
+            if None in references:
+                references = set(self.environment.loader.list_templates())
+            pending.extend(references - digests.keys())
+        digest = hashlib.sha256()
+        for name, source_digest in sorted(digests.items()):
+            digest.update(f"{name}\0{source_digest}\0".encode("utf-8"))
+        return digest.hexdigest()
+
+    def render(self, template_name: str, spec: Dict[str, Any]) -> str:
+        """
+        Render a template against a context spec.
+
+        Args:
+            template_name: Path relative to template_dir (e.g. "CHANGELOG.md.j2")
+            spec: Context spec from phase_context_spec() or equivalent
+
+        Returns:
+            Rendered text
+        """
+        template_hash = self.template_hash(template_name)
+        key = (template_hash, hash_spec(spec))
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        self.misses += 1
+
+        # Jinja only reloads on mtime change; force it when the content changed
+        if self._template_hashes.get(template_name, template_hash) != template_hash:
+            self.environment.cache.clear()
+        self._template_hashes[template_name] = template_hash
+
+        rendered = self.render_context(template_name, build_context(spec))
+        self._memo[key] = rendered
+        return rendered
+
+    def render_context(self, template_name: str, ctx: SyntheticChangelogContext) -> str:
+        """Render a prebuilt context directly, bypassing the memo (used for benchmarks)."""
+        template = self.environment.get_template(template_name)
+        return template.render(ctx=ctx, context=ctx)
+
+    def clear(self) -> None:
+        """Drop memoized renders (the bytecode cache is kept)."""
+        self._memo.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_ENGINES: Dict[Tuple[str, bool], TemplateRenderEngine] = {}
+
+
+def get_engine(template_dir: Path = TEMPLATE_DIR, strict: bool = False) -> TemplateRenderEngine:
+    """Return the process-wide engine for a template directory."""
+    key = (str(Path(template_dir).resolve()), strict)
+    if key not in _ENGINES:
+        _ENGINES[key] = TemplateRenderEngine(template_dir, strict=strict)
+    return _ENGINES[key]
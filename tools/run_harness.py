@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Run the 5-phase PSR harness locally without act, Docker or a git server.
+
+Performs the same sequence as .github/workflows/test-harness.yml in one
+process, against a local bare repository used as a file:// remote:
+
+  setup     mirror the fixture repo into <work>/remote.git, drop stale tags and
+            ci/* branches, create ci/<run_id> from main
+  phase N   fresh worktree of ci/<run_id> -> generate commits -> push ->
+            psr-prepare -> PSR version (changelog, commit, tag) -> zip the
+            addon -> collect rendered templates -> validate against
+            phase-config.json
+
+Every phase uses the current interpreter's environment (psr-prepare and
+semantic-release are looked up next to sys.executable first), instead of
+re-running install-uv / setup-venv / install-dev-dependencies per phase. With
+--venv, that environment is restored from a venv_snapshot.py snapshot (built
+once on a miss) and used instead.
+
+Usage:
+  run_harness.py [--phases 1-5] [--work-dir DIR] [--run-id ID]
+                 [--prepare-cmd CMD] [--release-cmd CMD] [--venv DIR] [--record | --replay]
+                 [--post-tests] [--budgets FILE | --no-budgets] [--json FILE]
+
+Options:
+  --phases SPEC       Phases to run, e.g. 1-5 or 1,2,3 (default: all in phase-config.json)
+  --work-dir DIR      Working directory (default: a fresh temp dir)
+  --run-id ID         Branch suffix for ci/<run_id> (default: local-<timestamp>)
+  --prepare-cmd CMD   Template arrangement command (default: psr-prepare)
+  --release-cmd CMD   PSR command (default: semantic-release)
+  --venv DIR          Restore (or build) the snapshotted dev venv at DIR and run tools from it
+  --record            Capture each phase's PSR inputs/outputs into the psr_replay.py store
+  --replay            Apply recorded PSR outputs instead of running PSR when inputs match
+                      (phases without a recording run PSR and are recorded)
+  --post-tests        Run tests/integration/post_psr in the final worktree
+  --budgets FILE      Per-phase step budgets (default: .github/workflows/phase-budgets.json);
+                      a step over budget fails its phase, see phase_budget.py
+  --no-budgets        Measure steps but do not enforce budgets
+  --json FILE         Write per-phase results as JSON
+"""
+
+import argparse
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHASE_CONFIG_PATH = REPO_ROOT / ".github" / "workflows" / "phase-config.json"
+
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from generate_commits import create_phase_commits  # noqa: E402
+from phase_budget import BUDGETS_PATH, ResourceMeter, budget_for, budget_report, load_budgets, violations  # noqa: E402
+from psr_replay import PhaseInputs, ReplayStore, capture_inputs  # noqa: E402
+from release_metadata import AddonXmlParser, ChangelogParser, PyprojectConfig  # noqa: E402
+from venv_snapshot import VenvSnapshots  # noqa: E402
+
+
+@dataclass
+class PhaseResult:
+    """Outcome of one harness phase."""
+    phase: int
+    expected_version: str
+    tag: Optional[str] = None
+    replayed: bool = False
+    steps: Dict[str, float] = field(default_factory=dict)  # step name -> seconds
+    resources: Dict[str, Dict[str, float]] = field(default_factory=dict)  # step name -> Usage.as_dict()
+    artifacts: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class HarnessError(RuntimeError):
+    """A harness step failed."""
+
+
+def run(cmd: List[str], cwd: Path, env: Optional[Dict[str, str]] = None) -> str:
+    """Run a command, raising HarnessError with its output on failure."""
+    result = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise HarnessError(f"{' '.join(cmd)} failed ({result.returncode}):\n{result.stdout}{result.stderr}")
+    return result.stdout.strip()
+
+
+def git(*args: str, cwd: Path) -> str:
+    return run(["git"] + list(args), cwd=cwd)
+
+
+def parse_phases(spec: Optional[str], available: List[int]) -> List[int]:
+    """Parse '1-5' or '1,3,5' into phase numbers, defaulting to every configured phase."""
+    if not spec:
+        return available
+    phases: List[int] = []
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = part.split("-", 1)
+            phases.extend(range(int(start), int(end) + 1))
+        else:
+            phases.append(int(part))
+    unknown = sorted(set(phases) - set(available))
+    if unknown:
+        raise HarnessError(f"Unknown phases {unknown}; phase-config.json defines {available}")
+    return phases
+
+
+def build_addon_zip(worktree: Path, kodi_directory: str, project_name: str, version: str, out_dir: Path) -> Path:
+    """Zip the addon directory like build-kodi-zip (`zip -r <name>-<version>.zip <dir>`)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    zip_path = out_dir / f"{project_name}-{version}.zip"
+    addon_root = worktree / kodi_directory
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(addon_root, kodi_directory)
+        for path in sorted(addon_root.rglob("*")):
+            if "__pycache__" in path.parts:
+                continue
+            zf.write(path, path.relative_to(worktree).as_posix())
+    return zip_path
+
+
+class HarnessRunner:
+    """
+    Drives the phase sequence against a file:// remote.
+
+    Args:
+        source_repo: Fixture repository to mirror
+        work_dir: Directory for remote.git, the main clone, worktrees and artifacts
+        run_id: Suffix for the ci/<run_id> branch
+        prepare_cmd: Template arrangement command
+        release_cmd: PSR command (invoked as `<cmd> version ...`)
+        bin_dir: Environment whose tools are used for every phase (default: the current interpreter's)
+        replay_store: Record PSR outputs into this store
+        replay: Apply matching recordings from replay_store instead of running PSR
+        budgets: Parsed phase-budgets.json; a step over its limits fails the phase
+    """
+
+    def __init__(self, source_repo: Path, work_dir: Path, run_id: str,
+                 prepare_cmd: str = "psr-prepare", release_cmd: str = "semantic-release",
+                 bin_dir: Optional[Path] = None, replay_store: Optional[ReplayStore] = None,
+                 replay: bool = False, budgets: Optional[dict] = None):
+        self.source_repo = source_repo
+        self.work_dir = work_dir
+        self.branch = f"ci/{run_id}"
+        self.remote = work_dir / "remote.git"
+        self.clone = work_dir / "clone"
+        self.artifacts = work_dir / "artifacts"
+        self.phase_config = json.loads((source_repo / PHASE_CONFIG_PATH.relative_to(REPO_ROOT)).read_text())["phases"]
+        arranger = PyprojectConfig.load(source_repo / "pyproject.toml").get("tool", {}).get("arranger", {})
+        self.kodi_directory = arranger.get("kodi-addon-directory")
+
+        # One shared environment: prefer tools installed next to this interpreter
+        self.bin_dir = bin_dir or Path(sys.executable).parent
+        self.python = str(bin_dir / "python") if bin_dir else sys.executable
+        self.env = dict(os.environ)
+        self.env["PATH"] = os.pathsep.join([str(self.bin_dir), self.env.get("PATH", "")])
+        self.prepare_cmd = shlex.split(prepare_cmd)
+        self.release_cmd = shlex.split(release_cmd)
+        self.replay_store = replay_store
+        self.replay = replay
+        self.budgets = budgets or {}
+
+    @property
+    def available_phases(self) -> List[int]:
+        return sorted(int(k) for k in self.phase_config)
+
+    def setup(self) -> None:
+        """Create the file:// remote and the ci branch (mirrors the workflow's setup job)."""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        git("clone", "--quiet", "--mirror", str(self.source_repo), str(self.remote), cwd=self.work_dir)
+        git("remote", "remove", "origin", cwd=self.remote)
+        stale = git("for-each-ref", "--format=%(refname)", "refs/tags/", "refs/heads/ci/", cwd=self.remote)
+        for ref in stale.splitlines():
+            git("update-ref", "-d", ref, cwd=self.remote)
+
+        git("clone", "--quiet", f"file://{self.remote}", str(self.clone), cwd=self.work_dir)
+        self._configure_identity(self.clone, "CI Setup", "setup@ci.local")
+        git("checkout", "--quiet", "-b", self.branch, "origin/main", cwd=self.clone)
+        git("push", "--quiet", "-u", "origin", self.branch, cwd=self.clone)
+        # Free the branch so phase worktrees can check it out
+        git("checkout", "--quiet", "--detach", cwd=self.clone)
+
+    def _configure_identity(self, path: Path, name: str, email: str) -> None:
+        git("config", "user.name", name, cwd=path)
+        git("config", "user.email", email, cwd=path)
+
+    def run_phase(self, phase: int) -> PhaseResult:
+        """Run one phase in a fresh worktree of the ci branch."""
+        config = self.phase_config[str(phase)]
+        result = PhaseResult(phase=phase, expected_version=config["version"])
+        worktree = self.work_dir / f"phase-{phase}"
+        phase_env = dict(self.env, HARNESS_PHASE=str(phase), HARNESS_PHASE_VERSION=config["version"])
+
+        def step(name, func):
+            meter = ResourceMeter()
+            try:
+                with meter:
+                    value = func()
+            finally:
+                result.steps[name] = meter.usage.wall_s
+                result.resources[name] = meter.usage.as_dict()
+            self._check_budget(phase, name, meter.usage)
+            return value
+
+        try:
+            def checkout():
+                git("fetch", "--quiet", "--tags", "--force", "origin", cwd=self.clone)
+                git("worktree", "add", "--quiet", "--detach", str(worktree), f"origin/{self.branch}", cwd=self.clone)
+                git("checkout", "--quiet", "-B", self.branch, f"origin/{self.branch}", cwd=worktree)
+                git("branch", "--quiet", f"--set-upstream-to=origin/{self.branch}", cwd=worktree)
+            step("checkout", checkout)
+
+            def generate():
+                self._configure_identity(worktree, "PSR Test Harness", "test-harness@ci.local")
+                create_phase_commits(phase, worktree)
+                git("push", "--quiet", "origin", f"HEAD:{self.branch}", cwd=worktree)
+            step("generate_commits", generate)
+
+            step("prepare", lambda: run(self.prepare_cmd, cwd=worktree, env=phase_env))
+
+            inputs = capture_inputs(worktree, phase) if self.replay_store else None
+            outputs = self.replay_store.replay(inputs, worktree) if self.replay else None
+            if outputs is not None:
+                step("psr", lambda: self._apply_replay(worktree, outputs))
+                result.replayed = True
+            else:
+                pre_release = git("rev-parse", "HEAD", cwd=worktree)
+                force = [f"--{config['force']}"] if config.get("force") else []
+                step("psr", lambda: run(
+                    self.release_cmd + ["version"] + force + ["--changelog", "--commit", "--tag", "--no-vcs-release"],
+                    cwd=worktree, env=phase_env,
+                ))
+            result.tag = self._latest_tag(worktree)
+            if inputs is not None and not result.replayed:
+                step("record", lambda: self._record(worktree, inputs, pre_release, result.tag))
+
+            step("zip", lambda: self._collect_artifacts(worktree, result))
+            step("validate", lambda: self._validate(worktree, result))
+        except HarnessError as e:
+            result.errors.append(str(e))
+        finally:
+            if worktree.exists():
+                # Detach so the next phase's worktree can take the branch
+                subprocess.run(["git", "checkout", "--quiet", "--detach"], cwd=worktree, capture_output=True)
+        return result
+
+    def _check_budget(self, phase: int, step: str, usage) -> None:
+        limits = budget_for(self.budgets, phase, step)
+        if violations(usage, limits):
+            raise HarnessError(budget_report(phase, step, usage, limits))
+
+    def _record(self, worktree: Path, inputs: PhaseInputs, pre_release: str, tag: Optional[str]) -> None:
+        """Store what PSR changed: files touched by its release commit, the tag and commit message."""
+        released = git("rev-parse", "HEAD", cwd=worktree) != pre_release
+        files = git("diff", "--name-only", pre_release, "HEAD", cwd=worktree).splitlines() if released else []
+        message = git("log", "-1", "--format=%B", cwd=worktree) if released else None
+        self.replay_store.record(inputs, worktree, files, tag, tag.lstrip("v") if tag else None, message)
+
+    def _apply_replay(self, worktree: Path, outputs: dict) -> None:
+        """Commit, tag and push recorded outputs the way `semantic-release version` would."""
+        if outputs["commit_message"] is None:
+            return
+        git("add", "--", *outputs["files"], cwd=worktree)
+        git("commit", "--quiet", "-m", outputs["commit_message"], cwd=worktree)
+        refs = [f"HEAD:{self.branch}"]
+        if outputs["tag"]:
+            git("tag", outputs["tag"], cwd=worktree)
+            refs.append(outputs["tag"])
+        git("push", "--quiet", "origin", *refs, cwd=worktree)
+
+    def _latest_tag(self, worktree: Path) -> Optional[str]:
+        described = subprocess.run(["git", "describe", "--tags", "--abbrev=0"],
+                                   cwd=worktree, capture_output=True, text=True)
+        if described.returncode != 0:
+            return None
+        return described.stdout.strip() or None
+
+    def _collect_artifacts(self, worktree: Path, result: PhaseResult) -> None:
+        out_dir = self.artifacts / f"phase-{result.phase}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        version = (result.tag or result.expected_version).lstrip("v")
+        if self.kodi_directory:
+            zip_path = build_addon_zip(worktree, self.kodi_directory, self.kodi_directory, version, out_dir)
+            result.artifacts.append(str(zip_path))
+            rendered = [worktree / "CHANGELOG.md", worktree / self.kodi_directory / "addon.xml"]
+        else:
+            rendered = [worktree / "CHANGELOG.md"]
+        for path in rendered:
+            if path.exists():
+                target = out_dir / path.name
+                shutil.copyfile(path, target)
+                result.artifacts.append(str(target))
+
+    def _validate(self, worktree: Path, result: PhaseResult) -> None:
+        if result.tag != result.expected_version:
+            result.errors.append(f"latest tag {result.tag} != phase-config version {result.expected_version}")
+        expected = result.expected_version.lstrip("v")
+
+        changelog = worktree / "CHANGELOG.md"
+        if not changelog.exists():
+            result.errors.append("CHANGELOG.md was not rendered")
+        else:
+            releases = ChangelogParser.parse(changelog)
+            if not ChangelogParser.validate_release_exists(releases, expected):
+                result.errors.append(f"CHANGELOG.md has no {expected} section")
+            is_descending, violations = ChangelogParser.validate_descending(releases)
+            if not is_descending:
+                result.errors.append(f"CHANGELOG.md releases out of order: {violations}")
+
+        if self.kodi_directory:
+            addon_xml = worktree / self.kodi_directory / "addon.xml"
+            addon_info = AddonXmlParser.parse(addon_xml)
+            if not AddonXmlParser.validate_version(addon_info, expected):
+                result.errors.append(f"addon.xml version {addon_info.version} != {expected}")
+
+    def run_post_tests(self, phase: int) -> int:
+        """Run the post-PSR suite in the given phase's worktree, under the phase's "tests" budget."""
+        with ResourceMeter() as meter:
+            returncode = subprocess.run(
+                [self.python, "-m", "pytest", "tests/integration/post_psr/", "-q"],
+                cwd=self.work_dir / f"phase-{phase}", env=dict(self.env, PSR_VALIDATE_REAL="0"),
+            ).returncode
+        try:
+            self._check_budget(phase, "tests", meter.usage)
+        except HarnessError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return returncode or 1
+        return returncode
+
+    def run(self, phases: List[int]) -> List[PhaseResult]:
+        """Run setup and then each phase in order, stopping at the first failure."""
+        self.setup()
+        results = []
+        for phase in phases:
+            result = self.run_phase(phase)
+            results.append(result)
+            if not result.ok:
+                break
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the PSR harness phases locally against a file:// remote")
+    parser.add_argument("--phases")
+    parser.add_argument("--work-dir", type=Path)
+    parser.add_argument("--run-id", default=f"local-{time.strftime('%Y%m%d-%H%M%S')}")
+    parser.add_argument("--prepare-cmd", default="psr-prepare")
+    parser.add_argument("--release-cmd", default="semantic-release")
+    parser.add_argument("--venv", type=Path)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true")
+    mode.add_argument("--replay", action="store_true")
+    parser.add_argument("--post-tests", action="store_true")
+    budgets = parser.add_mutually_exclusive_group()
+    budgets.add_argument("--budgets", type=Path, default=BUDGETS_PATH)
+    budgets.add_argument("--no-budgets", action="store_true")
+    parser.add_argument("--json", type=Path, dest="json_path")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="psr-harness-"))
+    bin_dir = None
+    if args.venv:
+        started = time.perf_counter()
+        outcome = VenvSnapshots().ensure(args.venv)
+        print(f"Environment {args.venv}: {outcome} in {time.perf_counter() - started:.2f}s")
+        bin_dir = args.venv / "bin"
+    replay_store = ReplayStore() if args.record or args.replay else None
+    try:
+        budgets = {} if args.no_budgets else load_budgets(args.budgets)
+    except (ValueError, json.JSONDecodeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    runner = HarnessRunner(REPO_ROOT, work_dir, args.run_id, args.prepare_cmd, args.release_cmd, bin_dir,
+                           replay_store, args.replay, budgets)
+    for command in (runner.prepare_cmd[0], runner.release_cmd[0]):
+        if shutil.which(command, path=runner.env["PATH"]) is None:
+            print(f"ERROR: '{command}' not found; install the dev dependencies (uv sync) first", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        phases = parse_phases(args.phases, runner.available_phases)
+        started = time.perf_counter()
+        results = runner.run(phases)
+    except HarnessError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for result in results:
+        timings = " ".join(f"{name}={seconds:.2f}s" for name, seconds in result.steps.items())
+        print(f"Phase {result.phase}: tag={result.tag} expected={result.expected_version} "
+              f"{'ok' if result.ok else 'FAILED'}{' (replayed)' if result.replayed else ''}  {timings}")
+        for error in result.errors:
+            print(f"  - {error}")
+    print(f"Total: {time.perf_counter() - started:.1f}s (work dir: {work_dir})")
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+    failed = len(results) < len(phases) or not all(r.ok for r in results)
+    if not failed and args.post_tests:
+        failed = runner.run_post_tests(results[-1].phase) != 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
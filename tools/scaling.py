@@ -0,0 +1,78 @@
+"""
+Growth-curve timing: how the run time of a callable scales with input size.
+
+Used by the scaling tests and by bench_changelog_render.py.
+"""
+
+import gc
+import math
+import time
+from typing import Any, Callable, List, Sequence, Tuple
+
+
+class ScalingBenchmark:
+    """Measures how the run time of a callable grows with its input size."""
+
+    @staticmethod
+    def time_call(func: Callable[[Any], Any], arg: Any, repeat: int = 5) -> float:
+        """
+        Time a single-argument call, keeping the best of several runs.
+
+        The garbage collector is paused while timing so collection pauses
+        do not show up as growth in the curve.
+
+        Returns:
+            Fastest observed wall time in seconds
+        """
+        best = math.inf
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(arg)
+                best = min(best, time.perf_counter() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return best
+
+    @staticmethod
+    def measure(
+        func: Callable[[Any], Any],
+        make_input: Callable[[int], Any],
+        sizes: Sequence[int],
+        repeat: int = 5,
+    ) -> List[Tuple[int, float]]:
+        """
+        Time func over inputs built by make_input for each size.
+
+        Args:
+            func: Callable under test
+            make_input: Builds the input for a given size
+            sizes: Input sizes, typically doubling (e.g. 256, 512, 1024)
+            repeat: Runs per size, best one is kept
+
+        Returns:
+            List of (size, seconds) samples
+        """
+        samples = []
+        for size in sizes:
+            arg = make_input(size)
+            samples.append((size, ScalingBenchmark.time_call(func, arg, repeat)))
+        return samples
+
+    @staticmethod
+    def fit_exponent(samples: Sequence[Tuple[int, float]]) -> float:
+        """
+        Fit time ~ size**k by least squares on the log-log samples.
+
+        Returns:
+            The exponent k (about 1.0 for linear, 2.0 for quadratic)
+        """
+        points = [(math.log(size), math.log(max(seconds, 1e-9))) for size, seconds in samples]
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        return covariance / variance
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Validate Kodi addon.xml files in bulk with AddonXmlValidator.
+
+Accepts addon.xml files, directories (searched recursively for addon.xml and
+addon zips) and addon zips (their <addon_id>/addon.xml is read in memory).
+Every document is checked in a single event-driven pass; nothing is
+extracted to disk.
+
+Usage:
+  validate_addon_xml.py [--quiet] PATH [PATH ...]
+
+Options:
+  --quiet       Only print the summary line
+"""
+
+import argparse
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import AddonXmlValidator  # noqa: E402
+
+
+def read_zip_addon_xml(zip_path: Path) -> bytes:
+    """Return the top-level <addon_id>/addon.xml from an addon zip."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in zf.namelist():
+            if name.count("/") == 1 and name.endswith("/addon.xml"):
+                return zf.read(name)
+    raise ValueError(f"No <addon_id>/addon.xml found in {zip_path}")
+
+
+def iter_documents(paths, read_errors: Dict[str, List[str]]) -> Iterator[Tuple[str, bytes]]:
+    """Yield (display name, raw bytes) for every addon.xml reachable from paths; unreadable zips go to read_errors."""
+    for path in paths:
+        if path.is_dir():
+            for found in sorted(path.rglob("*")):
+                if found.name == "addon.xml" or found.suffix == ".zip":
+                    yield from iter_documents([found], read_errors)
+        elif path.suffix == ".zip":
+            try:
+                yield str(path), read_zip_addon_xml(path)
+            except (ValueError, zipfile.BadZipFile) as e:
+                read_errors[str(path)] = [str(e)]
+        else:
+            yield str(path), path.read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate Kodi addon.xml files in bulk")
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    missing = [str(p) for p in args.paths if not p.exists()]
+    if missing:
+        print(f"ERROR: not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    count = 0
+    read_errors: Dict[str, List[str]] = {}
+
+    def counted():
+        nonlocal count
+        for document in iter_documents(args.paths, read_errors):
+            count += 1
+            yield document
+
+    started = time.perf_counter()
+    failures = AddonXmlValidator.validate_many(counted())
+    elapsed = time.perf_counter() - started
+    failures.update(read_errors)
+    count += len(read_errors)
+
+    if not args.quiet:
+        for name, errors in failures.items():
+            print(name)
+            for error in errors:
+                print(f"  {error}")
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} addon.xml checked, {len(failures)} invalid ({rate:,.0f}/s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
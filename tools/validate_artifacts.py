@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Validate rendered CHANGELOG.md and addon.xml files in a process pool without
+copying their bytes to the workers.
+
+Files on disk are handed over by path and each worker mmaps them; documents
+that only exist in memory (addon.xml read from an addon zip) are packed once
+into a single multiprocessing.shared_memory block. A task is then just
+(source, kind, offset, length), and workers parse memoryview slices of the
+mapping directly: ChangelogParser.release_spans() for changelogs,
+AddonXmlValidator.validate() (expat reads the buffer) for addon.xml.
+
+Results come back compact: error strings plus (version, header, body, end)
+byte offsets per release, never raw_content/raw_xml copies, so the pickled
+traffic per document stays the same size however large the document is.
+ArtifactBatch.releases() / addon_info() materialize the usual ReleaseInfo /
+AddonXmlInfo from the parent's own mapping when a caller needs them.
+
+Changelog checks: at least one release, parseable versions, no duplicate
+versions, strictly descending order, no unrendered Jinja ({{ / {% / {#}.
+
+`bench` compares this against pickling the bytes to the workers and the
+parsed ReleaseInfo lists back, over growing changelog sizes.
+
+Usage:
+  validate_artifacts.py [--workers N] [--quiet] PATH [PATH ...]
+  validate_artifacts.py --bench [--sizes MB,...] [--documents N] [--workers N]
+
+Options:
+  --workers N     Worker processes (default: CPU count; 0 validates in-process)
+  --quiet         Only print the summary line
+  --bench         Run the copy vs shared-memory comparison
+  --sizes MB,...  Changelog sizes for --bench (default: 0.25,1,4)
+  --documents N   Changelogs per size for --bench (default: 8)
+"""
+
+import argparse
+import mmap
+import os
+import pickle
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import (  # noqa: E402
+    AddonXmlInfo, AddonXmlParser, AddonXmlValidator, ChangelogParser, ReleaseInfo, Version,
+)
+from validate_addon_xml import read_zip_addon_xml  # noqa: E402
+
+CHANGELOG = "changelog"
+ADDON_XML = "addon.xml"
+UNRENDERED = re.compile(rb"\{[{%#]")
+
+# (source, kind, offset, length); source is "file:<path>" or "shm:<segment name>"
+Task = Tuple[str, str, int, int]
+# version, header offset, body offset, end offset
+Span = Tuple[str, int, int, int]
+
+
+@dataclass
+class ValidationResult:
+    """Outcome for one document; spans index into the document's own bytes."""
+    name: str
+    kind: str
+    errors: List[str] = field(default_factory=list)
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def kind_of(path: Path) -> Optional[str]:
+    if path.name == "addon.xml":
+        return ADDON_XML
+    if path.suffix.lower() == ".md":
+        return CHANGELOG
+    return None
+
+
+def check_changelog(view) -> Tuple[List[str], List[Span]]:
+    """Validate changelog bytes (bytes, mmap or memoryview) and return (errors, spans)."""
+    errors = []
+    spans = ChangelogParser.release_spans(view)
+    if not spans:
+        errors.append("no release headers")
+    previous = None
+    seen = set()
+    for version, offset, _, _ in spans:
+        parsed = Version.try_parse(version)
+        if parsed is None:
+            errors.append(f"byte {offset}: unparseable version '{version}'")
+            continue
+        if parsed.sort_key in seen:
+            errors.append(f"byte {offset}: duplicate release {version}")
+        elif previous is not None and not previous[1] > parsed.sort_key:
+            errors.append(f"byte {offset}: {version} listed after {previous[0]}, expected descending order")
+        seen.add(parsed.sort_key)
+        previous = (version, parsed.sort_key)
+    unrendered = UNRENDERED.search(view)
+    if unrendered:
+        errors.append(f"byte {unrendered.start()}: unrendered Jinja2 syntax")
+    return errors, spans
+
+
+def check(kind: str, view) -> Tuple[List[str], List[Span]]:
+    if kind == CHANGELOG:
+        return check_changelog(view)
+    return AddonXmlValidator.validate(view)[1], []
+
+
+# Worker-side mappings, opened on first use and kept for the worker's lifetime
+_ATTACHED: Dict[str, Any] = {}
+
+
+def _attach(source: str):
+    mapping = _ATTACHED.get(source)
+    if mapping is None:
+        scheme, _, target = source.partition(":")
+        if scheme == "shm":
+            mapping = shared_memory.SharedMemory(name=target)
+        else:
+            with open(target, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _ATTACHED[source] = mapping
+    return mapping
+
+
+def _check_task(task: Task) -> Tuple[List[str], List[Span]]:
+    source, kind, offset, length = task
+    mapping = _attach(source)
+    buffer = mapping.buf if isinstance(mapping, shared_memory.SharedMemory) else mapping
+    view = memoryview(buffer)[offset:offset + length]
+    try:
+        return check(kind, view)
+    finally:
+        view.release()
+
+
+class ArtifactBatch:
+    """
+    Validation inputs laid out for zero-copy reads by worker processes.
+
+    Stage documents with add_file() and add_bytes(), then enter the context:
+    that packs in-memory documents into one shared memory block, and leaving
+    it unlinks the block and closes the parent's mappings.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.tasks: List[Task] = []
+        self._pending: List[Tuple[int, bytes]] = []
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    def add_file(self, path: Path, kind: Optional[str] = None) -> None:
+        kind = kind or kind_of(path)
+        if kind is None:
+            raise ValueError(f"cannot tell whether {path} is a changelog or addon.xml")
+        self.names.append(str(path))
+        self.tasks.append((f"file:{os.path.abspath(path)}", kind, 0, path.stat().st_size))
+
+    def add_bytes(self, name: str, data: bytes, kind: str) -> None:
+        self.names.append(name)
+        self.tasks.append(("shm:", kind, 0, len(data)))
+        self._pending.append((len(self.tasks) - 1, data))
+
+    def __enter__(self) -> "ArtifactBatch":
+        total = sum(len(data) for _, data in self._pending)
+        if total:
+            self._shm = shared_memory.SharedMemory(create=True, size=total)
+            source, offset = f"shm:{self._shm.name}", 0
+            for index, data in self._pending:
+                self._shm.buf[offset:offset + len(data)] = data
+                _, kind, _, length = self.tasks[index]
+                self.tasks[index] = (source, kind, offset, length)
+                offset += length
+        self._pending = []
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def view(self, index: int) -> memoryview:
+        """The parent's view of document index (release it before leaving the context)."""
+        source, _, offset, length = self.tasks[index]
+        if not length:
+            return memoryview(b"")
+        if source.startswith("shm:"):
+            return self._shm.buf[offset:offset + length]
+        if source not in self._maps:
+            with open(source[len("file:"):], "rb") as f:
+                self._maps[source] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._maps[source])[offset:offset + length]
+
+    def releases(self, index: int, result: ValidationResult) -> List[ReleaseInfo]:
+        with self.view(index) as view:
+            return [ChangelogParser.release_at(view, span) for span in result.spans]
+
+    def addon_info(self, index: int) -> AddonXmlInfo:
+        with self.view(index) as view:
+            return AddonXmlParser.parse_text(str(view, "utf-8"))
+
+
+def validate(batch: ArtifactBatch, workers: Optional[int] = None) -> List[ValidationResult]:
+    """Validate every document in an entered batch; results are in batch order."""
+    if workers == 0:
+        outcomes = []
+        for index, (_, kind, _, _) in enumerate(batch.tasks):
+            with batch.view(index) as view:
+                outcomes.append(check(kind, view))
+    else:
+        # Empty documents have nothing to map; they still get checked (and fail) inline
+        tasks = [task for task in batch.tasks if task[3]]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            mapped = iter(pool.map(_check_task, tasks, chunksize=max(1, len(tasks) // 64)))
+        outcomes = [next(mapped) if task[3] else check(task[1], b"") for task in batch.tasks]
+    return [ValidationResult(name, task[1], errors, spans)
+            for name, task, (errors, spans) in zip(batch.names, batch.tasks, outcomes)]
+
+
+def collect(paths: List[Path], batch: ArtifactBatch, read_errors: Dict[str, List[str]]) -> None:
+    """Stage every CHANGELOG.md, addon.xml and addon zip reachable from paths."""
+    for path in paths:
+        if path.is_dir():
+            collect([p for p in sorted(path.rglob("*"))
+                     if p.name in ("CHANGELOG.md", "addon.xml") or p.suffix == ".zip"], batch, read_errors)
+        elif path.suffix == ".zip":
+            try:
+                batch.add_bytes(str(path), read_zip_addon_xml(path), ADDON_XML)
+            except (ValueError, zipfile.BadZipFile) as e:
+                read_errors[str(path)] = [str(e)]
+        elif kind_of(path) is None:
+            read_errors[str(path)] = ["not a changelog (.md) or addon.xml"]
+        else:
+            batch.add_file(path)
+
+
+def synthetic_changelog(size: int) -> bytes:
+    """A valid PSR-style changelog of at least size bytes, newest release first."""
+    release = ("## v{v} (2024-01-01)\n\n### Features\n\n" + "- feat: add a feature ([`abcdef0`](url))\n" * 8
+               + "\n### Bug Fixes\n\n" + "- fix: fix a bug ([`0fedcba`](url))\n" * 8 + "\n")
+    count = max(1, size // len(release.format(v="1.0.0")) + 1)
+    parts = ["# CHANGELOG\n\n"]
+    parts.extend(release.format(v=f"{n // 100}.{n % 100}.0") for n in range(count, 0, -1))
+    return "".join(parts).encode("utf-8")
+
+
+def _copy_task(data: bytes) -> Tuple[List[str], List[ReleaseInfo]]:
+    """Baseline worker: decode and fully parse, returning ReleaseInfo objects."""
+    releases = ChangelogParser.parse_text(data.decode("utf-8"))
+    ok, violations = ChangelogParser.validate_descending(releases)
+    return [f"{a} before {b}" for a, b in violations], releases
+
+
+def bench(sizes_mb: List[float], documents: int, workers: Optional[int]) -> List[Dict[str, Any]]:
+    rows = []
+    for size_mb in sizes_mb:
+        payloads = [synthetic_changelog(int(size_mb * 1024 * 1024)) for _ in range(documents)]
+
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            copied = list(pool.map(_copy_task, payloads))
+        copy_s = time.perf_counter() - started
+        copy_ipc = sum(len(pickle.dumps(p)) for p in payloads) + sum(len(pickle.dumps(r)) for r in copied)
+
+        batch = ArtifactBatch()
+        for i, payload in enumerate(payloads):
+            batch.add_bytes(f"CHANGELOG-{i}.md", payload, CHANGELOG)
+        started = time.perf_counter()
+        with batch:
+            results = validate(batch, workers)
+            shared_s = time.perf_counter() - started
+            shared_ipc = (sum(len(pickle.dumps(t)) for t in batch.tasks)
+                          + sum(len(pickle.dumps((r.errors, r.spans))) for r in results))
+        assert all(r.ok for r in results) and all(not errors for errors, _ in copied)
+
+        rows.append({"size_mb": size_mb, "copy_s": copy_s, "shared_s": shared_s,
+                     "copy_ipc": copy_ipc, "shared_ipc": shared_ipc})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate CHANGELOG.md/addon.xml in a process pool via shared memory")
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--sizes", default="0.25,1,4")
+    parser.add_argument("--documents", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.bench:
+        print(f"{'size':>8} {'copy':>9} {'shared':>9} {'copy IPC':>12} {'shared IPC':>12}")
+        for row in bench([float(s) for s in args.sizes.split(",")], args.documents, args.workers):
+            print(f"{row['size_mb']:>6}MB {row['copy_s'] * 1000:>7.0f}ms {row['shared_s'] * 1000:>7.0f}ms "
+                  f"{row['copy_ipc']:>12,} {row['shared_ipc']:>12,}")
+        return
+
+    if not args.paths:
+        parser.error("at least one PATH is required")
+    missing = [str(p) for p in args.paths if not p.exists()]
+    if missing:
+        print(f"ERROR: not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    read_errors: Dict[str, List[str]] = {}
+    started = time.perf_counter()
+    batch = ArtifactBatch()
+    collect(args.paths, batch, read_errors)
+    with batch:
+        results = validate(batch, args.workers)
+    elapsed = time.perf_counter() - started
+
+    failures = {r.name: r.errors for r in results if not r.ok}
+    failures.update(read_errors)
+    if not args.quiet:
+        for name, errors in failures.items():
+            print(name)
+            for error in errors:
+                print(f"  {error}")
+    count = len(results) + len(read_errors)
+    print(f"{count} documents checked, {len(failures)} invalid in {elapsed * 1000:.0f}ms")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
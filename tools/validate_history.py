@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Validate CHANGELOG.md and addon.xml as they were at every release tag.
+
+Instead of checking out each tag, tags are listed once and both files are read
+through a single long-lived `git cat-file` process. Blob ids are resolved
+first (`info <tag>:<path>`), and only blobs not seen before are fetched and
+parsed, so a changelog that stayed identical across tags is parsed once.
+
+At each tag X.Y.Z:
+  - CHANGELOG.md has a section for X.Y.Z and releases are newest-first
+  - addon.xml carries version X.Y.Z
+
+Tags that are not semver (after the tag_format prefix) are skipped.
+
+Usage:
+  validate_history.py [--repo DIR] [--changelog PATH] [--addon-xml PATH] [--json FILE]
+
+Options:
+  --repo DIR         Repository to audit (default: .)
+  --changelog PATH   Changelog path inside the repo (default: CHANGELOG.md)
+  --addon-xml PATH   addon.xml path (default: <kodi-addon-directory>/addon.xml from pyproject.toml)
+  --json FILE        Write per-tag results as JSON
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from release_metadata import AddonXmlParser, ChangelogParser, PyprojectConfig, Version  # noqa: E402
+
+# --batch-command (with separate info/contents requests) arrived in git 2.36
+BATCH_COMMAND_MIN_GIT = (2, 36)
+
+
+@dataclass
+class TagResult:
+    """Validation outcome for one tag."""
+    tag: str
+    version: str
+    changelog_blob: Optional[str] = None
+    addon_xml_blob: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class HistoryReport:
+    """All tag results plus how much parsing was shared."""
+    tags: List[TagResult] = field(default_factory=list)
+    blob_refs: int = 0  # (tag, file) pairs that resolved to a blob
+    blobs_parsed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(not t.errors for t in self.tags)
+
+
+def git_version() -> Tuple[int, ...]:
+    output = subprocess.run(["git", "--version"], capture_output=True, text=True, check=True).stdout
+    match = re.search(r"(\d+)\.(\d+)", output)
+    return tuple(int(x) for x in match.groups()) if match else (0, 0)
+
+
+class CatFile:
+    """
+    One `git cat-file` process serving object lookups for the whole audit.
+
+    Uses --batch-command so blob ids can be resolved without transferring
+    contents; falls back to --batch (contents always sent) on older git.
+    """
+
+    def __init__(self, repo: Path):
+        self.batch_command = git_version() >= BATCH_COMMAND_MIN_GIT
+        mode = "--batch-command" if self.batch_command else "--batch"
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", mode], cwd=repo,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0,
+        )
+        # Contents returned by --batch while resolving, keyed by blob id
+        self._pending: Dict[str, bytes] = {}
+
+    def __enter__(self) -> "CatFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+
+    def _request(self, line: str) -> Optional[Tuple[str, int]]:
+        self.proc.stdin.write(line.encode() + b"\n")
+        header = self.proc.stdout.readline().decode().rstrip("\n")
+        if header.endswith(" missing") or header.endswith(" ambiguous"):
+            return None
+        sha, _, size = header.split(" ")
+        return sha, int(size)
+
+    def _read_body(self, size: int) -> bytes:
+        chunks = []
+        remaining = size + 1  # contents are followed by a newline
+        while remaining:
+            chunk = self.proc.stdout.read(remaining)
+            if not chunk:
+                raise RuntimeError("git cat-file exited mid-object")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)[:-1]
+
+    def resolve(self, spec: str) -> Optional[str]:
+        """Return the object id for a `<rev>:<path>` spec, or None if it doesn't exist."""
+        if self.batch_command:
+            found = self._request(f"info {spec}")
+            return found[0] if found else None
+        found = self._request(spec)
+        if found is None:
+            return None
+        sha, size = found
+        self._pending[sha] = self._read_body(size)
+        return sha
+
+    def contents(self, sha: str) -> bytes:
+        """Return an object's bytes."""
+        if sha in self._pending:
+            return self._pending.pop(sha)
+        found = self._request(f"contents {sha}" if self.batch_command else sha)
+        if found is None:
+            raise KeyError(sha)
+        return self._read_body(found[1])
+
+
+def list_release_tags(repo: Path, tag_prefix: str = "v") -> List[Tuple[str, Version]]:
+    """Return (tag, Version) for every semver tag, oldest version first."""
+    output = subprocess.run(
+        ["git", "for-each-ref", "--format=%(refname:short)", "refs/tags"],
+        cwd=repo, capture_output=True, text=True, check=True,
+    ).stdout
+    tags = []
+    for tag in output.split():
+        if not tag.startswith(tag_prefix):
+            continue
+        version = Version.try_parse(tag[len(tag_prefix):])
+        if version is not None:
+            tags.append((tag, version))
+    return sorted(tags, key=lambda item: item[1].sort_key)
+
+
+def default_addon_xml_path(repo: Path) -> Optional[str]:
+    pyproject = repo / "pyproject.toml"
+    if not pyproject.exists():
+        return None
+    kodi_dir = PyprojectConfig.load(pyproject).get("tool", {}).get("arranger", {}).get("kodi-addon-directory")
+    return f"{kodi_dir}/addon.xml" if kodi_dir else None
+
+
+def validate_history(repo: Path, changelog_path: str = "CHANGELOG.md",
+                     addon_xml_path: Optional[str] = None) -> HistoryReport:
+    """
+    Validate both files at every release tag.
+
+    Args:
+        repo: Repository to audit
+        changelog_path: Changelog path relative to the repo root
+        addon_xml_path: addon.xml path relative to the repo root (None to skip)
+
+    Returns:
+        HistoryReport with one TagResult per tag
+    """
+    started = time.perf_counter()
+    report = HistoryReport()
+    # Per distinct blob: parse outcome, shared by every tag that points at it
+    changelogs: Dict[str, Tuple[Optional[Dict[str, object]], List[str]]] = {}
+    addon_versions: Dict[str, Tuple[Optional[str], List[str]]] = {}
+
+    with CatFile(repo) as cat:
+        for tag, version in list_release_tags(repo):
+            result = TagResult(tag=tag, version=str(version))
+            report.tags.append(result)
+
+            result.changelog_blob = cat.resolve(f"{tag}^{{commit}}:{changelog_path}")
+            if result.changelog_blob is None:
+                result.errors.append(f"{changelog_path} missing")
+            else:
+                report.blob_refs += 1
+                if result.changelog_blob not in changelogs:
+                    changelogs[result.changelog_blob] = _parse_changelog(cat.contents(result.changelog_blob))
+                    report.blobs_parsed += 1
+                releases, errors = changelogs[result.changelog_blob]
+                result.errors.extend(errors)
+                if releases is not None and str(version) not in releases:
+                    result.errors.append(f"{changelog_path} has no {version} section")
+
+            if addon_xml_path:
+                result.addon_xml_blob = cat.resolve(f"{tag}^{{commit}}:{addon_xml_path}")
+                if result.addon_xml_blob is None:
+                    result.errors.append(f"{addon_xml_path} missing")
+                else:
+                    report.blob_refs += 1
+                    if result.addon_xml_blob not in addon_versions:
+                        addon_versions[result.addon_xml_blob] = _parse_addon_xml(cat.contents(result.addon_xml_blob))
+                        report.blobs_parsed += 1
+                    addon_version, errors = addon_versions[result.addon_xml_blob]
+                    result.errors.extend(errors)
+                    if addon_version is not None and Version.try_parse(addon_version) != version:
+                        result.errors.append(f"{addon_xml_path} version {addon_version} != {version}")
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _parse_changelog(data: bytes) -> Tuple[Optional[Dict[str, object]], List[str]]:
+    """Parse a changelog blob into {normalized version: release} plus blob-level errors."""
+    releases = ChangelogParser.parse_text(data.decode("utf-8"))
+    errors = []
+    is_descending, violations = ChangelogParser.validate_descending(releases)
+    if not is_descending:
+        errors.append(f"releases out of order: {violations[0][0]} listed after {violations[0][1]}")
+    by_version = {}
+    for release in releases:
+        parsed = Version.try_parse(release.version)
+        by_version[str(parsed) if parsed else release.version] = release
+    return by_version, errors
+
+
+def _parse_addon_xml(data: bytes) -> Tuple[Optional[str], List[str]]:
+    try:
+        return AddonXmlParser.parse_text(data.decode("utf-8")).version, []
+    except ET.ParseError as e:
+        return None, [f"addon.xml is not well-formed: {e}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate rendered files at every release tag")
+    parser.add_argument("--repo", type=Path, default=Path("."))
+    parser.add_argument("--changelog", default="CHANGELOG.md")
+    parser.add_argument("--addon-xml")
+    parser.add_argument("--json", type=Path, dest="json_path")
+    args = parser.parse_args()
+
+    addon_xml_path = args.addon_xml or default_addon_xml_path(args.repo)
+    try:
+        report = validate_history(args.repo, args.changelog, addon_xml_path)
+    except subprocess.CalledProcessError as e:
+        print(f"ERROR: {' '.join(e.cmd)} failed: {e.stderr or ''}", file=sys.stderr)
+        sys.exit(1)
+
+    for result in report.tags:
+        print(f"{result.tag:<16} {'ok' if not result.errors else '; '.join(result.errors)}")
+    print(f"{len(report.tags)} tags, {report.blob_refs} file versions, {report.blobs_parsed} distinct blobs parsed "
+          f"in {report.seconds:.2f}s")
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps(
+            dict(asdict(report), ok=report.ok), indent=2))
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Build the dev virtualenv once and restore it from a hash-keyed snapshot.
+
+The default build installs the dev dependency group exactly as pinned in
+uv.lock (`uv sync --frozen`): psr-templates at its locked commit rather than
+the branch head, pytest and python-semantic-release. This tool builds the
+environment once, stores it under <cache>/<key>/venv and restores it into the
+target path by hardlinks (or a reflink/plain copy) on later phases and runs.
+It is opt-in (make venv-snapshot, run_harness.py --venv); CI still sets up
+its venv with setup-venv + install-dev-dependencies.
+
+The key hashes uv.lock, pyproject.toml, the build command, the interpreter's
+version/platform and the target path (venvs embed their absolute path in
+scripts and pyvenv.cfg, so a snapshot is only valid at the path it was built
+for).
+
+Hardlinked restores share inodes with the snapshot: tools that replace files
+(pip, uv, the bytecode compiler) are safe, but editing a file in place inside
+the venv also edits the snapshot. Use --mode copy when that matters.
+
+Usage:
+  venv_snapshot.py ensure [--target DIR] [--mode M] [--build-cmd CMD]
+  venv_snapshot.py key    [--target DIR]
+  venv_snapshot.py bench  [--target DIR] [--mode M] [--build-cmd CMD] [--phases N]
+
+Options:
+  --target DIR      Virtualenv path (default: /tmp/venv, as in setup-venv)
+  --cache-dir DIR   Snapshot store (default: $PSR_VENV_CACHE or ~/.cache/psr-fixture/venvs)
+  --mode M          hardlink (default), reflink or copy
+  --build-cmd CMD   Shell command building {target} with {python} (default: uv sync
+                    --frozen of the dev group)
+  --python PATH     Interpreter whose version goes into the key (default: python3)
+  --phases N        bench: phases to simulate (default: 5)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGET = Path("/tmp/venv")
+DEFAULT_CACHE = Path(os.environ.get("PSR_VENV_CACHE", Path.home() / ".cache" / "psr-fixture" / "venvs"))
+DEFAULT_BUILD_CMD = "UV_PROJECT_ENVIRONMENT={target} uv sync --frozen --no-install-project --python {python}"
+KEY_FILES = ("uv.lock", "pyproject.toml")
+MODES = ("hardlink", "reflink", "copy")
+
+
+def python_identity(python: str) -> str:
+    """Return the interpreter's full version and platform string."""
+    return subprocess.run(
+        [python, "-c", "import platform, sys; print(sys.version, platform.machine(), sys.implementation.cache_tag)"],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def snapshot_key(project_dir: Path, target: Path, python: str, build_cmd: str = DEFAULT_BUILD_CMD) -> str:
+    """Hash uv.lock, pyproject.toml, the build command, the interpreter identity and the target path."""
+    digest = hashlib.sha256()
+    for name in KEY_FILES:
+        path = project_dir / name
+        digest.update(name.encode() + b"\0")
+        digest.update(path.read_bytes() if path.exists() else b"<missing>")
+        digest.update(b"\0")
+    digest.update(build_cmd.encode() + b"\0")
+    digest.update(python_identity(python).encode() + b"\0")
+    digest.update(str(target.resolve()).encode())
+    return digest.hexdigest()[:24]
+
+
+def clone_tree(src: Path, dst: Path, mode: str) -> str:
+    """
+    Recreate src at dst, preserving symlinks.
+
+    Args:
+        src: Directory to clone
+        dst: Destination (must not exist)
+        mode: hardlink, reflink or copy
+
+    Returns:
+        The mode actually used ("copy" when links/reflinks are unsupported)
+    """
+    if mode == "reflink":
+        result = subprocess.run(["cp", "-a", "--reflink=always", str(src), str(dst)], capture_output=True)
+        if result.returncode == 0:
+            return "reflink"
+        shutil.rmtree(dst, ignore_errors=True)
+        mode = "copy"
+
+    used = mode
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        out_dir = dst if rel == "." else dst / rel
+        out_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copystat(dirpath, out_dir)
+        for name in dirnames + filenames:
+            src_path = os.path.join(dirpath, name)
+            dst_path = out_dir / name
+            if os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+            elif name in filenames:
+                if used == "hardlink":
+                    try:
+                        os.link(src_path, dst_path)
+                        continue
+                    except OSError:
+                        # Cross-device or unsupported filesystem
+                        used = "copy"
+                shutil.copy2(src_path, dst_path)
+        # Symlinked dirs were recreated above; don't descend into them
+        dirnames[:] = [d for d in dirnames if not os.path.islink(os.path.join(dirpath, d))]
+    return used
+
+
+def replace_dir(src: Path, target: Path, mode: str) -> str:
+    """Clone src next to target, then swap it into place."""
+    staging = target.with_name(f".{target.name}.restore-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    used = clone_tree(src, staging, mode)
+    if target.exists() or target.is_symlink():
+        shutil.rmtree(target)
+    os.replace(staging, target)
+    return used
+
+
+class VenvSnapshots:
+    """
+    Snapshot store keyed by snapshot_key().
+
+    Args:
+        cache_dir: Root of the store
+        project_dir: Directory holding uv.lock and pyproject.toml
+        python: Interpreter used for the key
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE, project_dir: Path = REPO_ROOT, python: str = "python3"):
+        self.cache_dir = cache_dir
+        self.project_dir = project_dir
+        self.python = python
+
+    def key(self, target: Path, build_cmd: str = DEFAULT_BUILD_CMD) -> str:
+        return snapshot_key(self.project_dir, target, self.python, build_cmd)
+
+    def snapshot_dir(self, target: Path, build_cmd: str = DEFAULT_BUILD_CMD) -> Path:
+        return self.cache_dir / self.key(target, build_cmd)
+
+    def has_snapshot(self, target: Path, build_cmd: str = DEFAULT_BUILD_CMD) -> bool:
+        return (self.snapshot_dir(target, build_cmd) / "meta.json").exists()
+
+    def save(self, target: Path, build_cmd: str = DEFAULT_BUILD_CMD, build_seconds: Optional[float] = None) -> Path:
+        """Store target as the snapshot for its key (atomic rename into the store)."""
+        final = self.snapshot_dir(target, build_cmd)
+        staging = final.with_name(f"{final.name}.tmp-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        clone_tree(target, staging / "venv", "hardlink")
+        (staging / "meta.json").write_text(json.dumps({
+            "target": str(target.resolve()),
+            "python": python_identity(self.python),
+            "build_seconds": build_seconds,
+            "created": time.time(),
+        }, indent=2))
+        try:
+            os.rename(staging, final)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+        return final
+
+    def restore(self, target: Path, mode: str = "hardlink", build_cmd: str = DEFAULT_BUILD_CMD) -> Optional[str]:
+        """Restore the snapshot into target; returns the mode used, or None on a miss."""
+        if not self.has_snapshot(target, build_cmd):
+            return None
+        return replace_dir(self.snapshot_dir(target, build_cmd) / "venv", target, mode)
+
+    def ensure(self, target: Path, build_cmd: str = DEFAULT_BUILD_CMD, mode: str = "hardlink") -> str:
+        """
+        Restore target from its snapshot, building and storing it on a miss.
+
+        Returns:
+            "restored (<mode>)" or "built"
+        """
+        used = self.restore(target, mode, build_cmd)
+        if used is not None:
+            return f"restored ({used})"
+        if target.exists():
+            shutil.rmtree(target)
+        started = time.perf_counter()
+        subprocess.run(build_cmd.format(target=target, python=self.python), shell=True, check=True,
+                       cwd=self.project_dir)
+        self.save(target, build_cmd, time.perf_counter() - started)
+        return "built"
+
+
+def bench(store: VenvSnapshots, target: Path, build_cmd: str, mode: str, phases: int) -> dict:
+    """
+    Compare per-phase setup time: rebuilding every phase vs build once + restore.
+
+    The "before" figure is one cold build (every phase pays it today); the
+    "after" figures are the restore times for each subsequent phase.
+    """
+    shutil.rmtree(store.snapshot_dir(target, build_cmd), ignore_errors=True)
+    if target.exists():
+        shutil.rmtree(target)
+
+    started = time.perf_counter()
+    store.ensure(target, build_cmd, mode)
+    build_seconds = time.perf_counter() - started
+
+    restores = []
+    for _ in range(phases - 1):
+        started = time.perf_counter()
+        outcome = store.ensure(target, build_cmd, mode)
+        restores.append(time.perf_counter() - started)
+    subprocess.run([str(target / "bin" / "python"), "-c", "pass"], check=True)
+
+    return {
+        "mode": outcome if restores else mode,
+        "before_per_phase": build_seconds,
+        "before_total": build_seconds * phases,
+        "after_per_phase": sum(restores) / len(restores) if restores else build_seconds,
+        "after_total": build_seconds + sum(restores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash-keyed virtualenv snapshots shared across phases")
+    parser.add_argument("command", choices=["ensure", "key", "bench"])
+    parser.add_argument("--target", type=Path, default=DEFAULT_TARGET)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE)
+    parser.add_argument("--mode", choices=MODES, default="hardlink")
+    parser.add_argument("--build-cmd", default=DEFAULT_BUILD_CMD)
+    parser.add_argument("--python", default="python3")
+    parser.add_argument("--phases", type=int, default=5)
+    args = parser.parse_args()
+
+    store = VenvSnapshots(args.cache_dir, REPO_ROOT, args.python)
+    try:
+        if args.command == "key":
+            print(store.key(args.target, args.build_cmd))
+        elif args.command == "ensure":
+            started = time.perf_counter()
+            outcome = store.ensure(args.target, args.build_cmd, args.mode)
+            print(f"{args.target}: {outcome} in {time.perf_counter() - started:.2f}s (key {store.key(args.target, args.build_cmd)})")
+        else:
+            results = bench(store, args.target, args.build_cmd, args.mode, args.phases)
+            print(f"Per-phase setup, {args.phases} phases ({results['mode']}):")
+            print(f"  before: {results['before_per_phase']:.2f}s/phase, {results['before_total']:.2f}s total")
+            print(f"  after:  {results['after_per_phase']:.3f}s/phase, {results['after_total']:.2f}s total")
+    except subprocess.CalledProcessError as e:
+        print(f"ERROR: build command failed ({e.returncode}): {e.cmd}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Re-render and re-validate the PSR templates on every save.
+
+Watches the template directory, the Kodi addon directory and the rendered
+outputs (CHANGELOG.md, <addon>/addon.xml) with inotify, falling back to mtime
+polling where inotify is unavailable. Each batch of events is narrowed to what
+it affects:
+
+  - a template: re-render it and every template that includes/imports it,
+    through the in-process TemplateRenderEngine (render_helpers.py) against the
+    phase's synthetic history, then validate the outputs that changed
+  - phase-config.json: rebuild the history and re-render everything
+  - a rendered output (e.g. written by psr-prepare or PSR): validate just it
+
+Validation reuses earlier results: an output whose bytes did not change is
+not looked at again, addon.xml results are kept per content hash, and
+CHANGELOG.md releases are re-parsed only for the spans whose bytes changed
+(ChangelogParser.release_spans / release_at). The newest changelog release
+is cross-checked against the addon.xml version.
+
+Renders go to a scratch directory (.artifacts/watch/) so the tracked
+CHANGELOG.md and addon.xml are left alone; `--out .` renders over the
+repository itself, e.g. to validate what psr-prepare wrote. Outputs are not
+rendered at startup (the existing files are validated instead).
+
+Usage:
+  watch_templates.py [--phase N] [--template-dir DIR] [--out DIR] [--poll] [--once]
+
+Options:
+  --phase N           Phase whose release history is rendered (default: last in phase-config.json)
+  --template-dir DIR  Arranged templates (default: [tool.semantic_release] template_dir)
+  --out DIR           Root that rendered outputs are written under (default: .artifacts/watch)
+  --poll              Poll mtimes instead of using inotify
+  --once              Render and validate everything once, then exit (non-zero on errors)
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT = REPO_ROOT / ".artifacts" / "watch"
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from render_helpers import PHASE_CONFIG_PATH, TemplateRenderEngine, load_phases, phase_context_spec  # noqa: E402
+from release_metadata import (  # noqa: E402
+    AddonXmlInfo, AddonXmlParser, ChangelogParser, PyprojectConfig, ReleaseInfo,
+)
+from validate_artifacts import ADDON_XML, CHANGELOG, check, kind_of  # noqa: E402
+
+# Batch events arriving this close together (editors write, rename and chmod in bursts)
+DEBOUNCE_S = 0.02
+POLL_INTERVAL_S = 0.1
+IGNORED_DIRS = {".git", "__pycache__"}
+
+
+def is_editor_temp(name: str) -> bool:
+    return name.startswith(".#") or name.endswith(("~", ".swp", ".swx", ".tmp")) or name == "4913"
+
+
+@dataclass
+class OutputResult:
+    """Last validation of one rendered output."""
+    digest: str
+    kind: str
+    errors: List[str] = field(default_factory=list)
+    releases: List[ReleaseInfo] = field(default_factory=list)
+    addon: Optional[AddonXmlInfo] = None
+    reparsed: int = 0
+
+
+class IncrementalChangelog:
+    """ReleaseInfo cache keyed by each release's bytes, so unchanged releases are not re-parsed."""
+
+    def __init__(self):
+        self._releases: Dict[bytes, ReleaseInfo] = {}
+
+    def parse(self, data: bytes, spans) -> Tuple[List[ReleaseInfo], int]:
+        releases, cache, reparsed = [], {}, 0
+        for span in spans:
+            key = data[span[1]:span[3]]
+            release = self._releases.get(key)
+            if release is None:
+                release = ChangelogParser.release_at(data, span)
+                reparsed += 1
+            cache[key] = release
+            releases.append(release)
+        self._releases = cache
+        return releases, reparsed
+
+
+class WatchSession:
+    """Maps changed paths to renders and validations, keeping results between batches."""
+
+    def __init__(self, template_dir: Path, out_root: Path, changelog_file: str, addon_dir: Optional[str],
+                 phase: Optional[int] = None, phase_config: Path = PHASE_CONFIG_PATH,
+                 engine: Optional[TemplateRenderEngine] = None):
+        self.template_dir = Path(template_dir).resolve()
+        self.out_root = Path(out_root).resolve()
+        self.phase_config = Path(phase_config).resolve()
+        self.phase = phase
+        self.engine = engine or TemplateRenderEngine(self.template_dir)
+        self.outputs = {self.out_root / changelog_file}
+        if addon_dir:
+            self.outputs.add(self.out_root / addon_dir / "addon.xml")
+        self.addon_dir = self.out_root / addon_dir if addon_dir else None
+        self.results: Dict[Path, OutputResult] = {}
+        self.render_errors: Dict[str, str] = {}
+        self.changelog = IncrementalChangelog()
+        self._spec = None
+        self._references: Optional[Dict[str, Set[str]]] = None
+
+    # Templates
+
+    def templates(self) -> List[str]:
+        """Template names (relative to template_dir) that PSR would render; dot-files are partials."""
+        if not self.template_dir.is_dir():
+            return []
+        return sorted(
+            p.relative_to(self.template_dir).as_posix() for p in self.template_dir.rglob("*.j2")
+            if not any(part.startswith(".") for part in p.relative_to(self.template_dir).parts)
+        )
+
+    def output_for(self, template_name: str) -> Path:
+        return self.out_root / template_name[:-len(".j2")]
+
+    def references(self) -> Dict[str, Set[str]]:
+        """template -> templates it includes, imports or extends (None entries: dynamic names)."""
+        if self._references is None:
+            from jinja2 import meta
+            environment = self.engine.environment
+            self._references = {}
+            for path in self.template_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                name = path.relative_to(self.template_dir).as_posix()
+                try:
+                    source = path.read_text()
+                    self._references[name] = set(meta.find_referenced_templates(environment.parse(source)))
+                except Exception:
+                    # Broken template: the render reports the error; assume it may reference anything
+                    self._references[name] = {None}
+        return self._references
+
+    def affected_templates(self, changed: Set[str]) -> Set[str]:
+        """Renderable templates that are, or transitively reference, a changed template."""
+        references = self.references()
+        affected = set(changed)
+        grew = True
+        while grew:
+            grew = False
+            for name, refs in references.items():
+                if name not in affected and (None in refs or refs & affected):
+                    affected.add(name)
+                    grew = True
+        return affected & set(self.templates())
+
+    @property
+    def spec(self):
+        if self._spec is None:
+            phase = self.phase if self.phase is not None else max(load_phases(self.phase_config))
+            self._spec = phase_context_spec(phase, self.phase_config)
+        return self._spec
+
+    def render(self, template_name: str, report: List[str]) -> Optional[Path]:
+        """Render one template; returns its output path when the output changed."""
+        output = self.output_for(template_name)
+        started = time.perf_counter()
+        try:
+            text = self.engine.render(template_name, self.spec)
+        except Exception as e:
+            line = getattr(e, "lineno", None)
+            self.render_errors[template_name] = f"render failed{f' at line {line}' if line else ''}: {e}"
+            report.append(f"  {template_name}: {self.render_errors[template_name]}")
+            return None
+        self.render_errors.pop(template_name, None)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        data = text.encode("utf-8")
+        if output.exists() and output.read_bytes() == data:
+            report.append(f"  {template_name}: rendered in {elapsed_ms:.1f}ms, output unchanged")
+            return None
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(output.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(output)
+        report.append(f"  {template_name}: rendered in {elapsed_ms:.1f}ms -> {self._label(output)}")
+        return output
+
+    # Outputs
+
+    def validate(self, output: Path) -> Optional[OutputResult]:
+        """Validate an output unless its bytes match the previous validation."""
+        try:
+            data = output.read_bytes()
+        except FileNotFoundError:
+            self.results.pop(output, None)
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        previous = self.results.get(output)
+        if previous is not None and previous.digest == digest:
+            return None
+        kind = kind_of(output)
+        errors, spans = check(kind, data)
+        result = OutputResult(digest, kind, list(errors))
+        if kind == CHANGELOG:
+            result.releases, result.reparsed = self.changelog.parse(data, spans)
+        elif not errors:
+            result.addon = AddonXmlParser.parse_text(data.decode("utf-8"))
+        self.results[output] = result
+        return result
+
+    def cross_check(self) -> List[str]:
+        """Newest changelog release vs addon.xml version, when both outputs are valid."""
+        changelog = next((r for r in self.results.values() if r.kind == CHANGELOG and r.releases), None)
+        addon = next((r for r in self.results.values() if r.kind == ADDON_XML and r.addon), None)
+        if changelog is None or addon is None:
+            return []
+        newest = changelog.releases[0].version
+        if not AddonXmlParser.validate_version(addon.addon, newest):
+            return [f"addon.xml version {addon.addon.version} != newest changelog release {newest}"]
+        return []
+
+    def _label(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.out_root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _summary(self, output: Path, result: OutputResult) -> List[str]:
+        label = self._label(output)
+        if result.errors:
+            return [f"  {label}: {len(result.errors)} error(s)"] + [f"    {e}" for e in result.errors]
+        if result.kind == CHANGELOG:
+            return [f"  {label}: ok, {len(result.releases)} releases ({result.reparsed} re-parsed)"]
+        return [f"  {label}: ok, version {result.addon.version}"]
+
+    # Batches
+
+    def handle(self, changed: Optional[Iterable[Path]], render: bool = True) -> List[str]:
+        """
+        Process one batch of changed paths (None: everything) and return report lines.
+
+        With render=False only outputs are validated (used for the startup pass).
+        """
+        report: List[str] = []
+        to_render: Set[str] = set()
+        to_validate: Set[Path] = set()
+        if changed is None:
+            self._spec = self._references = None
+            self.engine.clear()
+            to_render = set(self.templates()) if render else set()
+            to_validate = set(self.outputs) | {self.output_for(t) for t in to_render}
+        else:
+            changed_templates: Set[str] = set()
+            for path in changed:
+                path = Path(os.path.abspath(path))
+                if path == self.phase_config:
+                    self._spec = None
+                    changed_templates.update(self.templates())
+                elif path in self.outputs or path in {self.output_for(t) for t in self.templates()}:
+                    to_validate.add(path)
+                else:
+                    try:
+                        changed_templates.add(path.relative_to(self.template_dir).as_posix())
+                    except ValueError:
+                        pass
+            if changed_templates:
+                self._references = None
+                to_render = self.affected_templates(changed_templates) if render else set()
+
+        for template_name in sorted(to_render):
+            output = self.render(template_name, report)
+            if output is not None:
+                to_validate.add(output)
+
+        validated = False
+        for output in sorted(to_validate):
+            result = self.validate(output)
+            if result is not None:
+                validated = True
+                report.extend(self._summary(output, result))
+        if validated:
+            report.extend(f"  {error}" for error in self.cross_check())
+        return report
+
+    def ok(self) -> bool:
+        return (not self.render_errors and all(not r.errors for r in self.results.values())
+                and not self.cross_check())
+
+    def watch_roots(self) -> List[Path]:
+        """Directories to watch: template and addon trees, plus each output's directory."""
+        roots = [self.template_dir, self.phase_config.parent]
+        if self.addon_dir is not None:
+            roots.append(self.addon_dir)
+        roots.extend(output.parent for output in self.outputs)
+        return roots
+
+
+class InotifyWatcher:
+    """Blocking inotify reader over directory trees (Linux only; raises OSError elsewhere)."""
+
+    IN_MODIFY = 0x2
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots: Iterable[Path], recursive: Iterable[Path] = ()):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is not available on this platform")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+        self.recursive = {Path(p).resolve() for p in recursive}
+        for root in roots:
+            self.add(Path(root).resolve())
+
+    def add(self, directory: Path) -> None:
+        if not directory.is_dir() or directory in self.dirs.values():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = directory
+        if any(directory == r or r in directory.parents for r in self.recursive):
+            for child in directory.iterdir():
+                if child.is_dir() and child.name not in IGNORED_DIRS:
+                    self.add(child)
+
+    def _read(self, changed: Set[Path]) -> bool:
+        """Drain one read() of events into changed; returns False on queue overflow."""
+        buffer = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = self.EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0")
+            offset += self.EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                return False
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and path.name not in IGNORED_DIRS:
+                    self.add(path)
+                    # Files written before the watch existed
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+            elif not is_editor_temp(path.name):
+                changed.add(path)
+        return True
+
+    def wait(self) -> Optional[Set[Path]]:
+        """Block until something changes; returns the changed paths, or None after an overflow."""
+        changed: Set[Path] = set()
+        complete = True
+        select.select([self.fd], [], [])
+        while select.select([self.fd], [], [], DEBOUNCE_S)[0]:
+            complete = self._read(changed) and complete
+        return changed if complete else None
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollWatcher:
+    """mtime-polling stand-in for InotifyWatcher."""
+
+    def __init__(self, roots: Iterable[Path], recursive: Iterable[Path] = ()):
+        recursive = {Path(p).resolve() for p in recursive}
+        self.roots = {Path(p).resolve(): Path(p).resolve() in recursive for p in roots}
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, int]:
+        found = {}
+        for root, deep in self.roots.items():
+            if not root.is_dir():
+                continue
+            for path in (root.rglob("*") if deep else root.iterdir()):
+                if path.is_file() and not IGNORED_DIRS & set(path.parts) and not is_editor_temp(path.name):
+                    found[path] = path.stat().st_mtime_ns
+        return found
+
+    def wait(self) -> Optional[Set[Path]]:
+        while True:
+            time.sleep(POLL_INTERVAL_S)
+            current = self._scan()
+            changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+            self.snapshot = current
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+def print_batch(report: List[str], elapsed_s: float) -> None:
+    if report:
+        print(f"[{time.strftime('%H:%M:%S')}] {elapsed_s * 1000:.0f}ms")
+        print("\n".join(report), flush=True)
+
+
+def main():
+    pyproject = PyprojectConfig.load(REPO_ROOT / "pyproject.toml")
+    tool = pyproject.get("tool", {})
+    parser = argparse.ArgumentParser(description="Re-render and re-validate templates on change")
+    parser.add_argument("--phase", type=int)
+    parser.add_argument("--template-dir", type=Path,
+                        default=REPO_ROOT / tool.get("semantic_release", {}).get("template_dir", "templates"))
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--poll", action="store_true")
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    if not args.template_dir.is_dir():
+        print(f"ERROR: no template directory {args.template_dir} (run psr-prepare first)", file=sys.stderr)
+        sys.exit(1)
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    session = WatchSession(
+        template_dir=args.template_dir,
+        out_root=args.out,
+        changelog_file=tool.get("psr-prepare", {}).get("changelog", {}).get("file", "CHANGELOG.md"),
+        addon_dir=tool.get("arranger", {}).get("kodi-addon-directory"),
+        phase=args.phase,
+    )
+    started = time.perf_counter()
+    if args.once:
+        print_batch(session.handle(None), time.perf_counter() - started)
+        sys.exit(0 if session.ok() else 1)
+
+    print_batch(session.handle(None, render=False), time.perf_counter() - started)
+    recursive = [args.template_dir] + ([session.addon_dir] if session.addon_dir else [])
+    if args.poll:
+        watcher = PollWatcher(session.watch_roots(), recursive)
+    else:
+        try:
+            watcher = InotifyWatcher(session.watch_roots(), recursive)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), polling instead", file=sys.stderr)
+            watcher = PollWatcher(session.watch_roots(), recursive)
+    print(f"Watching {args.template_dir} (phase {session.phase or 'latest'}); Ctrl-C to stop", flush=True)
+    try:
+        while True:
+            changed = watcher.wait()
+            started = time.perf_counter()
+            print_batch(session.handle(changed), time.perf_counter() - started)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()